@@ -0,0 +1,472 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
+from functools import partial
+import asyncio
+import configparser
+import json
+import time
+from async_foresttrip_login import async_foresttrip_login
+from cascade_wait import CascadeWaiter, CASCADE_DEPENDENCIES, MARK_STALE_JS, READY_JS
+from day_list_parser import build_facility_entries, normalize_day_list
+from forest_headless_reservation import DAY_LIST_EXTRACT_JS
+from parallel_crawl import MARK_SEARCH_STALE_JS, SEARCH_READY_JS
+from http_pool import report_all as report_http_pools
+from metrics import configure_metrics, metrics
+from regional_telegram import RegionalTelegramSender
+from result_sink import build_result_sink, iter_results
+from resource_router import build_resource_router
+from session_state import startup_timer
+from snapshot_store import build_snapshot_store
+
+# select 옵션 전체를 evaluate 1회로 조회 (빈 값 제외)
+SELECT_OPTIONS_JS = """(selector) => {
+    const el = document.querySelector(selector);
+    if (!el) return [];
+    return Array.from(el.querySelectorAll('option'))
+        .filter(o => o.getAttribute('value'))
+        .map(o => ({value: o.getAttribute('value'), text: o.innerText}));
+}"""
+
+
+def _deliver(send, args, on_sent=None):
+    """전송 스레드에서 실행: 성공했을 때만 on_sent (스냅샷 저장)"""
+    if send(*args) is not False and on_sent:
+        on_sent()
+
+
+class AsyncCascadeWaiter(CascadeWaiter):
+    """CascadeWaiter의 async 버전 (통계 집계 방식 동일)"""
+
+    async def prepare(self, selector):
+        await self.page.evaluate(MARK_STALE_JS, CASCADE_DEPENDENCIES.get(selector))
+        return time.perf_counter()
+
+    async def wait(self, selector, started=None):
+        started = started or time.perf_counter()
+        try:
+            await self.page.wait_for_function(READY_JS, arg=self.ready_args(selector), timeout=self.timeout)
+        except PlaywrightTimeoutError:
+            self.timeouts[selector] = self.timeouts.get(selector, 0) + 1
+            print(f"⚠️ {selector} 연쇄 로딩 대기 시간 초과 ({self.timeout}ms)")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.record(selector, elapsed_ms)
+        return elapsed_ms
+
+
+class AsyncForestReservationSystem:
+    """ForestReservationSystem의 asyncio 버전: 이벤트 루프 하나로 여러 페이지/전송 동시 진행"""
+
+    def __init__(self, page, telegram_sender=None, all_results=None, in_flight=None, snapshot_store=None,
+                 result_sink=None):
+        self.page = page
+        self.config = configparser.ConfigParser()
+        self.config.read('config.ini', encoding='utf-8')
+        configure_metrics(self.config)
+
+        # 결과를 JSONL로 즉시 기록, 메모리 보관은 옵션 (ForestReservationSystem과 동일)
+        self.result_sink = result_sink or build_result_sink(self.config)
+        keep_in_memory = self.config.getboolean('RESULT_SINK', 'KEEP_IN_MEMORY', fallback=False)
+        if all_results is not None:
+            self.all_results = all_results
+        else:
+            self.all_results = [] if keep_in_memory or self.result_sink is None else None
+
+        self.telegram_sender = telegram_sender or RegionalTelegramSender()
+        self.send_tasks = []  # 백그라운드 텔레그램 전송 작업
+        # 이미지/폰트/외부 분석 스크립트 차단 (install_resource_router로 설치, 비활성화 시 None)
+        self.resource_router = build_resource_router(self.config)
+        self.snapshot_store = snapshot_store or build_snapshot_store(self.config)
+
+        ajax_timeout = self.config.getint('SCRAPING', 'AJAX_TIMEOUT', fallback=10000)
+        self.cascade_waiter = AsyncCascadeWaiter(page, timeout=ajax_timeout)
+        self.search_timeout = self.config.getint('PARALLEL', 'SEARCH_TIMEOUT', fallback=50000)
+        # 조합별 재시도 횟수 (ForestReservationSystem과 동일 설정)
+        self.max_retries = self.config.getint('CHECKPOINT', 'MAX_RETRIES', fallback=2)
+
+        # 동시에 서버 응답을 기다리는 페이지 수 상한 (페이지 간 공유)
+        max_in_flight = self.config.getint('PARALLEL', 'MAX_IN_FLIGHT', fallback=2)
+        self.in_flight = in_flight or asyncio.Semaphore(max_in_flight)
+
+    def _for_page(self, page):
+        """같은 결과/전송/통계를 공유하는 페이지별 인스턴스"""
+        child = AsyncForestReservationSystem(page, self.telegram_sender, self.all_results,
+                                             self.in_flight, self.snapshot_store, self.result_sink)
+        child.send_tasks = self.send_tasks
+        child.resource_router = self.resource_router
+        child.cascade_waiter.timings = self.cascade_waiter.timings
+        child.cascade_waiter.timeouts = self.cascade_waiter.timeouts
+        return child
+
+    async def install_resource_router(self):
+        """로그인된 컨텍스트 전체에 요청 가로채기 설치 (로그인 직후 run_async에서 1회 호출)"""
+        if self.resource_router:
+            await self.resource_router.install_async(self.page.context)
+
+    async def safe_click(self, selector, timeout=10000):
+        await self.page.wait_for_selector(selector, state='attached', timeout=timeout)
+        await self.page.click(selector)
+
+    async def smart_select(self, selector, value, select_by='value'):
+        """선택 후 연쇄 AJAX 완료까지 대기"""
+        await self.page.wait_for_selector(selector, state='attached')
+        async with self.in_flight:
+            started = await self.cascade_waiter.prepare(selector)
+
+            if select_by == 'value':
+                await self.page.select_option(selector, value=str(value))
+            elif select_by == 'text':
+                await self.page.select_option(selector, label=value)
+            elif select_by == 'index':
+                await self.page.select_option(selector, index=value)
+
+            return await self.cascade_waiter.wait(selector, started)
+
+    async def get_select_options(self, selector):
+        """select box의 모든 옵션 추출"""
+        return await self.page.evaluate(SELECT_OPTIONS_JS, selector)
+
+    async def search(self):
+        """검색 실행 후 새 결과 테이블이 그려질 때까지 대기"""
+        async with self.in_flight:
+            await self.page.evaluate(MARK_SEARCH_STALE_JS)
+            await self.safe_click('#searchBtn')
+            try:
+                await self.page.wait_for_function(SEARCH_READY_JS, timeout=self.search_timeout)
+            except PlaywrightTimeoutError:
+                print(f"⚠️ 검색 결과 대기 시간 초과 ({self.search_timeout}ms)")
+
+    async def scrape_current_results(self, context_info):
+        """결과 테이블 일괄 추출 (sync 버전과 같은 {context, data} 구조, 실패 시 예외 → 조합 재시도)"""
+        try:
+            await self.page.wait_for_selector('#dayListTable', state='visible', timeout=50000)
+            extracted = await self.page.evaluate(DAY_LIST_EXTRACT_JS)
+            names, rows = normalize_day_list(extracted['names'], extracted['rows'])
+
+            if len(names) != len(rows):
+                print(f"⚠️ 시설-행 불일치: 시설={len(names)}개, 행={len(rows)}개")
+                await self.page.screenshot(path='mismatch_error.png')
+
+            current_result = {
+                "context": context_info,
+                "data": build_facility_entries(names, rows)
+            }
+
+            total_dates = sum(len(f['dates']) for f in current_result["data"])
+            print(f"📊 스크래핑 완료: 시설 {len(names)}개, 예약 일자 {total_dates}개")
+            startup_timer.mark_first_scrape()
+            return current_result
+
+        except Exception as e:
+            print(f"❌ 스크래핑 오류: {str(e)}")
+            try:
+                await self.page.screenshot(path='scraping_error.png')
+            except Exception:
+                pass
+            raise
+
+    async def recover_page(self):
+        """오류 후 페이지를 새로고침해 select 상태 초기화"""
+        try:
+            await self.page.reload(wait_until='networkidle', timeout=60000)
+        except Exception as e:
+            print(f"        ⚠️ 페이지 새로고침 실패: {str(e)}")
+
+    def record_result(self, result):
+        """결과 1건 기록: JSONL 스트리밍 저장 + (옵션) 메모리 보관"""
+        if self.result_sink:
+            self.result_sink.write(result)
+        if self.all_results is not None:
+            self.all_results.append(result)
+
+    def collected_results(self):
+        """실행 결과: 메모리 보관 시 결과 목록, 아니면 스트리밍 저장 요약 {'results': 건수, 'files': [...]}"""
+        if self.all_results is not None:
+            return self.all_results
+        return self.result_sink.summary()
+
+    def notify(self, region_code, context_info, result_data):
+        """텔레그램 전송을 스레드로 넘겨 스크래핑을 막지 않음 (스냅샷 사용 시 변경분만, 전송 성공 후 저장)"""
+        on_sent = None
+        if self.snapshot_store:
+            diff = self.snapshot_store.apply(context_info, result_data, commit=False)
+            on_sent = partial(self.snapshot_store.commit, context_info, result_data)
+            result_data = self.snapshot_store.delta_result_data(diff)
+            if not result_data:
+                on_sent()
+                return
+
+        if self.telegram_sender.coalesce:
+            if self.telegram_sender.buffer_result(region_code, context_info, result_data, on_sent):
+                self.flush_region_messages(region_code)
+            return
+
+        task = asyncio.create_task(asyncio.to_thread(
+            _deliver, self.telegram_sender.send_to_region, (region_code, context_info, result_data), on_sent
+        ))
+        self.send_tasks.append(task)
+
+    def flush_region_messages(self, region_code=None):
+        """지역 버퍼에 모인 결과 묶음을 스레드로 전송 (region_code가 None이면 전 지역)"""
+        for code, (sections, on_sent) in self.telegram_sender.take_buffered(region_code).items():
+            task = asyncio.create_task(asyncio.to_thread(
+                _deliver, self.telegram_sender.send_region_batch, (code, sections), on_sent
+            ))
+            self.send_tasks.append(task)
+
+    def flush_due_regions(self):
+        """창 시간이 지난 지역 버퍼 전송 (순회 루프에서 조합마다 호출)"""
+        for code in self.telegram_sender.due_regions():
+            self.flush_region_messages(code)
+
+    async def _select_path(self, path, state):
+        """[(selector, value)] 경로 중 현재 선택과 다른 단계부터 다시 선택 → 소요 시간(초)"""
+        started = time.perf_counter()
+        for i, (selector, value) in enumerate(path):
+            if state.get(selector) == value:
+                continue
+            for lower, _ in path[i:]:
+                state.pop(lower, None)  # 상위 선택이 바뀌면 하위 선택도 초기화됨
+            await self.smart_select(selector, value, 'value')
+            state[selector] = value
+        return time.perf_counter() - started
+
+    async def _retry(self, label, attempt, error, state):
+        """실패 보고 후 (재시도가 남았으면) 페이지 새로고침, 다음 시도는 월부터 다시 선택"""
+        max_attempts = self.max_retries + 1
+        print(f"        ⚠️ {label} 실패 (시도 {attempt}/{max_attempts}): {error}")
+        state.clear()
+        if attempt < max_attempts:
+            await self.recover_page()
+
+    async def _options(self, path, state, selector, label, counters):
+        """경로 선택 후 하위 select 옵션 조회 → (옵션 목록, select 소요 초), 재시도 후에도 실패하면 (None, 0)"""
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                seconds = await self._select_path(path, state)
+                return await self.get_select_options(selector), seconds
+            except Exception as e:
+                await self._retry(label, attempt, str(e), state)
+        counters['failed_lookups'] += 1
+        return None, 0.0
+
+    async def _crawl_accommodation(self, context_info, path, state, cascade_seconds, counters):
+        """숙박시설 1개 선택 → 검색 → 스크래핑 (실패 시 새로고침 후 재시도, 끝내 실패하면 실패 건수로 집계)"""
+        labels = {'region': context_info['region'], 'forest': context_info['forest']}
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                with metrics.span('select', offset=cascade_seconds, **labels):
+                    await self._select_path(path, state)
+                    await self.smart_select('#srchForest2', 0, 'index')
+                with metrics.span('search', **labels):
+                    await self.search()
+                with metrics.span('scrape', **labels):
+                    result = await self.scrape_current_results(context_info)
+                break
+            except Exception as e:
+                await self._retry(f"{context_info['forest']} / {context_info['accommodation']}", attempt, str(e), state)
+        else:
+            counters['failed'] += 1
+            return
+
+        region_code = context_info['region_code']
+        if result["data"]:
+            self.record_result(result)
+            counters['processed'] += 1
+            with metrics.span('notify', **labels):
+                self.notify(region_code, context_info, result["data"])
+        else:
+            self.notify(region_code, context_info, [])  # 마감 → 재오픈 감지용 스냅샷 정리
+
+    async def _crawl_combos(self, combos, counters):
+        """(월, 지역) 조합 목록을 현재 페이지에서 순서대로 스크래핑 (숙박시설 단위 재시도)"""
+        state = {}  # 현재 선택된 select 값
+        for month_option, region_option in combos:
+            region_code = region_option['value']
+            print(f"  🌏 {month_option['text']} / {region_option['text']}")
+            region_path = [('#monthSelectBox', month_option['value']), ('#srchSido', region_code)]
+            # 상위 연쇄(월/지역/휴양림) select 시간 → 다음 조합의 select 단계에 합산
+            forest_options, cascade_seconds = await self._options(
+                region_path, state, '#srchInstt', f"{region_option['text']} 휴양림 목록 조회", counters)
+
+            for forest_option in forest_options or []:
+                forest_path = region_path + [('#srchInstt', forest_option['value'])]
+                acc_options, seconds = await self._options(
+                    forest_path, state, '#srchForest', f"{forest_option['text']} 숙박시설 목록 조회", counters)
+                cascade_seconds += seconds
+
+                for acc_option in acc_options or []:
+                    counters['total'] += 1
+                    self.flush_due_regions()
+                    context_info = {
+                        "month": month_option['text'],
+                        "region": region_option['text'],
+                        "region_code": region_code,
+                        "forest": forest_option['text'],
+                        "accommodation": acc_option['text']
+                    }
+                    print(f"      🏘️ {forest_option['text']} / {acc_option['text']}")
+                    path = forest_path + [('#srchForest', acc_option['value'])]
+                    await self._crawl_accommodation(context_info, path, state, cascade_seconds, counters)
+                    cascade_seconds = 0.0
+
+            # (월, 지역) 순회 종료 → 해당 지역 묶음 전송
+            self.flush_region_messages(region_code)
+
+    async def run_comprehensive_scraping(self, page_count=1):
+        """전수 스크래핑 (page_count > 1이면 같은 컨텍스트의 페이지 여러 개로 분할 진행)"""
+        try:
+            await self.page.wait_for_load_state('networkidle')
+            print("📄 페이지 로딩 완료")
+
+            month_options = await self.get_select_options('#monthSelectBox')
+            region_options = await self.get_select_options('#srchSido')
+            combos = [(m, r) for m in month_options for r in region_options]
+            page_count = max(1, min(page_count, len(combos)))
+            print(f"📅 월 {len(month_options)}개 × 🌍 지역 {len(region_options)}개, 페이지 {page_count}개")
+
+            pages = [self.page]
+            for _ in range(page_count - 1):
+                page = await self.page.context.new_page()
+                await page.goto(self.page.url, timeout=60000)
+                await page.wait_for_load_state('networkidle')
+                pages.append(page)
+
+            systems = [self] + [self._for_page(page) for page in pages[1:]]
+            counters = {'total': 0, 'processed': 0, 'failed': 0, 'failed_lookups': 0}
+            try:
+                # 한 페이지가 예외로 끝나도 다른 페이지는 끝까지 진행한 뒤 페이지 정리
+                outcomes = await asyncio.gather(*[
+                    system._crawl_combos(combos[i::page_count], counters)
+                    for i, system in enumerate(systems)
+                ], return_exceptions=True)
+            finally:
+                for page in pages[1:]:
+                    await page.close()
+
+            # 남은 텔레그램 전송 완료 대기
+            self.flush_region_messages()
+            await asyncio.gather(*self.send_tasks)
+            self.telegram_sender.rate_limiter.report()
+            self.telegram_sender.report_coalescing()
+            report_http_pools()
+
+            print(f"\n🎉 지역별 전수 스크래핑 완료!")
+            print(f"📊 총 조합 수: {counters['total']}")
+            print(f"📈 데이터 수집 성공: {counters['processed']}")
+            print(f"🚫 재시도 후 실패: {counters['failed']}")
+            if counters['failed_lookups']:
+                print(f"⚠️ 목록 조회 실패로 건너뛴 지역/휴양림: {counters['failed_lookups']}개")
+            for page_no, outcome in enumerate(outcomes, 1):
+                if isinstance(outcome, Exception):
+                    print(f"⚠️ [페이지 {page_no}] 작업 중단: {str(outcome)}")
+            self.cascade_waiter.report()
+            if self.resource_router:
+                self.resource_router.report()
+            metrics.report(self.config.get('METRICS', 'JSON_PATH', fallback='') or None)
+
+            return self.collected_results()
+
+        except Exception as e:
+            print(f"❌ 전수 스크래핑 실패: {str(e)}")
+            await self.page.screenshot(path='comprehensive_scraping_error.png')
+            raise
+
+    async def run_june_region_test(self, target_region_code="8"):
+        """2025년 6월 기준 특정 지역 테스트 (기본값: 부산/경남)"""
+        try:
+            await self.page.wait_for_load_state('networkidle')
+            print(f"📄 테스트 시작: 2025년 6월 [지역: {target_region_code}]")
+
+            month_options = await self.get_select_options('#monthSelectBox')
+            june_option = next((m for m in month_options if '6월' in m['text']), None)
+            if not june_option:
+                print("⚠️ 6월 옵션 없음")
+                return
+
+            region_options = await self.get_select_options('#srchSido')
+            target_region = next((r for r in region_options if r['value'] == target_region_code), None)
+            if not target_region:
+                print(f"⚠️ 지정된 지역 코드({target_region_code}) 없음")
+                return
+
+            await self.smart_select('#monthSelectBox', june_option['value'], 'value')
+            await self.smart_select('#srchSido', target_region['value'], 'value')
+
+            forest_options = await self.get_select_options('#srchInstt')
+            if not forest_options:
+                print(f"⚠️ {target_region['text']} 휴양림 없음")
+                return
+            await self.smart_select('#srchInstt', forest_options[0]['value'], 'value')
+
+            acc_options = await self.get_select_options('#srchForest')
+            if not acc_options:
+                print(f"⚠️ {target_region['text']} 숙박시설 없음")
+                return
+            await self.smart_select('#srchForest', acc_options[0]['value'], 'value')
+            await self.smart_select('#srchForest2', 0, 'index')
+            await self.search()
+
+            context_info = {
+                "month": june_option['text'],
+                "region": target_region['text'],
+                "region_code": target_region['value'],
+                "forest": forest_options[0]['text'],
+                "accommodation": acc_options[0]['text']
+            }
+
+            result = await self.scrape_current_results(context_info)
+            if result and result["data"]:
+                self.notify(target_region['value'], context_info, result["data"])
+                self.flush_region_messages()
+                await asyncio.gather(*self.send_tasks)
+                print(f"📤 {target_region['text']} 전송 완료")
+            else:
+                print(f"⚠️ {target_region['text']} 데이터 없음")
+
+            print(f"\n✅ {target_region['text']} 테스트 완료")
+
+        except Exception as e:
+            print(f"❌ 테스트 실패: {str(e)}")
+            await self.page.screenshot(path=f'error_{target_region_code}.png')
+
+    def save_results_to_file(self, filename='comprehensive_results.json'):
+        """결과를 파일로 저장 (메모리에 없으면 JSONL 스트리밍 파일에서 한 건씩 읽어 변환)"""
+        if self.all_results is not None:
+            results = self.all_results
+        else:
+            results = iter_results(files=self.result_sink.files)  # 이번 실행에서 기록한 파일만
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, result in enumerate(results):
+                f.write(',\n' if i else '\n')
+                f.write(json.dumps(result, ensure_ascii=False, indent=2))
+            f.write('\n]\n')
+        print(f"💾 결과 저장 완료: {filename}")
+
+
+async def run_async(page_count=1):
+    """async 로그인 → 전수 스크래핑 (main.py의 sync 진입점에서 asyncio.run으로 호출)"""
+    playwright = await async_playwright().start()
+    try:
+        page = await async_foresttrip_login(playwright)
+        if not page:
+            print("❌ 로그인 실패")
+            return None
+
+        reservation = AsyncForestReservationSystem(page)
+        try:
+            # 추가 페이지도 같은 컨텍스트라 함께 적용
+            await reservation.install_resource_router()
+            return await reservation.run_comprehensive_scraping(page_count)
+        finally:
+            # 남은 전송(전송 성공 시 스냅샷 저장)을 마친 뒤 저장소 정리
+            await asyncio.gather(*reservation.send_tasks, return_exceptions=True)
+            if reservation.snapshot_store:
+                reservation.snapshot_store.close()
+            if reservation.result_sink:
+                reservation.result_sink.close()
+            await page.context.close()
+    finally:
+        await playwright.stop()  # 로그인에서 시작한 Playwright 드라이버 프로세스 종료
+
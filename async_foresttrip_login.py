@@ -0,0 +1,141 @@
+from playwright.async_api import async_playwright
+import configparser
+import re
+from session_state import build_session_store, startup_timer
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf-8')
+
+
+async def handle_dynamic_popup(page):
+    """동적 팝업 닫기 처리 함수 (async)"""
+    try:
+        # 1. 팝업 감지 (부분 일치)
+        popup = await page.wait_for_selector('[id^="enterPopup"]', timeout=3000)
+        if popup:
+            popup_id = await popup.get_attribute('id')
+            print(f"팝업 감지: {popup_id}")
+
+            # 팝업 번호 추출 (예: enterPopup10333 → 10333)
+            popup_number = re.search(r'\d+', popup_id).group()
+
+            # 2. 방법 1: 닫기 버튼 직접 클릭
+            close_selectors = [
+                f'#{popup_id} .day_close',
+                f'#{popup_id} .ep_cookie_close a',
+                f'#{popup_id} img[alt=""]',
+                f'[onclick*="closePopup(\'{popup_number}\')"]'
+            ]
+
+            for selector in close_selectors:
+                try:
+                    close_btn = await page.query_selector(selector)
+                    if close_btn:
+                        await close_btn.click()
+                        print(f"팝업 닫기 성공 (선택자: {selector})")
+                        await page.wait_for_selector(f'#{popup_id}', state='hidden', timeout=2000)
+                        return True
+                except:
+                    continue
+
+            # 3. 방법 2: JavaScript 함수 직접 호출
+            try:
+                await page.evaluate(f"closePopup('{popup_number}')")
+                print(f"closePopup('{popup_number}') 함수 호출 성공")
+                await page.wait_for_selector(f'#{popup_id}', state='hidden', timeout=2000)
+                return True
+            except:
+                pass
+
+            # 4. 방법 3: 강제 DOM 숨김
+            try:
+                await page.evaluate(f"""
+                    const popup = document.getElementById('{popup_id}');
+                    if (popup) {{
+                        popup.style.display = 'none';
+                        popup.classList.remove('show');
+                    }}
+                """)
+                print("강제 DOM 숨김 처리")
+                return True
+            except:
+                pass
+
+    except Exception as e:
+        print(f"팝업 처리 중 오류: {str(e)}")
+
+    return False
+
+
+async def async_foresttrip_login(playwright=None):
+    """foresttrip_login의 asyncio 버전: 월별예약 페이지 반환 (playwright 종료는 전달한 호출 측에서)"""
+    if playwright is None:
+        playwright = await async_playwright().start()
+
+    # 브라우저 설정
+    browser = await playwright.chromium.launch_persistent_context(
+        user_data_dir='./user_data',
+        headless=False,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+        ]
+    )
+
+    page = await browser.new_page()
+
+    # 0. 저장된 세션이 아직 유효하면 로그인 생략하고 월별예약 페이지로 바로 이동
+    session_store = build_session_store(config)
+    saved = session_store.load() if session_store else None
+    if saved:
+        await session_store.restore_async(browser, saved)
+        if await session_store.probe_async(page, saved):
+            print("✅ 저장된 로그인 세션 재사용")
+            startup_timer.mark_login('세션 재사용')
+            return page
+        print("🔐 세션 만료 → 전체 로그인 진행")
+        session_store.invalidate()
+
+    try:
+        # 1. 로그인 페이지 이동
+        await page.goto(config['DEFAULT']['LOGIN_URL'], timeout=60000)
+        await page.wait_for_selector('#fripPotForm', state='attached')
+
+        # 2. 계정 정보 입력
+        await page.evaluate(f"""() => {{
+            document.querySelector('#mmberId').value = '{config['CREDENTIALS']['USERNAME']}';
+            document.querySelector('#gnrlMmberPssrd').value = '{config['CREDENTIALS']['PASSWORD']}';
+        }}""")
+
+        # 3. 추가 보안 요소 처리
+        await page.click('#saveId')
+        await page.wait_for_timeout(1000)
+
+        # 4. 폼 제출
+        async with page.expect_navigation():
+            await page.click('.loginBtn')
+
+        # 5. 레이어 팝업 처리
+        if await handle_dynamic_popup(page):
+            print("✅ 팝업 닫기 완료")
+        else:
+            print("ℹ️ 팝업 없음 또는 이미 닫힘")
+
+        await page.wait_for_timeout(2000)  # 팝업 닫힌 후 안정화 대기
+
+        # 6. 월별예약 이동 (NetFunnel 등으로 인해 navigation이 아닐 수도 있음)
+        await page.click('//a[contains(@class, "btn-blue") and contains(., "월별예약")]')
+        await page.wait_for_timeout(2000)
+
+        page = browser.pages[2]
+
+        # 다음 실행에서 로그인 생략용 세션 저장
+        if session_store:
+            await page.wait_for_load_state('networkidle')
+            session_store.save(await browser.storage_state(), page.url)
+        startup_timer.mark_login('전체 로그인')
+
+        return page
+
+    except Exception as e:
+        await page.screenshot(path='login_error.png')
+        print(f'에러 발생: {str(e)}')
@@ -0,0 +1,301 @@
+from datetime import date, timedelta
+import argparse
+import calendar
+import configparser
+import json
+import sqlite3
+import threading
+import time
+from availability_matrix import EMPTY, OPEN, WAITING, STATUS_LABELS, status_code
+from crawl_planner import parse_month
+from result_sink import iter_results
+from watch_list import parse_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS availability (
+    region_code TEXT NOT NULL,
+    forest TEXT NOT NULL,
+    accommodation TEXT NOT NULL,
+    facility TEXT NOT NULL,
+    date TEXT NOT NULL,
+    region TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    PRIMARY KEY (region_code, forest, accommodation, facility, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS availability_by_date ON availability (date, status_code, region_code);
+CREATE TABLE IF NOT EXISTS availability_history (
+    region_code TEXT NOT NULL,
+    forest TEXT NOT NULL,
+    accommodation TEXT NOT NULL,
+    facility TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS availability_history_by_date ON availability_history (date, region_code);
+"""
+
+# 조회 상태 필터 → 상태 코드
+STATUS_FILTERS = {
+    'available': (OPEN, WAITING),
+    'open': (OPEN,),
+    'waiting': (WAITING,),
+    'gone': (EMPTY,),
+}
+GONE_STATUS = '없음'  # 직전에 있던 예약 가능 일자가 이번 결과에서 사라짐
+
+
+def _iso(date_str):
+    day = parse_date(date_str)
+    return day.isoformat() if day else None
+
+
+def _date_arg(value):
+    """argparse 날짜 인자 → ISO 날짜 (해석할 수 없으면 사용법 오류로 종료)"""
+    day = _iso(value)
+    if day is None:
+        raise argparse.ArgumentTypeError(f"날짜 형식 오류: {value!r} (예: 2025.07.12 또는 2025-07-12)")
+    return day
+
+
+def _status_code(status):
+    return EMPTY if status == GONE_STATUS else status_code(status)
+
+
+class AvailabilityDB:
+    """(지역 코드, 휴양림, 숙박시설, 시설, 날짜)별 최신 예약 상태 + 상태 변경 이력 (SQLite, 날짜/지역 인덱스)"""
+
+    def __init__(self, path='availability.db'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        """changed_at 열이 없던 DB: 기존 updated_at(마지막 변경 시각)으로 채움"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(availability)")]
+        if 'changed_at' not in columns:
+            self.conn.execute("ALTER TABLE availability ADD COLUMN changed_at REAL NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE availability SET changed_at = updated_at")
+
+    def ingest(self, result, observed_at=None):
+        """스크래핑 결과 1건 반영: 예약 가능 일자 갱신, 같은 숙박시설/월에서 사라진 일자는 '없음'으로 → 변경 칸 수
+
+        updated_at은 이번에 확인한 범위 전체의 마지막 수집 시각, changed_at은 상태가 마지막으로 바뀐 시각
+        """
+        context_info = result['context']
+        observed_at = observed_at or time.time()
+        scope = (context_info['region_code'], context_info['forest'], context_info['accommodation'])
+
+        current = {}
+        for facility in result['data']:
+            for entry in facility['dates']:
+                day = _iso(entry['date'])
+                if day:
+                    current[(facility['name'].strip(), day)] = entry['status'].strip()
+
+        # 결과 월 범위 (context 월, 없으면 결과 날짜들의 월)
+        month = parse_month({'value': context_info.get('month') or '', 'text': ''})
+        months = {month} if month else {(int(day[:4]), int(day[5:7])) for _, day in current}
+        ranges = [(date(y, m, 1).isoformat(), date(y, m, calendar.monthrange(y, m)[1]).isoformat())
+                  for y, m in months]
+
+        with self.lock, self.conn:
+            previous = {}
+            for first, last in ranges:
+                for facility, day, status in self.conn.execute(
+                    "SELECT facility, date, status FROM availability WHERE region_code = ? AND forest = ? "
+                    "AND accommodation = ? AND date BETWEEN ? AND ?", scope + (first, last)
+                ):
+                    previous[(facility, day)] = status
+
+            changed = {key: status for key, status in current.items() if previous.get(key) != status}
+            changed.update({key: GONE_STATUS for key, status in previous.items()
+                            if key not in current and status != GONE_STATUS})
+
+            for first, last in ranges:
+                self.conn.execute(
+                    "UPDATE availability SET updated_at = ? WHERE region_code = ? AND forest = ? "
+                    "AND accommodation = ? AND date BETWEEN ? AND ?", (observed_at,) + scope + (first, last)
+                )
+            self.conn.executemany(
+                "INSERT INTO availability VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (region_code, forest, accommodation, facility, date) DO UPDATE SET "
+                "status = excluded.status, status_code = excluded.status_code, region = excluded.region, "
+                "updated_at = excluded.updated_at, changed_at = excluded.changed_at",
+                [scope + key + (context_info['region'], status, _status_code(status), observed_at, observed_at,
+                                observed_at)
+                 for key, status in changed.items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO availability_history VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [scope + key + (status, observed_at) for key, status in changed.items()]
+            )
+        return len(changed)
+
+    def query(self, date_from=None, date_to=None, region=None, forest=None, accommodation=None,
+              status='available', limit=1000):
+        """조건에 맞는 최신 상태 목록 (region: 지역 코드 또는 이름, forest/accommodation: 부분 일치)"""
+        clauses, params = [], []
+        if date_from:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("date <= ?")
+            params.append(date_to)
+        if status != 'all':
+            codes = STATUS_FILTERS[status]
+            clauses.append(f"status_code IN ({', '.join('?' * len(codes))})")
+            params.extend(codes)
+        if region:
+            clauses.append("(region_code = ? OR region = ?)")
+            params.extend([region, region])
+        if forest:
+            clauses.append("forest LIKE ?")
+            params.append(f"%{forest}%")
+        if accommodation:
+            clauses.append("accommodation LIKE ?")
+            params.append(f"%{accommodation}%")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT date, region, region_code, forest, accommodation, facility, status, updated_at, changed_at "
+                f"FROM availability {where} ORDER BY date, region_code, forest, accommodation, facility LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        keys = ('date', 'region', 'region_code', 'forest', 'accommodation', 'facility', 'status', 'updated_at',
+                'changed_at')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def history(self, day, region=None, forest=None):
+        """특정 날짜의 상태 변경 이력 (관측 시각 순)"""
+        clauses, params = ["date = ?"], [day]
+        if region:
+            clauses.append("region_code = ?")
+            params.append(region)
+        if forest:
+            clauses.append("forest LIKE ?")
+            params.append(f"%{forest}%")
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT observed_at, region_code, forest, accommodation, facility, status "
+                f"FROM availability_history WHERE {' AND '.join(clauses)} ORDER BY observed_at", params
+            ).fetchall()
+        keys = ('observed_at', 'region_code', 'forest', 'accommodation', 'facility', 'status')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def report(self):
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT status_code, COUNT(*) FROM availability GROUP BY status_code"))
+            history = self.conn.execute("SELECT COUNT(*) FROM availability_history").fetchone()[0]
+        summary = ', '.join(f"{STATUS_LABELS.get(code, code)} {count}" for code, count in sorted(counts.items()))
+        print(f"🗄️ 예약 현황 DB: {summary or '비어 있음'} / 변경 이력 {history}건 ({self.path})")
+
+    def close(self):
+        self.conn.close()
+
+
+def build_availability_db(config):
+    """config.ini [AVAILABILITY_DB] 설정으로 DB 생성 (비활성화 시 None)"""
+    if not config.getboolean('AVAILABILITY_DB', 'ENABLED', fallback=True):
+        return None
+    return AvailabilityDB(path=config.get('AVAILABILITY_DB', 'PATH', fallback='availability.db'))
+
+
+def _load_results(path):
+    """comprehensive_results.json(배열) 또는 ResultSink JSONL 경로 → 결과 dict 반복"""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+    else:
+        yield from iter_results(path)
+
+
+def _date_range(args):
+    if args.date:
+        return args.date, args.date
+    if args.weekend:
+        today = date.today()
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        return saturday.isoformat(), (saturday + timedelta(days=1)).isoformat()
+    return args.date_from, args.date_to
+
+
+# 사용 예 (저장소 루트에서 실행):
+#   python availability_db.py ingest comprehensive_results.json
+#   python availability_db.py query --date 2025.07.12 --region 강원
+#   python availability_db.py query --from 2025-07-01 --to 2025-07-31 --forest 유명산 --status open
+#   python availability_db.py history --date 2025-07-12 --forest 유명산
+def main():
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='예약 현황 DB 적재/조회')
+    parser.add_argument('--db', default=config.get('AVAILABILITY_DB', 'PATH', fallback='availability.db'),
+                        help='DB 경로 (기본: config.ini [AVAILABILITY_DB] PATH)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='결과 파일(JSON 배열 또는 JSONL) 적재')
+    ingest.add_argument('paths', nargs='+')
+
+    query = commands.add_parser('query', help='날짜/지역/상태 조건 조회')
+    query.add_argument('--date', type=_date_arg, help='하루 (2025.07.12 또는 2025-07-12)')
+    query.add_argument('--from', dest='date_from', type=_date_arg)
+    query.add_argument('--to', dest='date_to', type=_date_arg)
+    query.add_argument('--weekend', action='store_true', help='다가오는 토/일')
+    query.add_argument('--region', help='지역 코드 또는 지역명')
+    query.add_argument('--forest', help='휴양림 이름 (부분 일치)')
+    query.add_argument('--accommodation', help='숙박시설 이름 (부분 일치)')
+    query.add_argument('--status', default='available', choices=list(STATUS_FILTERS) + ['all'])
+    query.add_argument('--limit', type=int, default=1000)
+    query.add_argument('--json', action='store_true', help='JSON으로 출력')
+
+    history = commands.add_parser('history', help='특정 날짜의 상태 변경 이력')
+    history.add_argument('--date', type=_date_arg, required=True)
+    history.add_argument('--region', help='지역 코드')
+    history.add_argument('--forest', help='휴양림 이름 (부분 일치)')
+
+    args = parser.parse_args()
+    db = AvailabilityDB(args.db)
+    started = time.perf_counter()
+
+    if args.command == 'ingest':
+        results = changed = 0
+        for path in args.paths:
+            for result in _load_results(path):
+                changed += db.ingest(result)
+                results += 1
+        print(f"📥 {results}건 적재, 상태 변경 {changed}칸 ({time.perf_counter() - started:.2f}s)")
+        db.report()
+
+    elif args.command == 'query':
+        date_from, date_to = _date_range(args)
+        rows = db.query(date_from, date_to, args.region, args.forest, args.accommodation, args.status, args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+        else:
+            for row in rows:
+                print(f"{row['date']}  {row['region']} / {row['forest']} / {row['accommodation']} / "
+                      f"{row['facility']}: {row['status']}")
+            print(f"🔎 {len(rows)}건 ({elapsed_ms:.1f}ms)")
+
+    else:
+        for row in db.history(args.date, args.region, args.forest):
+            observed = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['observed_at']))
+            print(f"{observed}  {row['forest']} / {row['accommodation']} / {row['facility']}: {row['status']}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+from array import array
+from datetime import date
+import base64
+import calendar
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy 미설치 시 같은 버퍼를 순수 파이썬 반복으로 처리
+    np = None
+
+DAYS = 31  # 월별 행 길이 (일 - 1 = 열 번호)
+
+# 상태 코드 (셀 1바이트): 0 = 셀/표시 없음
+EMPTY, OPEN, WAITING, BOOKED, CLOSED, OTHER = range(6)
+STATUS_PREFIXES = (('예', OPEN), ('대', WAITING), ('완', BOOKED), ('마', CLOSED))
+STATUS_LABELS = {EMPTY: '없음', OPEN: '예약가능', WAITING: '대기', BOOKED: '예약완료', CLOSED: '마감', OTHER: '기타'}
+
+_DATE = re.compile(r'(20\d{2})\D(\d{1,2})\D(\d{1,2})')
+_MONTH = re.compile(r'(20\d{2})\D{0,3}(\d{1,2})')
+
+
+def status_code(status):
+    status = (status or '').strip()
+    for prefix, code in STATUS_PREFIXES:
+        if status.startswith(prefix):
+            return code
+    return OTHER if status else EMPTY
+
+
+def encode_rows(rows):
+    """행별 [title, 상태] 셀 목록 → 시설당 31바이트 상태 코드 (title의 날짜로 열 결정, 없으면 셀 순서)
+
+    예약 가능 여부와 관계없이 모든 상태를 기록 (build_facility_entries는 '예'/'대'만 남김)
+    """
+    encoded = bytearray(len(rows) * DAYS)
+    for index, cells in enumerate(rows):
+        base = index * DAYS
+        for position, cell in enumerate(cells):
+            if not cell:
+                continue
+            title, status = cell
+            match = _DATE.search(title or '')
+            day = int(match.group(3)) if match else position + 1
+            if 1 <= day <= DAYS:
+                encoded[base + day - 1] = status_code(status)
+    return bytes(encoded)
+
+
+def _context_month(context_info):
+    match = _MONTH.search(context_info.get('month') or '')
+    if match and 1 <= int(match.group(2)) <= 12:
+        return int(match.group(1)), int(match.group(2))
+    return None
+
+
+def rows_month(rows):
+    """셀 title의 첫 날짜로 본 결과 월 (연, 월), 없으면 None"""
+    for cells in rows:
+        for cell in cells:
+            found = cell and _DATE.search(cell[0] or '')
+            if found:
+                return int(found.group(1)), int(found.group(2))
+    return None
+
+
+class _MonthMatrix:
+    """한 달치 (시설 행 × 31일) 상태 코드 버퍼"""
+
+    def __init__(self):
+        self.facility_ids = array('I')  # 행 → 시설 번호
+        self.row_of = {}  # 시설 번호 → 행
+        self.codes = bytearray()
+
+    def put(self, facility_id, row_codes):
+        row = self.row_of.get(facility_id)
+        if row is None:
+            self.row_of[facility_id] = len(self.facility_ids)
+            self.facility_ids.append(facility_id)
+            self.codes += row_codes
+        else:
+            self.codes[row * DAYS:(row + 1) * DAYS] = row_codes  # 재수집 시 덮어씀
+
+    def view(self):
+        """numpy (행, 31) uint8 배열 (버퍼 스냅샷이라 이후 행 추가에 영향 없음)"""
+        return np.frombuffer(bytes(self.codes), dtype=np.uint8).reshape(-1, DAYS)
+
+
+class AvailabilityMatrix:
+    """전체 순회 결과를 월별 (시설 × 일) 상태 코드 행렬로 보관 (지역/휴양림/시설 이름은 번호로 한 번만 저장)
+
+    numpy가 있으면 비교/집계/검색을 벡터 연산으로, 없으면 같은 bytearray를 순회
+    """
+
+    def __init__(self, path='availability_matrix.json'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.regions = []  # (region_code, 지역명)
+        self.forests = []  # (지역 번호, 휴양림명)
+        self.facilities = []  # (휴양림 번호, 숙박시설명, 시설명)
+        self.forest_region = array('I')
+        self.facility_forest = array('I')
+        self.region_index = {}
+        self.forest_index = {}
+        self.facility_index = {}
+        self.months = {}  # (연, 월) → _MonthMatrix
+
+    # --- 이름 테이블 ---
+    def _intern(self, region_code, region, forest, accommodation, facility):
+        region_key = (region_code, region)
+        region_id = self.region_index.get(region_key)
+        if region_id is None:
+            region_id = self.region_index[region_key] = len(self.regions)
+            self.regions.append(region_key)
+
+        forest_key = (region_id, forest)
+        forest_id = self.forest_index.get(forest_key)
+        if forest_id is None:
+            forest_id = self.forest_index[forest_key] = len(self.forests)
+            self.forests.append(forest_key)
+            self.forest_region.append(region_id)
+
+        facility_key = (forest_id, accommodation, facility)
+        facility_id = self.facility_index.get(facility_key)
+        if facility_id is None:
+            facility_id = self.facility_index[facility_key] = len(self.facilities)
+            self.facilities.append(facility_key)
+            self.facility_forest.append(forest_id)
+        return facility_id
+
+    def describe(self, facility_id):
+        """시설 번호 → {region, forest, accommodation, facility}"""
+        forest_id, accommodation, facility = self.facilities[facility_id]
+        region_id, forest = self.forests[forest_id]
+        return {'region': self.regions[region_id][1], 'forest': forest,
+                'accommodation': accommodation, 'facility': facility}
+
+    def _global_key(self, facility_id):
+        """행렬 인스턴스와 무관한 시설 식별 키 (비교용)"""
+        forest_id, accommodation, facility = self.facilities[facility_id]
+        region_id, forest = self.forests[forest_id]
+        return self.regions[region_id][0], forest, accommodation, facility
+
+    # --- 기록 ---
+    def add(self, context_info, names, rows):
+        """검색 1회의 시설명 + 행별 [title, 상태] 셀 기록"""
+        self.add_encoded(context_info, names, encode_rows(rows), rows_month(rows))
+
+    def add_encoded(self, context_info, names, encoded, rows_month_key=None):
+        """encode_rows 결과 기록 (파싱 프로세스에서 미리 인코딩한 경우), 월은 context 우선"""
+        month_key = _context_month(context_info) or rows_month_key
+        if month_key is None:
+            return
+        with self.lock:
+            month = self.months.setdefault(month_key, _MonthMatrix())
+            for index, name in enumerate(names[:len(encoded) // DAYS]):
+                facility_id = self._intern(context_info.get('region_code', ''), context_info['region'],
+                                           context_info['forest'], context_info['accommodation'], name.strip())
+                month.put(facility_id, encoded[index * DAYS:(index + 1) * DAYS])
+
+    # --- 조회 ---
+    def count_by_region(self, status=OPEN):
+        """지역별 해당 상태 일자 수"""
+        counts = [0] * len(self.regions)
+        with self.lock:
+            for month in self.months.values():
+                if not month.facility_ids:
+                    continue
+                if np is not None:
+                    per_row = (month.view() == status).sum(axis=1)
+                    forests = np.asarray(self.facility_forest)[np.asarray(month.facility_ids)]
+                    regions = np.asarray(self.forest_region)[forests]
+                    for region_id, count in enumerate(np.bincount(regions, weights=per_row,
+                                                                  minlength=len(self.regions))):
+                        counts[region_id] += int(count)
+                else:
+                    for row, facility_id in enumerate(month.facility_ids):
+                        region_id = self.forest_region[self.facility_forest[facility_id]]
+                        counts[region_id] += month.codes[row * DAYS:(row + 1) * DAYS].count(status)
+        return {name: count for (_, name), count in zip(self.regions, counts)}
+
+    def find(self, status=OPEN, weekdays=None):
+        """해당 상태인 (시설 정보, 날짜) 목록 (weekdays: 0=월 ... 6=일, 예: {5} = 토요일)"""
+        found = []
+        with self.lock:
+            for (year, month_no), month in sorted(self.months.items()):
+                days_in_month = calendar.monthrange(year, month_no)[1]
+                columns = [day for day in range(days_in_month)
+                           if weekdays is None or date(year, month_no, day + 1).weekday() in weekdays]
+                if not columns or not month.facility_ids:
+                    continue
+
+                if np is not None:
+                    mask = np.zeros(DAYS, dtype=bool)
+                    mask[columns] = True
+                    hits = zip(*np.nonzero((month.view() == status) & mask))
+                else:
+                    hits = ((row, day) for row in range(len(month.facility_ids)) for day in columns
+                            if month.codes[row * DAYS + day] == status)
+
+                for row, day in hits:
+                    found.append((self.describe(month.facility_ids[row]), date(year, month_no, int(day) + 1)))
+        return found
+
+    def diff(self, previous):
+        """직전 행렬 대비 상태가 바뀐 칸 → [(시설 정보, 날짜, 이전 상태 코드, 현재 상태 코드)]
+
+        양쪽에 모두 있는 (월, 시설)만 비교 (이번에 수집하지 않은 시설은 변경으로 보지 않음)
+        """
+        old_ids = {previous._global_key(facility_id): facility_id for facility_id in range(len(previous.facilities))}
+        changes = []
+        with self.lock:
+            for (year, month_no), month in sorted(self.months.items()):
+                old_month = previous.months.get((year, month_no))
+                if old_month is None:
+                    continue
+
+                # 두 행렬의 같은 시설 행 짝 맞추기
+                rows, old_rows = [], []
+                for row, facility_id in enumerate(month.facility_ids):
+                    old_row = old_month.row_of.get(old_ids.get(self._global_key(facility_id)))
+                    if old_row is not None:
+                        rows.append(row)
+                        old_rows.append(old_row)
+                if not rows:
+                    continue
+
+                if np is not None:
+                    current, before = month.view()[rows], old_month.view()[old_rows]
+                    changed = [(i, day, int(before[i, day]), int(current[i, day]))
+                               for i, day in zip(*np.nonzero(current != before))]
+                else:
+                    changed = []
+                    for i, (row, old_row) in enumerate(zip(rows, old_rows)):
+                        for day in range(DAYS):
+                            old_code, new_code = old_month.codes[old_row * DAYS + day], month.codes[row * DAYS + day]
+                            if old_code != new_code:
+                                changed.append((i, day, old_code, new_code))
+
+                for i, day, old_code, new_code in changed:
+                    changes.append((self.describe(month.facility_ids[rows[i]]), date(year, month_no, int(day) + 1),
+                                    old_code, new_code))
+        return changes
+
+    def nbytes(self):
+        return sum(len(month.codes) + month.facility_ids.itemsize * len(month.facility_ids)
+                   for month in self.months.values())
+
+    def report(self):
+        cells = sum(len(month.facility_ids) for month in self.months.values())
+        print(f"🧮 예약 현황 행렬: 시설 {len(self.facilities)}개, {len(self.months)}개월, "
+              f"시설-월 {cells}행 ({self.nbytes() / 1024:.1f}KB, {'numpy' if np is not None else 'array'})")
+        for region, count in self.count_by_region(OPEN).items():
+            print(f"  - {region}: 예약 가능 {count}일")
+
+    # --- 저장 ---
+    def to_dict(self):
+        with self.lock:
+            return {
+                'saved_at': time.time(),
+                'regions': self.regions,
+                'forests': self.forests,
+                'facilities': self.facilities,
+                'months': {
+                    f"{year}-{month_no:02d}": {
+                        'facility_ids': list(month.facility_ids),
+                        'codes': base64.b64encode(bytes(month.codes)).decode('ascii'),
+                    }
+                    for (year, month_no), month in self.months.items()
+                },
+            }
+
+    @classmethod
+    def from_dict(cls, saved, path='availability_matrix.json'):
+        matrix = cls(path)
+        for region_code, region in saved['regions']:
+            matrix.region_index[(region_code, region)] = len(matrix.regions)
+            matrix.regions.append((region_code, region))
+        for region_id, forest in saved['forests']:
+            matrix.forest_index[(region_id, forest)] = len(matrix.forests)
+            matrix.forests.append((region_id, forest))
+            matrix.forest_region.append(region_id)
+        for forest_id, accommodation, facility in saved['facilities']:
+            matrix.facility_index[(forest_id, accommodation, facility)] = len(matrix.facilities)
+            matrix.facilities.append((forest_id, accommodation, facility))
+            matrix.facility_forest.append(forest_id)
+        for key, stored in saved['months'].items():
+            year, month_no = key.split('-')
+            month = matrix.months[(int(year), int(month_no))] = _MonthMatrix()
+            month.facility_ids = array('I', stored['facility_ids'])
+            month.row_of = {facility_id: row for row, facility_id in enumerate(month.facility_ids)}
+            month.codes = bytearray(base64.b64decode(stored['codes']))
+        return matrix
+
+    @classmethod
+    def load(cls, path='availability_matrix.json'):
+        """저장된 행렬 (없으면 None)"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), path)
+
+    def save(self):
+        """직전 저장본과 비교 결과 출력 후 저장"""
+        previous = AvailabilityMatrix.load(self.path)
+        if previous is not None:
+            changes = self.diff(previous)
+            opened = sum(1 for _, _, old, new in changes if new == OPEN)
+            print(f"🧮 직전 순회 대비 상태 변경 {len(changes)}칸 (예약 가능으로 변경 {opened}칸)")
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        print(f"💾 예약 현황 행렬 저장: {self.path}")
+
+
+def build_availability_matrix(config):
+    """config.ini [AVAILABILITY_MATRIX] 설정으로 행렬 생성 (비활성화 시 None)"""
+    if not config.getboolean('AVAILABILITY_MATRIX', 'ENABLED', fallback=False):
+        return None
+    return AvailabilityMatrix(path=config.get('AVAILABILITY_MATRIX', 'PATH', fallback='availability_matrix.json'))
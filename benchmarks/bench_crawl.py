@@ -0,0 +1,164 @@
+"""오프라인 크롤링 벤치마크: 목업 월별예약 서버 + 텔레그램 스텁으로 ForestReservationSystem 전수 스크래핑 측정
+
+실제 사이트 로그인/텔레그램 전송 없이 조합/초, 단계별(select/search/scrape/notify) p50/p95 지연, 메모리를 보고.
+사용법 (저장소 루트에서 실행):
+    python benchmarks/bench_crawl.py --regions 2 --forests 3 --accommodations 2 --months 2 --option-latency 150
+"""
+from playwright.sync_api import sync_playwright
+import argparse
+import configparser
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_foresttrip import add_catalog_arguments, build_server
+from mock_telegram import MockTelegramServer
+
+STAGES = ['select_combination', 'search', 'scrape_current_results', 'notify_result', 'flush_notifications']
+
+
+def write_bench_config(workdir, telegram_url, args):
+    """저장소 config.ini를 복사해 외부 호출/상태 파일만 벤치마크용으로 교체"""
+    config = configparser.ConfigParser()
+    config.optionxform = str  # 키 대소문자 유지
+    config.read(os.path.join(ROOT, 'config.ini'), encoding='utf-8')
+
+    overrides = {
+        'TELEGRAM': {'TOKEN': 'bench', 'API_BASE': telegram_url},
+        'SNAPSHOT': {'PATH': os.path.join(workdir, 'snapshot.db')},
+        'CHECKPOINT': {'PATH': os.path.join(workdir, 'checkpoint.db')},
+        'RESULT_SINK': {'PATH': os.path.join(workdir, 'results.jsonl')},
+        'OPTION_CACHE': {'PATH': os.path.join(workdir, 'option_tree_cache.json')},
+        'SESSION': {'ENABLED': 'false'},
+        'RESOURCE_BLOCKING': {'SITE_HOSTS': '127.0.0.1'},
+        'SCRAPING': {'LOOP_ORDER': args.loop_order},
+    }
+    if not args.telegram_limits:
+        # 실제 한도(채팅방별 분당 20건)는 목업 텔레그램에서 대기 시간만 늘려 조합/초를 왜곡
+        overrides['TELEGRAM_LIMITS'] = {'GLOBAL_PER_SEC': '100000', 'CHAT_PER_MIN': '6000000', 'CHAT_BURST': '100000'}
+    for section, values in overrides.items():
+        if not config.has_section(section):
+            config.add_section(section)
+        for key, value in values.items():
+            config.set(section, key, value)
+
+    # [WATCH:...] 섹션은 벤치마크 대상 아님
+    for section in config.sections():
+        if section.startswith('WATCH:'):
+            config.remove_section(section)
+
+    with open(os.path.join(workdir, 'config.ini'), 'w', encoding='utf-8') as f:
+        config.write(f)
+
+
+def time_stages(system, timings):
+    """단계별 소요 시간 기록용 래퍼를 인스턴스에 설치"""
+    for name in STAGES:
+        original = getattr(system, name)
+
+        def timed(*args, _original=original, _name=name, **kwargs):
+            started = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                timings[_name].append((time.perf_counter() - started) * 1000)
+
+        setattr(system, name, timed)
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 1) if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='목업 서버 기반 전수 스크래핑 벤치마크')
+    add_catalog_arguments(parser)
+    parser.add_argument('--telegram-latency', type=int, default=50)
+    parser.add_argument('--throttle-every', type=int, default=0)
+    parser.add_argument('--telegram-limits', action='store_true',
+                        help='config.ini [TELEGRAM_LIMITS] 전송 한도 그대로 적용 (기본: 한도 해제)')
+    parser.add_argument('--loop-order', default='accommodation_first', choices=['accommodation_first', 'month_first'])
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    site = build_server(args).start()
+    telegram = MockTelegramServer(args.telegram_latency, args.throttle_every).start()
+    workdir = tempfile.mkdtemp(prefix='bench_crawl_')
+    write_bench_config(workdir, telegram.url, args)
+
+    cwd = os.getcwd()
+    os.chdir(workdir)  # ForestReservationSystem은 현재 디렉터리의 config.ini를 읽음
+    try:
+        from forest_headless_reservation import ForestReservationSystem
+
+        timings = {name: [] for name in STAGES}
+        tracemalloc.start()
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=not args.headed)
+            page = browser.new_page()
+            page.goto(site.url)
+
+            system = ForestReservationSystem(page)
+            system.install_resource_router()
+            time_stages(system, timings)
+
+            started = time.perf_counter()
+            system.run_comprehensive_scraping()
+            elapsed = time.perf_counter() - started
+            system.shutdown()
+            browser.close()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+        site.stop()
+        telegram.stop()
+
+    combos = len(timings['scrape_current_results'])
+    flush_s = sum(timings['flush_notifications']) / 1000
+    crawl_s = elapsed - flush_s  # 남은 텔레그램 전송 대기(flush)를 뺀 크롤링 시간
+    report = {
+        'catalog': {k: getattr(args, k) for k in ('months', 'regions', 'forests', 'accommodations', 'facilities')},
+        'latency_ms': {'option': args.option_latency, 'search': args.search_latency},
+        'loop_order': args.loop_order,
+        'combinations': combos,
+        'telegram_limits': args.telegram_limits,
+        'elapsed_s': round(elapsed, 2),
+        'crawl_s': round(crawl_s, 2),
+        'flush_s': round(flush_s, 2),
+        'combinations_per_s': round(combos / crawl_s, 3) if crawl_s > 0 else 0.0,
+        'stages': {name: {'count': len(values), 'p50_ms': percentile(values, 0.50), 'p95_ms': percentile(values, 0.95)}
+                   for name, values in timings.items()},
+        'python_peak_mb': round(peak / 1024 / 1024, 1),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'site_requests': dict(site.counts),
+        'telegram': telegram.stats(),
+    }
+
+    print(f"\n🧪 오프라인 크롤링 벤치마크 ({args.loop_order})")
+    print(f"  조합 {combos}개 / 크롤링 {report['crawl_s']}s → {report['combinations_per_s']} 조합/s "
+          f"(전송 마무리 {report['flush_s']}s 별도, 텔레그램 한도 {'적용' if args.telegram_limits else '해제'})")
+    for name, stats in report['stages'].items():
+        print(f"  - {name:24s}: {stats['count']:4d}회, p50 {stats['p50_ms']:8.1f}ms, p95 {stats['p95_ms']:8.1f}ms")
+    print(f"  메모리: Python 최대 {report['python_peak_mb']}MB (tracemalloc), 프로세스 RSS {report['max_rss_mb']}MB")
+    print(f"  서버 요청: {report['site_requests']}, 텔레그램: {report['telegram']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
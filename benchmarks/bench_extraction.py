@@ -0,0 +1,143 @@
+"""결과 테이블 추출 벤치마크: 요소별 호출(element) vs evaluate 1회(bulk) vs outerHTML 캡처 + 파서(html)
+
+사용법 (저장소 루트에서 실행):
+    python benchmarks/bench_extraction.py --facilities 20 --days 31 --repeat 5
+"""
+from playwright.sync_api import sync_playwright
+import argparse
+import configparser
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from capture_parser import DAY_LIST_CAPTURE_JS, PARSERS
+from day_list_parser import build_facility_entries
+
+STATUSES = ['예', '대', '완', '마감']
+
+
+def build_day_list_html(facility_count, day_count):
+    """#dayListTable 구조를 흉내 낸 합성 월별 예약 현황 페이지"""
+    rows = []
+    for f in range(facility_count):
+        cells = [f'<td class="list_left"><div class="simpleMonthDiv">숲속의집 {f + 1}호</div></td>']
+        for d in range(day_count):
+            status = STATUSES[(f + d) % len(STATUSES)]
+            mark_class = 'apt_mark' if status == '예' else 'apt_mark_2'
+            cells.append(f'<td><span class="{mark_class}" title="{status} 2025.06.{d + 1:02d}">{status}</span></td>')
+        rows.append('<tr>' + ''.join(cells) + '</tr>')
+
+    return (
+        '<html><body><table id="dayListTable"><tbody id="dayListTbody">'
+        + ''.join(rows)
+        + '</tbody></table></body></html>'
+    )
+
+
+def write_bench_config(workdir):
+    """저장소 config.ini를 복사해 상태 파일/DB/텔레그램/조회 API 등 추출과 무관한 기능을 끈 설정 작성"""
+    config = configparser.ConfigParser()
+    config.optionxform = str  # 키 대소문자 유지
+    config.read(os.path.join(ROOT, 'config.ini'), encoding='utf-8')
+
+    overrides = {
+        'TELEGRAM': {'TOKEN': 'bench', 'API_BASE': 'http://127.0.0.1:9'},
+        'OPTION_CACHE': {'PATH': os.path.join(workdir, 'option_tree_cache.json')},
+        'SCRAPING': {'EXTRACTION_MODE': 'bulk'},
+        'HTML_CAPTURE': {'POOL_WORKERS': '0', 'CAPTURE_PATH': ''},
+    }
+    for section in ('SNAPSHOT', 'NOTIFY_QUEUE', 'TELEGRAM_COALESCE', 'RESULT_SINK', 'CHECKPOINT',
+                    'RESOURCE_BLOCKING', 'SESSION', 'AVAILABILITY_MATRIX', 'AVAILABILITY_DB',
+                    'READ_API', 'METRICS'):
+        overrides[section] = {'ENABLED': 'false'}
+    for section, values in overrides.items():
+        if not config.has_section(section):
+            config.add_section(section)
+        for key, value in values.items():
+            config.set(section, key, value)
+
+    with open(os.path.join(workdir, 'config.ini'), 'w', encoding='utf-8') as f:
+        config.write(f)
+
+
+def measure(extract, repeat):
+    """추출 함수 반복 실행 후 (평균 ms, 최소 ms, 마지막 결과)"""
+    durations = []
+    extracted = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extracted = extract()
+        durations.append((time.perf_counter() - started) * 1000)
+    return sum(durations) / len(durations), min(durations), extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='결과 테이블 추출 방식 비교')
+    parser.add_argument('--facilities', type=int, default=20)
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_extraction_')
+    write_bench_config(workdir)
+    cwd = os.getcwd()
+    os.chdir(workdir)  # ForestReservationSystem은 현재 디렉터리의 config.ini를 읽음
+    try:
+        run(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run(args):
+    from forest_headless_reservation import ForestReservationSystem
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(build_day_list_html(args.facilities, args.days))
+
+        system = ForestReservationSystem(page)
+        try:
+            benchmark(system, page, args)
+        finally:
+            system.shutdown()
+            browser.close()
+
+
+def benchmark(system, page, args):
+    """요소별/bulk/캡처+파서별 추출 시간 측정 후 결과 일치 여부 확인"""
+    print(f"🧪 추출 벤치마크: 시설 {args.facilities}개 × {args.days}일, {args.repeat}회 반복")
+
+    results = {}
+    for mode, extract in [('element', system._extract_day_list_per_element),
+                          ('bulk', system._extract_day_list_bulk)]:
+        avg_ms, min_ms, (names, rows) = measure(extract, args.repeat)
+        results[mode] = build_facility_entries(names, rows)
+        print(f"  - {mode:8s}: 평균 {avg_ms:8.1f}ms, 최소 {min_ms:8.1f}ms")
+
+    # html: 브라우저 측 비용(캡처)과 파서별 파싱 비용을 나눠 측정
+    avg_ms, min_ms, html_text = measure(lambda: page.evaluate(DAY_LIST_CAPTURE_JS), args.repeat)
+    print(f"  - {'capture':8s}: 평균 {avg_ms:8.1f}ms, 최소 {min_ms:8.1f}ms ({len(html_text)}자)")
+    for name, parse in PARSERS.items():
+        if parse is None:
+            print(f"  - {name:8s}: 미설치")
+            continue
+        avg_ms, min_ms, (names, rows) = measure(lambda: parse(html_text), args.repeat)
+        results[name] = build_facility_entries(names, rows)
+        print(f"  - {name:8s}: 평균 {avg_ms:8.1f}ms, 최소 {min_ms:8.1f}ms (파싱만)")
+
+    mismatched = [mode for mode, data in results.items() if data != results['bulk']]
+    if not mismatched:
+        print(f"✅ {len(results)}개 방식의 결과 일치")
+    else:
+        print(f"❌ bulk 결과와 불일치: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""월별예약 페이지 로컬 목업 서버 (실제 사이트와 같은 select/검색/결과 테이블 DOM 구조)
+
+사용법 (저장소 루트에서 실행):
+    python benchmarks/mock_foresttrip.py --port 8800 --regions 3 --option-latency 150
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import calendar
+import hashlib
+import html
+import json
+import threading
+import time
+
+PAGE_SCRIPT = """
+window.jQuery = window.jQuery || {active: 0};  // 실제 사이트의 jQuery.active 계약만 흉내
+
+function fillSelect(id, placeholder, items) {
+    const el = document.getElementById(id);
+    el.innerHTML = '';
+    el.add(new Option(placeholder, ''));
+    items.forEach(item => el.add(new Option(item.text, item.value)));
+}
+
+async function loadOptions(level, parent, id, placeholder) {
+    jQuery.active++;
+    try {
+        const res = await fetch('/mock/options?level=' + level + '&parent=' + encodeURIComponent(parent));
+        fillSelect(id, placeholder, await res.json());
+    } finally {
+        jQuery.active--;
+    }
+}
+
+function onSido() {
+    fillSelect('srchInstt', '휴양림 선택', []);
+    fillSelect('srchForest', '숙박시설 선택', []);
+    fillSelect('srchForest2', '전체', []);
+    loadOptions('forest', document.getElementById('srchSido').value, 'srchInstt', '휴양림 선택');
+}
+
+function onInstt() {
+    fillSelect('srchForest', '숙박시설 선택', []);
+    fillSelect('srchForest2', '전체', []);
+    loadOptions('accommodation', document.getElementById('srchInstt').value, 'srchForest', '숙박시설 선택');
+}
+
+function onForest() {
+    loadOptions('facility', document.getElementById('srchForest').value, 'srchForest2', '전체');
+}
+"""
+
+
+class MockCatalog:
+    """합성 지역/휴양림/숙박시설/시설 목록과 예약 현황"""
+
+    def __init__(self, months=2, regions=2, forests=3, accommodations=2, facilities=5,
+                 start_year=2026, start_month=1, churn_seconds=0):
+        self.months = []
+        year, month = start_year, start_month
+        for _ in range(months):
+            self.months.append({'value': f"{year}{month:02d}", 'text': f"{year}년 {month:02d}월"})
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        self.regions = [{'value': str(r + 1), 'text': f"지역{r + 1}"} for r in range(regions)]
+        self.forests_per_region = forests
+        self.accommodations_per_forest = accommodations
+        self.facilities_per_accommodation = facilities
+        self.churn_seconds = churn_seconds  # 0이면 예약 현황 고정, 아니면 주기마다 일부 변경
+
+    def children(self, level, parent):
+        """상위 값 → 하위 옵션 목록"""
+        if level == 'forest':
+            return [{'value': f"{parent}-{f + 1}", 'text': f"휴양림{parent}-{f + 1}"}
+                    for f in range(self.forests_per_region)]
+        if level == 'accommodation':
+            return [{'value': f"{parent}-{a + 1}", 'text': f"숙박시설{parent}-{a + 1}"}
+                    for a in range(self.accommodations_per_forest)]
+        if level == 'facility':
+            return [{'value': f"{parent}-{n + 1}", 'text': f"숲속의집 {n + 1}호"}
+                    for n in range(self.facilities_per_accommodation)]
+        return []
+
+    def status(self, accommodation, facility, day):
+        epoch = int(time.time() // self.churn_seconds) if self.churn_seconds else 0
+        digest = hashlib.md5(f"{accommodation}|{facility}|{day}|{epoch}".encode()).digest()[0]
+        if digest < 40:
+            return '예약'
+        if digest < 60:
+            return '대기'
+        return '완료'
+
+    def day_list(self, month, accommodation):
+        """#dayListTable 행 데이터: [(시설명, [(title, 상태)...])]"""
+        year, mon = int(month[:4]), int(month[4:6])
+        days = calendar.monthrange(year, mon)[1]
+        rows = []
+        for facility in self.children('facility', accommodation):
+            cells = [(f"{year}.{mon:02d}.{d:02d}", self.status(accommodation, facility['value'], d))
+                     for d in range(1, days + 1)]
+            rows.append((facility['text'], cells))
+        return rows
+
+
+def _options_html(options, selected, placeholder=None):
+    parts = [f'<option value="">{placeholder}</option>'] if placeholder is not None else []
+    for option in options:
+        mark = ' selected' if option['value'] == selected else ''
+        parts.append(f'<option value="{html.escape(option["value"])}"{mark}>{html.escape(option["text"])}</option>')
+    return ''.join(parts)
+
+
+def render_page(catalog, query):
+    """검색 조건이 유지된 월별예약 페이지 (조건이 모두 있으면 결과 테이블 포함)"""
+    month = query.get('month', catalog.months[0]['value'])
+    sido, instt, forest = query.get('sido', ''), query.get('instt', ''), query.get('forest', '')
+
+    forests = catalog.children('forest', sido) if sido else []
+    accommodations = catalog.children('accommodation', instt) if instt else []
+    facilities = catalog.children('facility', forest) if forest else []
+
+    table = ''
+    if sido and instt and forest:
+        rows = []
+        for name, cells in catalog.day_list(month, forest):
+            tds = [f'<td class="list_left"><div class="simpleMonthDiv">{html.escape(name)}</div></td>']
+            for title, status in cells:
+                mark_class = 'apt_mark' if status == '예약' else 'apt_mark_2'
+                tds.append(f'<td><span class="{mark_class}" title="{status} {title}">{status}</span></td>')
+            rows.append('<tr>' + ''.join(tds) + '</tr>')
+        table = f'<table id="dayListTable"><tbody id="dayListTbody">{"".join(rows)}</tbody></table>'
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>월별예약 (mock)</title><script>{PAGE_SCRIPT}</script></head>
+<body>
+<form id="searchForm" method="get" action="/">
+  <input type="hidden" name="_csrf" value="mock-csrf-token">
+  <select id="monthSelectBox" name="month">{_options_html(catalog.months, month)}</select>
+  <select id="srchSido" name="sido" onchange="onSido()">{_options_html(catalog.regions, sido, '지역 선택')}</select>
+  <select id="srchInstt" name="instt" onchange="onInstt()">{_options_html(forests, instt, '휴양림 선택')}</select>
+  <select id="srchForest" name="forest" onchange="onForest()">{_options_html(accommodations, forest, '숙박시설 선택')}</select>
+  <select id="srchForest2" name="forest2">{_options_html(facilities, query.get('forest2', ''), '전체')}</select>
+  <button type="button" id="searchBtn" onclick="document.getElementById('searchForm').submit()">검색</button>
+</form>
+{table}
+</body></html>"""
+
+
+class MockForesttripServer:
+    """목업 서버를 백그라운드 스레드로 실행 (옵션 AJAX/검색 응답 지연 설정 가능)"""
+
+    def __init__(self, catalog, option_latency_ms=100, search_latency_ms=200, port=0):
+        self.catalog = catalog
+        self.option_latency = option_latency_ms / 1000
+        self.search_latency = search_latency_ms / 1000
+        self.lock = threading.Lock()
+        self.counts = {'page': 0, 'search': 0, 'options': 0}
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def _count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, body, content_type):
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+                if parts.path == '/mock/options':
+                    mock._count('options')
+                    time.sleep(mock.option_latency)
+                    options = mock.catalog.children(query.get('level'), query.get('parent', ''))
+                    self._send(json.dumps(options, ensure_ascii=False), 'application/json')
+                elif parts.path == '/':
+                    if query.get('forest'):
+                        mock._count('search')
+                        time.sleep(mock.search_latency)
+                    else:
+                        mock._count('page')
+                    self._send(render_page(mock.catalog, query), 'text/html')
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-foresttrip', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_catalog_arguments(parser):
+    parser.add_argument('--months', type=int, default=2)
+    parser.add_argument('--regions', type=int, default=2)
+    parser.add_argument('--forests', type=int, default=3)
+    parser.add_argument('--accommodations', type=int, default=2)
+    parser.add_argument('--facilities', type=int, default=5)
+    parser.add_argument('--churn-seconds', type=int, default=0, help='예약 현황 변경 주기(초), 0이면 고정')
+    parser.add_argument('--option-latency', type=int, default=100, help='옵션 AJAX 응답 지연(ms)')
+    parser.add_argument('--search-latency', type=int, default=200, help='검색 응답 지연(ms)')
+
+
+def build_server(args, port=0):
+    catalog = MockCatalog(args.months, args.regions, args.forests, args.accommodations, args.facilities,
+                          churn_seconds=args.churn_seconds)
+    return MockForesttripServer(catalog, args.option_latency, args.search_latency, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='월별예약 페이지 목업 서버')
+    parser.add_argument('--port', type=int, default=8800)
+    add_catalog_arguments(parser)
+    args = parser.parse_args()
+
+    server = build_server(args, args.port)
+    print(f"🧪 목업 서버 실행: {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""텔레그램 Bot API sendMessage 로컬 스텁 (실제 채팅방으로 전송하지 않고 건수/바이트만 집계)
+
+사용법 (저장소 루트에서 실행):
+    python benchmarks/mock_telegram.py --port 8801 --throttle-every 20
+    → config.ini [TELEGRAM] API_BASE = http://127.0.0.1:8801
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import argparse
+import json
+import threading
+import time
+
+
+class MockTelegramServer:
+    """sendMessage 요청 집계, throttle_every번째 요청마다 429 retry_after 응답"""
+
+    def __init__(self, latency_ms=50, throttle_every=0, retry_after=1, port=0):
+        self.latency = latency_ms / 1000
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.delivered = 0
+        self.throttled = 0
+        self.bytes = 0
+        self.per_chat = {}
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _handle(self, payload):
+        """요청 1건 처리 → (HTTP 상태, 응답 dict)"""
+        with self.lock:
+            self.requests += 1
+            if self.throttle_every and self.requests % self.throttle_every == 0:
+                self.throttled += 1
+                return 429, {'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                             'parameters': {'retry_after': self.retry_after}}
+            self.delivered += 1
+            self.bytes += len(str(payload.get('text', '')).encode('utf-8'))
+            chat_id = str(payload.get('chat_id'))
+            self.per_chat[chat_id] = self.per_chat.get(chat_id, 0) + 1
+            return 200, {'ok': True, 'result': {'message_id': self.delivered}}
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.endswith('/sendMessage'):
+                    self.send_error(404)
+                    return
+
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if 'json' in self.headers.get('Content-Type', ''):
+                    payload = json.loads(body or b'{}')
+                else:
+                    payload = {k: v[0] for k, v in parse_qs(body.decode('utf-8')).items()}
+
+                time.sleep(mock.latency)
+                status, response = mock._handle(payload)
+                data = json.dumps(response).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'delivered': self.delivered,
+                'throttled': self.throttled,
+                'bytes': self.bytes,
+                'chats': len(self.per_chat),
+            }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-telegram', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='텔레그램 sendMessage 스텁 서버')
+    parser.add_argument('--port', type=int, default=8801)
+    parser.add_argument('--latency', type=int, default=50, help='응답 지연(ms)')
+    parser.add_argument('--throttle-every', type=int, default=0, help='N번째 요청마다 429 (0 = 없음)')
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    server = MockTelegramServer(args.latency, args.throttle_every, args.retry_after, args.port)
+    print(f"🧪 텔레그램 스텁 실행: {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"📊 {server.stats()}")
+        server.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
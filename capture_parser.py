@@ -0,0 +1,256 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import argparse
+import multiprocessing
+import re
+import time
+from availability_matrix import encode_rows, rows_month
+from day_list_parser import build_facility_entries, normalize_text, parse_day_list_html
+from metrics import metrics
+from result_sink import ResultSink, iter_results
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:  # selectolax 미설치 시 lxml 또는 표준 라이브러리 파서 사용
+    SelectolaxParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# 결과 테이블과 시설명 열을 모두 포함하는 가장 가까운 요소의 outerHTML (검색 1회당 evaluate 1회)
+DAY_LIST_CAPTURE_JS = """() => {
+    const table = document.querySelector('#dayListTable');
+    if (!table) return null;
+    const name = document.querySelector('.list_left .simpleMonthDiv');
+    let root = table;
+    while (name && root.parentElement && !root.contains(name)) root = root.parentElement;
+    return root.outerHTML;
+}"""
+
+_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+
+def _has_class(xpath_var, name):
+    return f'contains(concat(" ", normalize-space({xpath_var}), " "), " {name} ")'
+
+
+def parse_day_list_selectolax(html_text):
+    """selectolax(Lexbor) 파서: parse_day_list_html과 같은 (시설명, 행별 셀) 반환, 테이블 없으면 None"""
+    tree = SelectolaxParser(_BR.sub('\n', html_text))
+    table = tree.css_first('#dayListTable')
+    if table is None:
+        return None
+
+    names = [normalize_text(node.text(deep=True)) for node in tree.css('.list_left .simpleMonthDiv')]
+    rows = []
+    for row in tree.css('#dayListTbody > tr'):
+        cells = []
+        for td in row.iter():
+            if td.tag != 'td' or 'list_left' in (td.attributes.get('class') or '').split():
+                continue
+            mark = td.css_first('.apt_mark, .apt_mark_2')
+            cells.append([mark.attributes.get('title'), normalize_text(mark.text(deep=True))] if mark is not None else None)
+        rows.append(cells)
+    return names, rows
+
+
+def parse_day_list_lxml(html_text):
+    """lxml(libxml2) 파서: parse_day_list_html과 같은 (시설명, 행별 셀) 반환, 테이블 없으면 None"""
+    root = lxml.html.fromstring(_BR.sub('\n', html_text))
+    if not root.xpath('descendant-or-self::*[@id="dayListTable"]'):
+        return None
+
+    names = [
+        normalize_text(node.text_content())
+        for node in root.xpath(f'descendant-or-self::*[{_has_class("@class", "list_left")}]'
+                               f'//*[{_has_class("@class", "simpleMonthDiv")}]')
+    ]
+    rows = []
+    for row in root.xpath('descendant-or-self::*[@id="dayListTbody"]/tr'):
+        cells = []
+        for td in row.xpath(f'./td[not({_has_class("@class", "list_left")})]'):
+            marks = td.xpath(f'.//*[{_has_class("@class", "apt_mark")} or {_has_class("@class", "apt_mark_2")}]')
+            cells.append([marks[0].get('title'), normalize_text(marks[0].text_content())] if marks else None)
+        rows.append(cells)
+    return names, rows
+
+
+PARSERS = {
+    'selectolax': parse_day_list_selectolax if SelectolaxParser else None,
+    'lxml': parse_day_list_lxml if lxml else None,
+    'stdlib': parse_day_list_html,
+}
+
+
+def resolve_parser(name='auto'):
+    """파서 이름 결정: auto면 selectolax → lxml → stdlib 순, 설치되지 않았으면 stdlib로 대체"""
+    if name == 'auto':
+        return next(candidate for candidate in ('selectolax', 'lxml', 'stdlib') if PARSERS[candidate])
+    if name not in PARSERS:
+        raise ValueError(f"지원하지 않는 HTML 파서: {name}")
+    if PARSERS[name] is None:
+        print(f"⚠️ {name} 모듈이 없어 표준 라이브러리 파서로 대체합니다")
+        return 'stdlib'
+    return name
+
+
+def parse_capture(parser_name, html_text, encode=False):
+    """캡처 HTML 1건 → (시설별 일자 구조 또는 None, 상태 행렬 행, 파싱 소요 초) (프로세스 풀 작업 함수)
+
+    encode=True면 모든 상태를 담은 (시설명, encode_rows 바이트, 월)도 함께 반환 (AvailabilityMatrix용)
+    """
+    started = time.perf_counter()
+    parsed = PARSERS[parser_name](html_text)
+    if parsed is None:
+        return None, None, time.perf_counter() - started
+    names, rows = parsed
+    encoded = (names, encode_rows(rows), rows_month(rows)) if encode else None
+    return build_facility_entries(names, rows), encoded, time.perf_counter() - started
+
+
+def _replay_record(args):
+    """캡처 1건 재파싱 → (context, 시설별 일자 구조 또는 None, 파싱 오류 메시지 또는 None)"""
+    parser_name, capture = args
+    try:
+        data, _, _ = parse_capture(parser_name, capture['html'])
+    except Exception as e:  # 예외 객체 대신 메시지만 돌려받음 (피클 불가 예외 대비)
+        return capture.get('context') or {}, None, str(e)
+    return capture['context'], data, None
+
+
+class CaptureParserPool:
+    """브라우저는 HTML만 캡처하고 바로 다음 검색 진행, 파싱은 별도 프로세스에서 (결과는 제출 순서대로 반환)"""
+
+    def __init__(self, parser='auto', workers=2, max_pending=32, capture_sink=None, encode=False):
+        self.parser = resolve_parser(parser)
+        self.encode = encode  # 상태 행렬용 인코딩 결과도 받을지 여부
+        # spawn: Playwright 드라이버 스레드가 있는 프로세스를 fork하지 않음
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self.max_pending = max_pending  # 밀린 파싱이 이 수를 넘으면 가장 오래된 것부터 완료 대기
+        self.capture_sink = capture_sink  # 원본 캡처 저장 (재파싱용, 없으면 저장 안 함)
+        self.pending = deque()  # (future, capture, extra)
+        self.parsed = 0
+        self.failed = 0
+        self.parse_seconds = 0.0
+        print(f"🧩 HTML 파서 풀: {self.parser} × {workers}개 프로세스")
+
+    def submit(self, capture, extra=None):
+        """캡처 {'context', 'html', 'captured_at'} 파싱 요청 (extra는 완료 시 그대로 돌려줌)"""
+        if self.capture_sink:
+            self.capture_sink.write(capture)
+        future = self.executor.submit(parse_capture, self.parser, capture['html'], self.encode)
+        self.pending.append((future, capture, extra))
+
+    def completed(self, wait=False):
+        """끝난 파싱 결과를 제출 순서대로 → (결과 dict, 인코딩 행 또는 None, extra) (wait=True면 전부 대기)
+
+        파싱 오류나 결과 테이블이 없는 캡처는 (None, None, extra)로 돌려주고 실패로 집계
+        """
+        while self.pending and (wait or self.pending[0][0].done() or len(self.pending) > self.max_pending):
+            future, capture, extra = self.pending.popleft()
+            try:
+                data, encoded, seconds = future.result()
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ HTML 파싱 오류 ({capture['context'].get('accommodation')}): {str(e)}")
+                yield None, None, extra
+                continue
+
+            context_info = capture['context']
+            if data is None:
+                self.failed += 1
+                print(f"❌ HTML 캡처에 결과 테이블 없음 ({context_info.get('accommodation')})")
+                yield None, None, extra
+                continue
+
+            self.parsed += 1
+            self.parse_seconds += seconds
+            if metrics.enabled:
+                metrics.observe(('parse', context_info['region'], context_info['forest']), seconds)
+            yield {"context": context_info, "data": data}, encoded, extra
+
+    def report(self):
+        average_ms = self.parse_seconds / self.parsed * 1000 if self.parsed else 0.0
+        print(f"🧩 HTML 파싱: {self.parsed}건 (평균 {average_ms:.1f}ms, {self.parser}), 실패 {self.failed}건")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.capture_sink:
+            self.capture_sink.close()
+
+
+def build_capture_pool(config, encode=False):
+    """config.ini [HTML_CAPTURE] 설정으로 파서 풀 생성 (EXTRACTION_MODE = html이 아니거나 POOL_WORKERS = 0이면 None)"""
+    if config.get('SCRAPING', 'EXTRACTION_MODE', fallback='bulk') != 'html':
+        return None
+    workers = config.getint('HTML_CAPTURE', 'POOL_WORKERS', fallback=2)
+    if workers <= 0:
+        return None
+
+    capture_path = config.get('HTML_CAPTURE', 'CAPTURE_PATH', fallback='')
+    capture_sink = ResultSink(
+        path=capture_path,
+        compression=config.get('HTML_CAPTURE', 'COMPRESSION', fallback='gzip'),
+        rotate_bytes=int(config.getfloat('HTML_CAPTURE', 'ROTATE_MB', fallback=64) * 1024 * 1024)
+    ) if capture_path else None
+
+    return CaptureParserPool(
+        parser=config.get('HTML_CAPTURE', 'PARSER', fallback='auto'),
+        workers=workers,
+        max_pending=config.getint('HTML_CAPTURE', 'MAX_PENDING', fallback=32),
+        capture_sink=capture_sink,
+        encode=encode
+    )
+
+
+def replay(path, parser='auto', workers=2, out=None, compression='none'):
+    """저장된 캡처를 다시 파싱 → (캡처 수, 시설 수, 실패 수, 소요 초)
+
+    파싱 오류나 결과 테이블이 없는 캡처는 CaptureParserPool.completed와 같이 실패로 집계하고 기록하지 않음
+    """
+    parser = resolve_parser(parser)
+    sink = ResultSink(out, compression) if out else None
+    captures = facilities = failed = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = ((parser, capture) for capture in iter_results(path))
+        for context_info, data, error in executor.map(_replay_record, jobs, chunksize=16):
+            captures += 1
+            if error is not None:
+                failed += 1
+                print(f"❌ HTML 파싱 오류 ({context_info.get('accommodation')}): {error}")
+                continue
+            if data is None:
+                failed += 1
+                print(f"❌ HTML 캡처에 결과 테이블 없음 ({context_info.get('accommodation')})")
+                continue
+            facilities += len(data)
+            if sink:
+                sink.write({"context": context_info, "data": data})
+
+    if sink:
+        sink.close()
+    return captures, facilities, failed, time.perf_counter() - started
+
+
+# 저장된 캡처를 현재 파싱 규칙으로 다시 파싱:
+#   python capture_parser.py day_list_captures.jsonl --parser lxml --out replayed.jsonl
+def main():
+    arg_parser = argparse.ArgumentParser(description='저장된 결과 테이블 HTML 캡처 재파싱')
+    arg_parser.add_argument('path', help='캡처 기록 경로 (config.ini [HTML_CAPTURE] CAPTURE_PATH)')
+    arg_parser.add_argument('--parser', default='auto', choices=['auto'] + list(PARSERS))
+    arg_parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    arg_parser.add_argument('--out', help='재파싱 결과 JSONL 경로 (생략 시 건수만 출력)')
+    arg_parser.add_argument('--compression', default='none', choices=['none', 'gzip', 'zstd'])
+    args = arg_parser.parse_args()
+
+    captures, facilities, failed, elapsed = replay(args.path, args.parser, args.workers, args.out, args.compression)
+    print(f"🔁 재파싱 완료: 캡처 {captures}건, 시설 {facilities}개, 실패 {failed}건, {elapsed:.2f}s "
+          f"({captures / elapsed if elapsed else 0:.1f}건/s)")
+
+
+if __name__ == '__main__':
+    main()
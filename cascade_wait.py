@@ -0,0 +1,106 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+import time
+
+# select 변경 시 AJAX로 채워지는 하위 select 매핑
+CASCADE_DEPENDENCIES = {
+    '#srchSido': '#srchInstt',
+    '#srchInstt': '#srchForest',
+    '#srchForest': '#srchForest2',
+}
+
+# 하위 select가 "채워졌다"고 볼 최소 옵션 수 (안내 옵션 포함)
+MIN_OPTION_COUNTS = {
+    '#srchInstt': 2,
+    '#srchForest': 2,
+    '#srchForest2': 1,
+}
+
+# 하위 select가 없는 select(#monthSelectBox, #srchForest2)에서 AJAX 시작을 기다리는 최대 시간(ms)
+# 이 시간 안에 요청이 없으면 AJAX를 보내지 않는 변경으로 보고 진행
+AJAX_START_GRACE_MS = 500
+
+# select 변경 직전: 하위 select 기존 옵션 표시 + jQuery AJAX 전송 횟수 기준점 기록
+MARK_STALE_JS = """(selector) => {
+    if (window.jQuery && !window.__cascadeAjaxHooked) {
+        window.__cascadeAjaxHooked = true;
+        window.__cascadeAjaxSent = 0;
+        window.jQuery(document).on('ajaxSend', () => { window.__cascadeAjaxSent += 1; });
+    }
+    window.__cascadeAjaxMark = window.__cascadeAjaxSent || 0;
+    window.__cascadeMarkedAt = performance.now();
+    const el = selector && document.querySelector(selector);
+    if (el) Array.from(el.options).forEach(o => { o.__cascadeStale = true; });
+}"""
+
+# 하위 select가 있으면: jQuery AJAX 완료 + 새 옵션이 들어왔는지 확인
+# 없으면: 변경 후 AJAX가 실제로 시작(ajaxSend)된 뒤 끝났는지 확인 (시작 전의 active === 0을 완료로 보지 않음)
+READY_JS = """([dependent, minCount, graceMs]) => {
+    const ajaxIdle = !window.jQuery || window.jQuery.active === 0;
+    if (!dependent) {
+        if (!window.jQuery) return true;
+        const started = (window.__cascadeAjaxSent || 0) > (window.__cascadeAjaxMark || 0);
+        return ajaxIdle && (started || performance.now() - (window.__cascadeMarkedAt || 0) >= graceMs);
+    }
+    const el = document.querySelector(dependent);
+    if (!el) return false;
+    const options = Array.from(el.options);
+    return ajaxIdle && options.length >= minCount && options.some(o => !o.__cascadeStale);
+}"""
+
+
+class CascadeWaiter:
+    """select 연쇄 AJAX 완료 감지 및 소요 시간 기록"""
+
+    def __init__(self, page, timeout=10000):
+        self.page = page
+        self.timeout = timeout  # 최대 대기 시간(ms)
+        self.timings = {}  # selector -> [소요 ms, ...]
+        self.timeouts = {}  # selector -> 시간 초과 횟수
+
+    def ready_args(self, selector):
+        """READY_JS에 넘길 인자 (하위 select, 최소 옵션 수, AJAX 시작 대기 시간)"""
+        dependent = CASCADE_DEPENDENCIES.get(selector)
+        return [dependent, MIN_OPTION_COUNTS.get(dependent, 1), AJAX_START_GRACE_MS]
+
+    def prepare(self, selector):
+        """select 변경 직전 호출: 하위 select의 기존 옵션 표시, AJAX 전송 기준점 기록"""
+        self.page.evaluate(MARK_STALE_JS, CASCADE_DEPENDENCIES.get(selector))
+        return time.perf_counter()
+
+    def wait(self, selector, started=None):
+        """연쇄 AJAX 완료까지 대기 후 소요 시간(ms) 반환"""
+        started = started or time.perf_counter()
+        try:
+            self.page.wait_for_function(READY_JS, arg=self.ready_args(selector), timeout=self.timeout)
+        except PlaywrightTimeoutError:
+            # 고정 대기와 동일하게 진행은 계속
+            self.timeouts[selector] = self.timeouts.get(selector, 0) + 1
+            print(f"⚠️ {selector} 연쇄 로딩 대기 시간 초과 ({self.timeout}ms)")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.record(selector, elapsed_ms)
+        return elapsed_ms
+
+    def record(self, selector, elapsed_ms):
+        self.timings.setdefault(selector, []).append(elapsed_ms)
+
+    def summary(self):
+        """selector별 대기 시간 통계"""
+        result = {}
+        for selector, values in self.timings.items():
+            ordered = sorted(values)
+            result[selector] = {
+                "count": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered), 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                "max_ms": round(ordered[-1], 1),
+                "timeouts": self.timeouts.get(selector, 0),
+            }
+        return result
+
+    def report(self):
+        """대기 시간 통계 출력 (상한값 조정용)"""
+        print(f"⏱️ 연쇄 AJAX 대기 통계 (상한 {self.timeout}ms)")
+        for selector, stats in self.summary().items():
+            print(f"  - {selector}: {stats['count']}회, 평균 {stats['avg_ms']}ms, "
+                  f"p95 {stats['p95_ms']}ms, 최대 {stats['max_ms']}ms, 초과 {stats['timeouts']}회")
@@ -0,0 +1,79 @@
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+    combo_key TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    context TEXT NOT NULL,
+    error TEXT,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class CrawlCheckpoint:
+    """완료/실패한 (월, 지역, 휴양림, 숙박시설) 조합 기록 → 중단 후 이어서 실행 (SQLite)"""
+
+    def __init__(self, path='crawl_checkpoint.db'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def reset(self):
+        """새 전수 순회 시작 (이전 기록 삭제)"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM crawl_checkpoint")
+
+    def completed_keys(self):
+        """이미 완료된 조합 키 집합 (실패 조합은 재개 시 다시 시도)"""
+        with self.lock:
+            return {key for key, in self.conn.execute(
+                "SELECT combo_key FROM crawl_checkpoint WHERE status = 'done'"
+            )}
+
+    def _record(self, key, status, attempts, context_info, error=None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO crawl_checkpoint VALUES (?, ?, ?, ?, ?, ?)",
+                (key, status, attempts, json.dumps(context_info, ensure_ascii=False), error, time.time())
+            )
+
+    def mark_done(self, key, context_info, attempts=1):
+        self._record(key, 'done', attempts, context_info)
+
+    def mark_failed(self, key, context_info, attempts, error):
+        self._record(key, 'failed', attempts, context_info, error)
+
+    def failures(self):
+        """재시도 후에도 실패한 조합 목록"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT context, attempts, error FROM crawl_checkpoint WHERE status = 'failed' ORDER BY updated_at"
+            ).fetchall()
+        return [dict(json.loads(context), attempts=attempts, error=error) for context, attempts, error in rows]
+
+    def report(self):
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM crawl_checkpoint GROUP BY status"))
+        print(f"🧷 체크포인트: 완료 {counts.get('done', 0)}개, 실패 {counts.get('failed', 0)}개 ({self.path})")
+        for failure in self.failures():
+            print(f"   ❌ {failure['month']} / {failure['region']} / {failure['forest']} / "
+                  f"{failure['accommodation']} ({failure['attempts']}회): {failure['error']}")
+
+    def close(self):
+        self.conn.close()
+
+
+def build_checkpoint(config):
+    """config.ini [CHECKPOINT] 설정으로 체크포인트 생성 (비활성화 시 None)"""
+    if not config.getboolean('CHECKPOINT', 'ENABLED', fallback=True):
+        return None
+    return CrawlCheckpoint(path=config.get('CHECKPOINT', 'PATH', fallback='crawl_checkpoint.db'))
@@ -0,0 +1,79 @@
+import re
+
+# 연쇄 select 단계 (상위 → 하위), 각 단계 변경 시 하위 select가 AJAX로 다시 채워짐
+CASCADE_ORDER = ('region', 'forest', 'accommodation')
+
+
+def plan_combinations(month_options, regions):
+    """월 × 지역 × 휴양림 × 숙박시설 조합 목록 (기존 중첩 순회 순서)"""
+    combos = []
+    for month in month_options:
+        for region in regions:
+            for forest in region['forests']:
+                for accommodation in forest['accommodations']:
+                    combos.append({
+                        'month': month,
+                        'region': {'value': region['value'], 'text': region['text']},
+                        'forest': {'value': forest['value'], 'text': forest['text']},
+                        'accommodation': accommodation,
+                    })
+    return combos
+
+
+def order_combinations(combos, loop_order='accommodation_first'):
+    """순회 순서 결정: accommodation_first면 숙박시설을 고정한 채 월만 바꿔 연쇄 select 변경 최소화"""
+    if loop_order != 'accommodation_first':
+        return list(combos)
+
+    groups = {}  # (지역, 휴양림, 숙박시설) → 월별 조합 (처음 등장한 순서 유지)
+    for combo in combos:
+        groups.setdefault(tuple(combo[level]['value'] for level in CASCADE_ORDER), []).append(combo)
+    return [combo for group in groups.values() for combo in group]
+
+
+def count_select_ops(combos):
+    """select_combination과 같은 규칙으로 select 변경 횟수와 AJAX 대기 횟수 계산"""
+    state = {}
+    selects = 0
+    ajax_waits = 0
+    for combo in combos:
+        if state.get('month') != combo['month']['value']:
+            selects += 1
+            state['month'] = combo['month']['value']
+
+        cascade_changed = False
+        for level in CASCADE_ORDER:
+            if cascade_changed or state.get(level) != combo[level]['value']:
+                selects += 1
+                ajax_waits += 1
+                state[level] = combo[level]['value']
+                cascade_changed = True
+
+        if cascade_changed:
+            selects += 1  # #srchForest2 첫 번째 옵션
+    return {'selects': selects, 'ajax_waits': ajax_waits}
+
+
+def combo_context(combo):
+    """조합 → 스크래핑 결과용 context_info"""
+    return {
+        "month": combo['month']['text'],
+        "region": combo['region']['text'],
+        "region_code": combo['region']['value'],
+        "forest": combo['forest']['text'],
+        "accommodation": combo['accommodation']['text']
+    }
+
+
+def combo_key(combo):
+    """조합 식별 키 (체크포인트 기록용)"""
+    return '|'.join(combo[level]['value'] for level in ('month', 'region', 'forest', 'accommodation'))
+
+
+def parse_month(month_option):
+    """월 옵션 (value 또는 text) → (연, 월), 알 수 없으면 None"""
+    for source in (month_option['value'], month_option['text']):
+        match = re.search(r'(20\d{2})\D{0,3}(\d{1,2})', source)
+        if match and 1 <= int(match.group(2)) <= 12:
+            return int(match.group(1)), int(match.group(2))
+    return None
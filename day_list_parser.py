@@ -0,0 +1,160 @@
+from html.parser import HTMLParser
+import re
+
+# 내용 없는 태그 (닫는 태그 없음)
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """연속 공백(줄바꿈 포함)을 하나로 합침 (모든 추출 방식/파서 공통 정규화)"""
+    return _WHITESPACE.sub(' ', text or '').strip()
+
+
+def normalize_day_list(names, rows):
+    """브라우저에서 추출한 (시설명, 행별 셀)에 파서와 같은 공백 정규화 적용"""
+    return ([normalize_text(name) for name in names],
+            [[[cell[0], normalize_text(cell[1])] if cell else None for cell in cells] for cells in rows])
+
+
+class DayListHTMLParser(HTMLParser):
+    """월별 예약 현황 HTML에서 시설명 / 행별 [title, 상태] 셀 추출 (표준 라이브러리)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # 열린 태그 프레임
+        self.names = []
+        self.rows = []
+        self.found_table = False
+
+    # --- 스택 도우미 ---
+    def _in(self, predicate):
+        return any(predicate(frame) for frame in self.stack)
+
+    def _nearest(self, role):
+        for frame in reversed(self.stack):
+            if frame['role'] == role:
+                return frame
+        return None
+
+    def _pop_frame(self):
+        frame = self.stack.pop()
+        role = frame['role']
+        if role == 'name':
+            self.names.append(''.join(frame['text']))
+        elif role == 'mark':
+            cell = self._nearest('cell')
+            if cell is not None:
+                cell['mark'] = [frame['title'], normalize_text(''.join(frame['text']))]
+        elif role == 'cell':
+            row = self._nearest('row')
+            if row is not None:
+                row['cells'].append(frame['mark'])
+        elif role == 'row':
+            self.rows.append(frame['cells'])
+
+    def _close_until(self, tags, stop_tags):
+        """암묵적으로 닫히는 td/tr 처리"""
+        for index in range(len(self.stack) - 1, -1, -1):
+            tag = self.stack[index]['tag']
+            if tag in stop_tags:
+                return
+            if tag in tags:
+                while len(self.stack) > index:
+                    self._pop_frame()
+                return
+
+    # --- HTMLParser 콜백 ---
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if tag in ('td', 'th'):
+            self._close_until(('td', 'th'), ('tr', 'table'))
+        elif tag == 'tr':
+            self._close_until(('tr',), ('tbody', 'thead', 'table'))
+
+        if attrs.get('id') == 'dayListTable':
+            self.found_table = True
+
+        frame = {'tag': tag, 'classes': classes, 'id': attrs.get('id'), 'role': None}
+
+        in_tbody = self._in(lambda f: f['id'] == 'dayListTbody')
+        if tag == 'tr' and in_tbody and self._nearest('row') is None:
+            frame.update(role='row', cells=[])
+        elif tag == 'td' and self._nearest('row') is not None and 'list_left' not in classes:
+            frame.update(role='cell', mark=None)
+        elif ({'apt_mark', 'apt_mark_2'} & set(classes)) and self._nearest('cell') is not None \
+                and self._nearest('cell')['mark'] is None and self._nearest('mark') is None:
+            frame.update(role='mark', title=attrs.get('title'), text=[])
+        elif 'simpleMonthDiv' in classes and self._in(lambda f: 'list_left' in f['classes']) \
+                and self._nearest('name') is None:
+            frame.update(role='name', text=[])
+
+        if tag == 'br':
+            self.handle_data('\n')
+
+        if tag in VOID_TAGS:
+            if frame['role']:
+                self.stack.append(frame)
+                self._pop_frame()
+            return
+        self.stack.append(frame)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index]['tag'] == tag:
+                while len(self.stack) > index:
+                    self._pop_frame()
+                return
+
+    def handle_data(self, data):
+        for role in ('name', 'mark'):
+            frame = self._nearest(role)
+            if frame is not None:
+                frame['text'].append(data)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._pop_frame()
+
+
+def parse_day_list_html(html_text):
+    """HTML → (시설명 목록, 행별 셀 목록). #dayListTable이 없으면 None"""
+    parser = DayListHTMLParser()
+    parser.feed(html_text)
+    parser.close()
+    if not parser.found_table:
+        return None
+    names = [normalize_text(name) for name in parser.names]
+    return names, parser.rows
+
+
+def build_facility_entries(names, rows):
+    """시설명 목록 + 행별 [title, 상태] 셀 목록 → 시설별 예약 가능 일자 구조"""
+    data = []
+    for name, cells in zip(names, rows):
+        facility_entry = {
+            "name": name.strip(),
+            "dates": []
+        }
+
+        for cell in cells:
+            if not cell:
+                continue
+
+            date_str, status = cell
+            status = status.strip()
+            if date_str:
+                date_str = date_str.split()[-1]  # "2025.06.15" 추출
+
+            if status.startswith(('예', '대')):
+                facility_entry["dates"].append({
+                    "date": date_str,
+                    "status": status
+                })
+
+        data.append(facility_entry)
+    return data
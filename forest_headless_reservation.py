@@ -1,29 +1,147 @@
 from playwright.sync_api import Page
+from functools import partial
 import configparser
 import json
 import time
 from send_telegram import send_telegram_message
 from regional_telegram import RegionalTelegramSender
+from cascade_wait import CascadeWaiter
+from day_list_parser import build_facility_entries, normalize_day_list
+from crawl_planner import plan_combinations, order_combinations, count_select_ops, combo_context, combo_key
+from crawl_checkpoint import build_checkpoint
+from watch_list import load_watch_list, plan_watch_combinations, filter_result_data
+from option_tree_cache import OptionTreeCache
+from snapshot_store import build_snapshot_store
+from notification_queue import build_notification_queue
+from result_sink import build_result_sink, iter_results
+from availability_db import build_availability_db
+from read_api import build_read_api
+from availability_matrix import build_availability_matrix
+from capture_parser import DAY_LIST_CAPTURE_JS, PARSERS, build_capture_pool, resolve_parser
+from resource_router import build_resource_router
+from session_state import startup_timer
+from http_pool import report_all as report_http_pools
+from metrics import configure_metrics, metrics
+
+# 연쇄 select 단계 (상위 → 하위)
+CASCADE_LEVELS = [
+    ('region', '#srchSido'),
+    ('forest', '#srchInstt'),
+    ('accommodation', '#srchForest'),
+]
+
+# #dayListTable 전체를 한 번의 evaluate로 수집 (셀: [title, 상태] 또는 null)
+DAY_LIST_EXTRACT_JS = """() => {
+    const names = Array.from(document.querySelectorAll('.list_left .simpleMonthDiv'))
+        .map(el => el.innerText);
+    const rows = Array.from(document.querySelectorAll('#dayListTbody tr')).map(row =>
+        Array.from(row.querySelectorAll('td:not(.list_left)')).map(td => {
+            const mark = td.querySelector('.apt_mark, .apt_mark_2');
+            return mark ? [mark.getAttribute('title'), mark.innerText] : null;
+        })
+    );
+    return {names, rows};
+}"""
+
 
 class ForestReservationSystem:
-    def __init__(self, page):  # browser 인스턴스 주입
+    def __init__(self, page, parent=None):  # browser 인스턴스 주입
         self.headless = False
         # self.browser = browser
         self.page = page
         self.config = configparser.ConfigParser()
         self.config.read('config.ini', encoding='utf-8')
-        self.all_results = []  # 전체 결과 저장용
 
-        # 지역별 텔레그램 전송 시스템 초기화
-        self.telegram_sender = RegionalTelegramSender()
+        # 연쇄 select AJAX 완료 감지 (최대 대기 시간은 config로 조정)
+        ajax_timeout = self.config.getint('SCRAPING', 'AJAX_TIMEOUT', fallback=10000)
+        self.cascade_waiter = CascadeWaiter(page, timeout=ajax_timeout)
+
+        if parent is not None:
+            # 같은 컨텍스트의 추가 페이지: 결과/전송/스냅샷/대기 통계를 메인 시스템과 공유
+            self.all_results = parent.all_results
+            self.result_sink = parent.result_sink
+            self.resource_router = parent.resource_router
+            self.telegram_sender = parent.telegram_sender
+            self.snapshot_store = parent.snapshot_store
+            self.notification_queue = parent.notification_queue
+            self.availability = parent.availability
+            self.availability_db = parent.availability_db
+            self.read_api = parent.read_api
+            self.cascade_waiter.timings = parent.cascade_waiter.timings
+            self.cascade_waiter.timeouts = parent.cascade_waiter.timeouts
+        else:
+            # 단계별 소요 시간 지표 (비활성화 시 span이 아무 일도 하지 않음)
+            configure_metrics(self.config)
+
+            # 이미지/폰트/외부 분석 스크립트 차단 (install_resource_router로 설치, 비활성화 시 None)
+            self.resource_router = build_resource_router(self.config)
+
+            # 결과를 JSONL로 즉시 기록 (비활성화 시 None), 메모리 보관은 옵션
+            self.result_sink = build_result_sink(self.config)
+            keep_in_memory = self.config.getboolean('RESULT_SINK', 'KEEP_IN_MEMORY', fallback=False)
+            self.all_results = [] if keep_in_memory or self.result_sink is None else None  # 전체 결과 저장용
+
+            # 지역별 텔레그램 전송 시스템 초기화
+            self.telegram_sender = RegionalTelegramSender()
+
+            # 직전 예약 상태 스냅샷 (변경분만 전송, 비활성화 시 None)
+            self.snapshot_store = build_snapshot_store(self.config)
+
+            # 백그라운드 전송 큐 (비활성화 시 None → 스크래핑 루프에서 직접 전송)
+            self.notification_queue = build_notification_queue(self.config, self.telegram_sender)
+
+            # 모든 상태를 담은 월별 (시설 × 일) 상태 코드 행렬 (비활성화 시 None)
+            self.availability = build_availability_matrix(self.config)
+
+            # 날짜/지역 인덱스가 있는 최신 예약 상태 DB (availability_db.py로 조회, 비활성화 시 None)
+            self.availability_db = build_availability_db(self.config)
+
+            # 최신 예약 현황을 메모리에서 제공하는 조회 API (read_api.py, 비활성화 시 None)
+            self.read_api = build_read_api(self.config)
+
+        # 결과 테이블 HTML 캡처 후 별도 프로세스에서 파싱 (EXTRACTION_MODE = html, 메인 순회에서만 사용)
+        self.capture_pool = None
+        if parent is None:
+            self.capture_pool = build_capture_pool(self.config, encode=self.availability is not None)
+
+        # 조합 순회 순서: accommodation_first(월을 가장 안쪽) / month_first(기존 순서)
+        self.loop_order = self.config.get('SCRAPING', 'LOOP_ORDER', fallback='accommodation_first')
+
+        # 결과 테이블 추출 방식: bulk(evaluate 1회) / element(요소별 호출) / html(outerHTML 캡처 후 파싱)
+        self.extraction_mode = self.config.get('SCRAPING', 'EXTRACTION_MODE', fallback='bulk')
+        if self.extraction_mode == 'html':
+            self.html_parser = resolve_parser(self.config.get('HTML_CAPTURE', 'PARSER', fallback='auto'))
+
+        # 완료 조합 체크포인트 (중단 후 --resume으로 이어서 실행) + 조합별 재시도 횟수
+        self.checkpoint = build_checkpoint(self.config) if parent is None else parent.checkpoint
+        self.max_retries = self.config.getint('CHECKPOINT', 'MAX_RETRIES', fallback=2)
+
+        # 관심 조건 ([WATCH:이름] 섹션): --watch 실행 시 필요한 조합만 크롤링
+        self.watch_entries = load_watch_list(self.config)
+
+        # 현재 조합의 지표 라벨 (지역/휴양림별 히스토그램)
+        self.metric_labels = {}
+
+        # 지역 → 휴양림 → 숙박시설 옵션 트리 캐시
+        self.option_tree_cache = OptionTreeCache(
+            path=self.config.get('OPTION_CACHE', 'PATH', fallback='option_tree_cache.json'),
+            ttl_hours=self.config.getint('OPTION_CACHE', 'TTL_HOURS', fallback=24),
+            validate_sample=self.config.getboolean('OPTION_CACHE', 'VALIDATE_SAMPLE', fallback=True)
+        )
+
+    def install_resource_router(self):
+        """로그인된 컨텍스트 전체에 요청 가로채기 설치 (로그인 직후 진입점에서 1회 호출)"""
+        if self.resource_router:
+            self.resource_router.install(self.page.context)
 
     def safe_click(self, selector, timeout=10000):
         self.page.wait_for_selector(selector, state='attached', timeout=timeout)
         self.page.click(selector)
 
     def smart_select(self, selector, value, select_by='value'):
-        """개선된 선택 함수"""
+        """개선된 선택 함수: 고정 대기 대신 연쇄 AJAX 완료 감지"""
         self.page.wait_for_selector(selector, state='attached')
+        started = self.cascade_waiter.prepare(selector)
 
         if select_by == 'value':
             self.page.select_option(selector, value=str(value))
@@ -32,7 +150,7 @@ class ForestReservationSystem:
         elif select_by == 'index':
             self.page.select_option(selector, index=value)
 
-        self.page.wait_for_timeout(3000)  # AJAX 대기 시간 증가
+        return self.cascade_waiter.wait(selector, started)
 
     def get_select_options(self, selector):
         """select box의 모든 옵션 추출"""
@@ -47,162 +165,403 @@ class ForestReservationSystem:
                     options.append({'value': value, 'text': text})
         return options
 
+    def _extract_day_list_per_element(self):
+        """요소 단위 추출: 시설/셀마다 Playwright 호출 (기존 방식)"""
+        facilities = self.page.query_selector_all('.list_left .simpleMonthDiv')
+        rows = self.page.query_selector_all('#dayListTbody tr')
+
+        names = [facility.inner_text() for facility in facilities]
+        cells = []
+        for row in rows:
+            row_cells = []
+            # 날짜 셀 추출 (첫 번째 셀 제외)
+            for day in row.query_selector_all('td:not(.list_left)'):
+                status_span = day.query_selector('.apt_mark, .apt_mark_2')
+                if status_span:
+                    row_cells.append([status_span.get_attribute('title'), status_span.inner_text()])
+                else:
+                    row_cells.append(None)
+            cells.append(row_cells)
+        return normalize_day_list(names, cells)
+
+    def _extract_day_list_bulk(self):
+        """일괄 추출: 페이지 내 evaluate 1회로 전체 테이블 수집"""
+        extracted = self.page.evaluate(DAY_LIST_EXTRACT_JS)
+        return normalize_day_list(extracted['names'], extracted['rows'])
+
+    def _extract_day_list_html(self):
+        """HTML 캡처: outerHTML 1회 수집 후 selectolax/lxml/표준 라이브러리 파서로 추출"""
+        parsed = PARSERS[self.html_parser](self.page.evaluate(DAY_LIST_CAPTURE_JS) or '')
+        return parsed if parsed is not None else ([], [])
+
+    def capture_current_results(self, context_info):
+        """결과 테이블 HTML만 캡처 (파싱은 capture_pool에서) → {context, html, captured_at}"""
+        self.page.wait_for_selector('#dayListTable', state='visible', timeout=50000)
+        html_text = self.page.evaluate(DAY_LIST_CAPTURE_JS)
+        if html_text is None:
+            raise RuntimeError("결과 테이블 HTML 캡처 실패 (#dayListTable 없음)")  # scrape_combination에서 재시도
+        startup_timer.mark_first_scrape()
+        return {"context": context_info, "html": html_text, "captured_at": time.time()}
+
     def scrape_current_results(self, context_info):
-        """개선된 스크래핑 로직: 모든 시설 포함 보장"""
+        """개선된 스크래핑 로직: 모든 시설 포함 보장 (오류는 스크린샷 후 다시 발생 → scrape_combination에서 재시도)"""
         try:
             self.page.wait_for_selector('#dayListTable', state='visible', timeout=50000)
 
-            # 모든 시설명 추출
-            facilities = self.page.query_selector_all('.list_left .simpleMonthDiv')
-            # 모든 행 추출 (시설별 날짜 데이터)
-            rows = self.page.query_selector_all('#dayListTbody tr')
+            # 시설명 + 행별 날짜 셀 추출
+            if self.extraction_mode == 'bulk':
+                names, rows = self._extract_day_list_bulk()
+            elif self.extraction_mode == 'html':
+                names, rows = self._extract_day_list_html()
+            else:
+                names, rows = self._extract_day_list_per_element()
+
+            if self.availability:
+                self.availability.add(context_info, names, rows)
 
             # 시설-행 일치 검증
-            if len(facilities) != len(rows):
-                print(f"⚠️ 시설-행 불일치: 시설={len(facilities)}개, 행={len(rows)}개")
+            if len(names) != len(rows):
+                print(f"⚠️ 시설-행 불일치: 시설={len(names)}개, 행={len(rows)}개")
                 self.page.screenshot(path='mismatch_error.png')
 
+            print(f"🔍 스크래핑 시작: 총 {len(names)}개 시설")
+
+            # 예약 가능 여부와 관계없이 모든 시설 포함
             current_result = {
                 "context": context_info,
-                "data": []
+                "data": build_facility_entries(names, rows)
             }
 
-            print(f"🔍 스크래핑 시작: 총 {len(facilities)}개 시설")
-
-            for idx, (facility, row) in enumerate(zip(facilities, rows)):
-                facility_name = facility.inner_text().strip()
-                facility_entry = {
-                    "name": facility_name,
-                    "dates": []
-                }
-
-                # 날짜 셀 추출 (첫 번째 셀 제외)
-                days = row.query_selector_all('td:not(.list_left)')
-
-                for day in days:
-                    status_span = day.query_selector('.apt_mark, .apt_mark_2')
-                    if status_span:
-                        status = status_span.inner_text().strip()
-                        date_str = status_span.get_attribute('title')
-                        if date_str:
-                            date_str = date_str.split()[-1]  # "2025.06.15" 추출
-
-                        if status.startswith(('예', '대')):
-                            facility_entry["dates"].append({
-                                "date": date_str,
-                                "status": status
-                            })
-
-                # 예약 가능 여부와 관계없이 모든 시설 포함
-                current_result["data"].append(facility_entry)
-                print(f"  - 시설 {idx + 1}: {facility_name} ({len(facility_entry['dates'])}개 일자)")
+            for idx, facility_entry in enumerate(current_result["data"]):
+                print(f"  - 시설 {idx + 1}: {facility_entry['name']} ({len(facility_entry['dates'])}개 일자)")
 
             # 최종 요약 출력
             total_dates = sum(len(f['dates']) for f in current_result["data"])
-            print(f"📊 스크래핑 완료: 시설 {len(facilities)}개, 예약 일자 {total_dates}개")
+            print(f"📊 스크래핑 완료: 시설 {len(names)}개, 예약 일자 {total_dates}개")
+            startup_timer.mark_first_scrape()
 
             return current_result
 
         except Exception as e:
             print(f"❌ 스크래핑 오류: {str(e)}")
-            self.page.screenshot(path='scraping_error.png')
-            return None
+            try:
+                self.page.screenshot(path='scraping_error.png')
+            except Exception:
+                pass
+            raise
+
+    def select_combination(self, combo, state):
+        """이전 조합과 달라진 select만 변경 (상위 연쇄가 바뀌면 하위도 다시 선택)"""
+        if state.get('month') != combo['month']['value']:
+            print(f"\n🗓️ 월 선택: {combo['month']['text']}")
+            self.smart_select('#monthSelectBox', combo['month']['value'], 'value')
+            state['month'] = combo['month']['value']
+
+        cascade_changed = False
+        for level, selector in CASCADE_LEVELS:
+            if cascade_changed or state.get(level) != combo[level]['value']:
+                self.smart_select(selector, combo[level]['value'], 'value')
+                state[level] = combo[level]['value']
+                cascade_changed = True
+
+        # 숙박시설이 바뀌면 시설 전체(첫 번째 옵션) 선택
+        if cascade_changed:
+            self.page.wait_for_selector('#srchForest2 option:nth-child(1)', state='attached')
+            self.smart_select('#srchForest2', 0, 'index')
+
+    def search(self):
+        """검색 실행 후 결과 로딩 대기"""
+        with metrics.span('search', **self.metric_labels):
+            self.safe_click('#searchBtn')
+            self.page.wait_for_load_state('networkidle')
+        with metrics.span('search_settle', **self.metric_labels):
+            self.page.wait_for_timeout(2000)
+
+    def record_result(self, result):
+        """결과 1건 기록: JSONL 스트리밍 저장 + 예약 현황 DB/조회 API 반영 + (옵션) 메모리 보관"""
+        if self.result_sink:
+            self.result_sink.write(result)
+        self.record_state(result)
+        if self.all_results is not None:
+            self.all_results.append(result)
+
+    def collected_results(self):
+        """실행 결과: 메모리 보관 시 결과 목록, 아니면 스트리밍 저장 요약 {'results': 건수, 'files': [...]}"""
+        if self.all_results is not None:
+            return self.all_results
+        return self.result_sink.summary()
+
+    def record_state(self, result):
+        """최신 예약 현황만 반영 (예약 가능 데이터가 없는 결과도 이전에 있던 일자 정리용으로 호출)"""
+        if self.availability_db:
+            self.availability_db.ingest(result)
+        if self.read_api:
+            self.read_api.update(result)
+
+    def notify_result(self, context_info, result_data, watch=None):
+        """지역 채팅방 전송 (스냅샷 저장소 사용 시 직전 결과 대비 변경분만, 스냅샷은 전송 성공 후 저장)
+
+        예약 가능 일자가 없는 결과도 빈 result_data로 호출 (마감 → 재오픈 감지).
+        스냅샷은 전체 결과로 비교/저장하고, watch(관심 조건)는 보낼 변경분에만 적용
+        """
+        on_sent = None
+        if self.snapshot_store:
+            diff = self.snapshot_store.apply(context_info, result_data, commit=False)
+            print(f"        🔁 변경 감지: 신규 {len(diff['opened'])}건, 마감 {len(diff['closed'])}건, "
+                  f"상태 변경 {len(diff['changed'])}건")
+            on_sent = partial(self.snapshot_store.commit, context_info, result_data)
+            result_data = self.snapshot_store.delta_result_data(diff)
+
+        result_data = filter_result_data(result_data, watch)
+        if not result_data:
+            if on_sent:
+                on_sent()  # 보낼 변경분 없음 (마감만 있거나 관심 날짜 밖의 변경)
+            return
+
+        region_code = context_info['region_code']
+        if self.telegram_sender.coalesce:
+            # 지역 버퍼에 모았다가 창 시간 경과/지역 순회 종료 시 묶어서 전송
+            if self.telegram_sender.buffer_result(region_code, context_info, result_data, on_sent):
+                self.flush_region_messages(region_code)
+        elif self.notification_queue:
+            self.notification_queue.submit(region_code, context_info, result_data, on_sent)
+        elif self.telegram_sender.send_to_region(region_code, context_info, result_data) and on_sent:
+            on_sent()
+
+    def flush_region_messages(self, region_code=None):
+        """지역 버퍼에 모인 결과 묶음 전송 (region_code가 None이면 전 지역)"""
+        for code, (sections, on_sent) in self.telegram_sender.take_buffered(region_code).items():
+            if self.notification_queue:
+                self.notification_queue.submit_batch(code, sections, on_sent)
+            elif self.telegram_sender.send_region_batch(code, sections):
+                on_sent()
+
+    def flush_due_regions(self):
+        """창 시간이 지난 지역 버퍼 전송 (순회 루프에서 조합마다 호출)"""
+        for code in self.telegram_sender.due_regions():
+            self.flush_region_messages(code)
+
+    def flush_notifications(self):
+        """모아둔 결과 전송 후 대기 중인 텔레그램 전송 완료까지 대기, 큐 상태 출력"""
+        self.flush_region_messages()
+        if self.notification_queue:
+            self.notification_queue.flush()
+            self.notification_queue.report()
+        self.telegram_sender.rate_limiter.report()
+        self.telegram_sender.report_coalescing()
+        report_http_pools()
+
+    def shutdown(self):
+        """남은 전송을 모두 보낸 뒤 전송 큐/스냅샷 저장소 정리"""
+        self.flush_region_messages()
+        if self.notification_queue:
+            self.notification_queue.close()
+            self.notification_queue.report()
+        self.telegram_sender.rate_limiter.report()
+        report_http_pools()
+        if self.snapshot_store:
+            self.snapshot_store.close()
+        if self.result_sink:
+            self.result_sink.close()
+        if self.checkpoint:
+            self.checkpoint.close()
+        if self.capture_pool:
+            self.capture_pool.close()
+        if self.availability:
+            self.availability.report()
+            self.availability.save()
+        if self.availability_db:
+            self.availability_db.report()
+            self.availability_db.close()
+        if self.read_api:
+            self.read_api.stop()
+
+    def scrape_combination(self, combo, context_info, state, capture=False):
+        """조합 1개 선택 → 검색 → 스크래핑 (실패 시 페이지 새로고침 후 재시도) → (결과, 시도 횟수)
+
+        capture=True면 파싱하지 않고 HTML 캡처를 반환. 재시도 후에도 실패하면 체크포인트에 실패로 기록하고 (None, None) 반환
+        """
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                with metrics.span('select', **self.metric_labels):
+                    self.select_combination(combo, state)
+                self.search()
+                with metrics.span('scrape', **self.metric_labels):
+                    if capture:
+                        return self.capture_current_results(context_info), attempt
+                    return self.scrape_current_results(context_info), attempt
+            except Exception as e:
+                error = str(e)
+                print(f"        ⚠️ 조합 처리 실패 (시도 {attempt}/{self.max_retries + 1}): {error}")
+                state.clear()
+                if attempt <= self.max_retries:
+                    self.recover_page()
+
+        # 캐시와 실제 옵션이 달라 계속 실패했을 수 있음 → 다음 실행에서 해당 지역 트리만 재수집
+        if self.option_tree_cache:
+            self.option_tree_cache.invalidate_region(combo['region']['value'])
+        if self.checkpoint:
+            self.checkpoint.mark_failed(combo_key(combo), context_info, self.max_retries + 1, error)
+        return None, None
+
+    def finish_combination(self, combo, result, attempts):
+        """스크래핑 결과 기록 → 지역별 전송(관심 조건 날짜만) → 체크포인트 완료 표시 → 데이터 수집 여부"""
+        context_info = combo_context(combo)
+        collected = bool(result and result["data"])
+        if collected:
+            self.record_result(result)
+            print(f"        ✅ 데이터 수집 완료 ({len(result['data'])}개 시설)")
+
+            # 🔥 지역별 텔레그램 전송 (변경분만)
+            with metrics.span('notify', region=context_info['region'], forest=context_info['forest']):
+                self.notify_result(context_info, result["data"], combo.get('watch'))
+        else:
+            print(f"        ⚠️ 예약 가능한 데이터 없음")
+            if result:
+                self.record_state(result)  # 이전에 있던 예약 가능 일자 정리
+                self.notify_result(context_info, [])  # 스냅샷도 비워야 다시 열릴 때 알림
+
+        if self.checkpoint:
+            self.checkpoint.mark_done(combo_key(combo), context_info, attempts)
+        return collected
+
+    def finish_captures(self, wait=False):
+        """파싱이 끝난 캡처를 제출 순서대로 마무리 → 데이터 수집 건수"""
+        collected = 0
+        for result, encoded, (combo, attempts) in self.capture_pool.completed(wait):
+            if result is None:
+                # 파싱 오류/결과 테이블 없음: 완료가 아닌 실패로 기록 (--resume 시 다시 시도)
+                if self.checkpoint:
+                    self.checkpoint.mark_failed(combo_key(combo), combo_context(combo), attempts, 'HTML 파싱 실패')
+                continue
+            if encoded and self.availability:
+                self.availability.add_encoded(combo_context(combo), *encoded)
+            collected += self.finish_combination(combo, result, attempts)
+        return collected
+
+    def recover_page(self):
+        """오류 후 페이지를 새로고침해 select 상태 초기화"""
+        try:
+            self.page.reload(wait_until='networkidle', timeout=60000)
+        except Exception as e:
+            print(f"        ⚠️ 페이지 새로고침 실패: {str(e)}")
+
+    def plan_crawl(self, month_options, regions, watch=False):
+        """전체 조합 또는 관심 조건에 필요한 조합만 계획"""
+        if not watch:
+            return plan_combinations(month_options, regions)
+
+        if not self.watch_entries:
+            raise RuntimeError("config.ini에 [WATCH:이름] 관심 조건 섹션이 없습니다")
+        combos = plan_watch_combinations(month_options, regions, self.watch_entries)
+        full_count = sum(len(f['accommodations']) for r in regions for f in r['forests']) * len(month_options)
+        print(f"👀 관심 조건 {len(self.watch_entries)}개 → {len(combos)}개 조합 (전체 {full_count}개)")
+        return combos
+
+    def plan_run(self, force_refresh=False, watch=False):
+        """옵션 트리(디스크 캐시) → 전체 또는 관심 조건 조합 계획 → LOOP_ORDER 순서 적용 (모든 엔진 공용)"""
+        # 월 선택 옵션 수집
+        month_options = self.get_select_options('#monthSelectBox')
+        print(f"📅 월 옵션 수: {len(month_options)}개")
+
+        # 지역 → 휴양림 → 숙박시설 옵션 트리 (디스크 캐시)
+        region_options = self.get_select_options('#srchSido')
+        print(f"🌍 지역 옵션 수: {len(region_options)}개")
+        regions = self.option_tree_cache.get_tree(self, region_options, force_refresh)
+
+        combos = self.plan_crawl(month_options, regions, watch)
+        print(f"🧭 크롤링 계획: 총 {len(combos)}개 조합")
+
+        # 순회 순서 최적화: 월을 가장 안쪽으로 (숙박시설 고정 후 월만 변경)
+        baseline_ops = count_select_ops(combos)
+        combos = order_combinations(combos, self.loop_order)
+        planned_ops = count_select_ops(combos)
+        print(f"🔀 순회 순서 {self.loop_order}: select {planned_ops['selects']}회 / AJAX 대기 "
+              f"{planned_ops['ajax_waits']}회 (월 우선 대비 select "
+              f"{baseline_ops['selects'] - planned_ops['selects']}회, AJAX 대기 "
+              f"{baseline_ops['ajax_waits'] - planned_ops['ajax_waits']}회 절감)")
+        return combos
+
+    def start_checkpoint(self, resume=False):
+        """체크포인트: 재개 모드면 완료된 조합 키 집합 (건너뜀), 아니면 기록을 지우고 빈 집합"""
+        completed = set()
+        if self.checkpoint:
+            if resume:
+                completed = self.checkpoint.completed_keys()
+                print(f"⏯️ 이어서 실행: 완료된 조합 {len(completed)}개 건너뜀")
+            else:
+                self.checkpoint.reset()
+        return completed
+
+    def run_comprehensive_scraping(self, force_refresh=False, resume=False, watch=False):
+        """지역별 실시간 전송이 포함된 전수 스크래핑 (캐시된 옵션 트리로 조합을 미리 계획, 체크포인트로 재개)
 
-    def run_comprehensive_scraping(self):
-        """지역별 실시간 전송이 포함된 전수 스크래핑"""
+        watch=True면 관심 조건에 필요한 조합만 크롤링하고 해당 날짜/요일만 알림
+        """
         try:
             self.page.wait_for_load_state('networkidle')
             print("📄 페이지 로딩 완료")
+            if self.resource_router:
+                self.resource_router.reset_stats()
 
-            # 월 선택 옵션 수집
-            month_options = self.get_select_options('#monthSelectBox')
-            print(f"📅 월 옵션 수: {len(month_options)}개")
-
-            # 지역 선택 옵션 수집
-            region_options = self.get_select_options('#srchSido')
-            print(f"🌍 지역 옵션 수: {len(region_options)}개")
+            combos = self.plan_run(force_refresh, watch)
+            completed = self.start_checkpoint(resume)
 
             total_combinations = 0
             processed_combinations = 0
-
-            for month_idx, month_option in enumerate(month_options):
-                print(f"\n🗓️ [{month_idx + 1}/{len(month_options)}] 월 선택: {month_option['text']}")
-                self.smart_select('#monthSelectBox', month_option['value'], 'value')
-
-                for region_idx, region_option in enumerate(region_options):
-                    # 🔥 지역 코드와 지역명 추출
-                    current_region_code = region_option['value']
-                    current_region_name = region_option['text']
-
-                    print(f"  🌏 [{region_idx + 1}/{len(region_options)}] 지역 선택: {current_region_name}")
-                    self.smart_select('#srchSido', current_region_code, 'value')
-
-                    # 자연휴양림 옵션 로딩
-                    self.page.wait_for_function('''
-                        () => document.querySelector('#srchInstt').children.length > 1
-                    ''', timeout=10000)
-
-                    forest_options = self.get_select_options('#srchInstt')
-                    print(f"    🌲 자연휴양림 옵션 수: {len(forest_options)}개")
-
-                    for forest_idx, forest_option in enumerate(forest_options):
-                        print(f"    🏕️ [{forest_idx + 1}/{len(forest_options)}] 휴양림: {forest_option['text']}")
-                        self.smart_select('#srchInstt', forest_option['value'], 'value')
-
-                        # 숙박시설 옵션 로딩
-                        self.page.wait_for_function('''
-                            () => document.querySelector('#srchForest').children.length > 1
-                        ''', timeout=10000)
-
-                        accommodation_options = self.get_select_options('#srchForest')
-                        print(f"      🏠 숙박시설 옵션 수: {len(accommodation_options)}개")
-
-                        for acc_idx, acc_option in enumerate(accommodation_options):
-                            total_combinations += 1
-
-                            # 🔥 컨텍스트 정보에 지역 코드 포함
-                            context_info = {
-                                "month": month_option['text'],
-                                "region": current_region_name,
-                                "region_code": current_region_code,  # 지역 코드 추가
-                                "forest": forest_option['text'],
-                                "accommodation": acc_option['text']
-                            }
-
-                            print(f"      🏘️ [{acc_idx + 1}/{len(accommodation_options)}] 숙박시설: {acc_option['text']}")
-
-                            # 검색 실행
-                            self.smart_select('#srchForest', acc_option['value'], 'value')
-                            self.page.wait_for_selector('#srchForest2 option:nth-child(1)', state='attached')
-                            self.smart_select('#srchForest2', 0, 'index')
-
-                            self.safe_click('#searchBtn')
-                            self.page.wait_for_load_state('networkidle')
-                            self.page.wait_for_timeout(2000)
-
-                            # 결과 스크래핑
-                            result = self.scrape_current_results(context_info)
-
-                            if result and result["data"]:
-                                self.all_results.append(result)
-                                processed_combinations += 1
-                                print(f"        ✅ 데이터 수집 완료 ({len(result['data'])}개 시설)")
-
-                                # 🔥 지역별 텔레그램 전송
-                                self.telegram_sender.send_to_region(
-                                    current_region_code,  # 지역 코드로 채팅방 구분
-                                    context_info,
-                                    result["data"]
-                                )
-
-                            else:
-                                print(f"        ⚠️ 예약 가능한 데이터 없음")
+            failed_combinations = 0
+            state = {}  # 현재 선택된 select 값
+            current_region = None
+
+            for idx, combo in enumerate(combos):
+                key = combo_key(combo)
+                if key in completed:
+                    continue
+
+                total_combinations += 1
+                self.flush_due_regions()
+                # 지역 순회가 끝나면 (남은 파싱을 마치고) 해당 지역 묶음 전송
+                if current_region is not None and combo['region']['value'] != current_region:
+                    if self.capture_pool:
+                        processed_combinations += self.finish_captures(wait=True)
+                    self.flush_region_messages(current_region)
+                current_region = combo['region']['value']
+
+                context_info = combo_context(combo)
+                self.metric_labels = {'region': context_info['region'], 'forest': context_info['forest']}
+                print(f"      🏘️ [{idx + 1}/{len(combos)}] {context_info['region']} / "
+                      f"{context_info['forest']} / {context_info['accommodation']}")
+
+                capture = self.capture_pool is not None
+                result, attempts = self.scrape_combination(combo, context_info, state, capture)
+                if attempts is None:
+                    failed_combinations += 1
+                    continue
+
+                if capture:
+                    # 파싱은 별도 프로세스에 맡기고 바로 다음 검색 진행
+                    self.capture_pool.submit(result, (combo, attempts))
+                    processed_combinations += self.finish_captures()
+                else:
+                    processed_combinations += self.finish_combination(combo, result, attempts)
+
+            if self.capture_pool:
+                processed_combinations += self.finish_captures(wait=True)
+                self.capture_pool.report()
 
             print(f"\n🎉 지역별 전수 스크래핑 완료!")
             print(f"📊 총 조합 수: {total_combinations}")
             print(f"📈 데이터 수집 성공: {processed_combinations}")
+            print(f"🚫 재시도 후 실패: {failed_combinations}")
+            self.cascade_waiter.report()
+            if self.resource_router:
+                self.resource_router.report()
+            if self.checkpoint:
+                self.checkpoint.report()
+            self.flush_notifications()
+            metrics.report(self.config.get('METRICS', 'JSON_PATH', fallback='') or None)
 
-            return self.all_results
+            return self.collected_results()
 
         except Exception as e:
             print(f"❌ 전수 스크래핑 실패: {str(e)}")
@@ -210,9 +569,18 @@ class ForestReservationSystem:
             raise
 
     def save_results_to_file(self, filename='comprehensive_results.json'):
-        """결과를 파일로 저장"""
+        """결과를 파일로 저장 (메모리에 없으면 JSONL 스트리밍 파일에서 한 건씩 읽어 변환)"""
+        if self.all_results is not None:
+            results = self.all_results
+        else:
+            results = iter_results(files=self.result_sink.files)  # 이번 실행에서 기록한 파일만
+
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.all_results, f, ensure_ascii=False, indent=2)
+            f.write('[')
+            for i, result in enumerate(results):
+                f.write(',\n' if i else '\n')
+                f.write(json.dumps(result, ensure_ascii=False, indent=2))
+            f.write('\n]\n')
         print(f"💾 결과 저장 완료: {filename}")
 
     # temp test code
@@ -394,7 +762,7 @@ class ForestReservationSystem:
             self.page.screenshot(path=f'error_{target_region_code}.png')
 
 
-    def run_reservation_flow(self):
+    def run_reservation_flow(self, force_refresh=False, resume=False, watch=False):
         """기존 메서드를 전수 스크래핑으로 대체"""
-        results = self.run_comprehensive_scraping()
+        results = self.run_comprehensive_scraping(force_refresh, resume, watch)
         return results
\ No newline at end of file
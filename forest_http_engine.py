@@ -0,0 +1,375 @@
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+from html.parser import HTMLParser
+import requests
+import json
+from http_pool import get_session
+from crawl_planner import combo_context, combo_key
+from cascade_wait import CASCADE_DEPENDENCIES
+from day_list_parser import parse_day_list_html, build_facility_entries
+from session_state import startup_timer
+
+# 검색 조건 필드 ↔ 월별예약 페이지 select
+FIELD_SELECTORS = {
+    'month': '#monthSelectBox',
+    'region': '#srchSido',
+    'forest': '#srchInstt',
+    'accommodation': '#srchForest',
+    'facility': '#srchForest2',
+}
+
+# 재전송 시 그대로 복사할 요청 헤더
+REPLAY_HEADERS = {'accept', 'content-type', 'x-requested-with', 'x-csrf-token', 'ajax'}
+
+CSRF_JS = """() => {
+    const input = document.querySelector('input[name="_csrf"]');
+    if (input) return input.value;
+    const meta = document.querySelector('meta[name="_csrf"]');
+    return meta ? meta.content : null;
+}"""
+
+# select 옵션 전체 (빈 값 포함)
+DOM_OPTIONS_JS = """(selector) => Array.from(document.querySelector(selector).options)
+    .map(o => ({value: o.value, text: o.innerText}))"""
+
+
+class _OptionParser(HTMLParser):
+    """<option> 조각 HTML → [{'value', 'text'}]"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.options = []
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'option':
+            self.current = {'value': dict(attrs).get('value') or '', 'text': ''}
+            self.options.append(self.current)
+
+    def handle_endtag(self, tag):
+        if tag == 'option':
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current is not None:
+            self.current['text'] += data
+
+
+def _find_option_list(payload, expected, path=()):
+    """JSON 응답에서 DOM 옵션과 일치하는 목록 위치와 value/text 키 탐색"""
+    if isinstance(payload, dict):
+        for key, child in payload.items():
+            found = _find_option_list(child, expected, path + (key,))
+            if found:
+                return found
+    elif isinstance(payload, list) and payload and all(isinstance(item, dict) for item in payload):
+        values = {o['value'] for o in expected if o['value']}
+        texts = {o['text'].strip() for o in expected if o['value']}
+        for value_key in payload[0]:
+            if values and values <= {str(item.get(value_key)) for item in payload}:
+                for text_key in payload[0]:
+                    if texts <= {str(item.get(text_key)).strip() for item in payload}:
+                        return {'path': list(path), 'value_key': value_key, 'text_key': text_key}
+    return None
+
+
+def parse_options(text, spec, include_empty=False):
+    """옵션 엔드포인트 응답 → [{'value', 'text'}]"""
+    if spec['format'] == 'json':
+        items = json.loads(text)
+        for key in spec['path']:
+            items = items[key]
+        options = [{'value': str(item[spec['value_key']]), 'text': str(item[spec['text_key']]).strip()}
+                   for item in items]
+    else:
+        parser = _OptionParser()
+        parser.feed(text)
+        options = [{'value': o['value'], 'text': o['text'].strip()} for o in parser.options]
+
+    if include_empty:
+        return options
+    return [o for o in options if o['value']]
+
+
+class RequestRecorder:
+    """브라우저가 보낸 동일 출처 XHR/문서 요청 기록"""
+
+    def __init__(self, page):
+        self.page = page
+        self.origin = urlsplit(page.url).netloc
+        self.requests = []
+
+    def __enter__(self):
+        self.page.on('requestfinished', self._on_request)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.page.remove_listener('requestfinished', self._on_request)
+
+    def _on_request(self, request):
+        if request.resource_type in ('xhr', 'fetch', 'document') and urlsplit(request.url).netloc == self.origin:
+            self.requests.append(request)
+
+
+class HttpScrapingEngine:
+    """브라우저 로그인 세션을 재사용하는 HTTP 직접 호출 스크래핑 엔진"""
+
+    def __init__(self, system):
+        self.system = system  # ForestReservationSystem (페이지/전송/결과 공유)
+        self.page = system.page
+        self.timeout = system.config.getint('HTTP_ENGINE', 'TIMEOUT', fallback=15)
+        pool_size = system.config.getint('HTTP_ENGINE', 'POOL_SIZE', fallback=4)
+
+        self.session = get_session('foresttrip', pool_connections=pool_size, pool_maxsize=pool_size)
+
+        self.csrf_token = None
+        self.select_names = {}
+        self.endpoints = {}  # forest / accommodation / facility / search
+
+    def sync_session(self):
+        """브라우저 컨텍스트의 쿠키, User-Agent, CSRF 토큰을 HTTP 세션에 복사"""
+        for cookie in self.page.context.cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie['domain'], path=cookie['path'])
+        self.session.headers['User-Agent'] = self.page.evaluate('navigator.userAgent')
+        self.session.headers['Referer'] = self.page.url
+        self.csrf_token = self.page.evaluate(CSRF_JS)
+
+    # --- 엔드포인트 학습 (브라우저로 1회 연쇄 선택) ---
+    def _build_spec(self, request, values):
+        """기록된 요청 → 재전송 명세 (조건 필드 ↔ 파라미터 이름 매핑 포함)"""
+        parts = urlsplit(request.url)
+        post_data = request.post_data
+        content_type = request.headers.get('content-type', '')
+
+        if request.method == 'GET' or not post_data:
+            params = dict(parse_qsl(parts.query, keep_blank_values=True))
+            body_type = 'query'
+            url = urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+        elif 'json' in content_type:
+            params = json.loads(post_data)
+            body_type = 'json'
+            url = request.url
+        else:
+            params = dict(parse_qsl(post_data, keep_blank_values=True))
+            body_type = 'form'
+            url = request.url
+
+        bind = {}
+        for field, value in values.items():
+            name = self.select_names.get(field)
+            if name in params:
+                bind[field] = name
+            else:
+                match = next((k for k, v in params.items() if str(v) == str(value)), None)
+                if match:
+                    bind[field] = match
+
+        headers = {k: v for k, v in request.headers.items() if k.lower() in REPLAY_HEADERS}
+        return {'url': url, 'method': request.method, 'body_type': body_type,
+                'params': params, 'bind': bind, 'headers': headers}
+
+    def _learn_option_endpoint(self, selector, values, field):
+        dependent = CASCADE_DEPENDENCIES[selector]
+        with RequestRecorder(self.page) as recorder:
+            self.system.smart_select(selector, values[field], 'value')
+
+        expected = self.page.evaluate(DOM_OPTIONS_JS, dependent)
+        expected_values = [o['value'] for o in expected if o['value']]
+
+        for request in recorder.requests:
+            spec = self._build_spec(request, values)
+            if field not in spec['bind']:
+                continue
+
+            response = request.response()
+            if response is None:  # 응답 전에 취소/실패한 요청
+                continue
+            text = response.text()
+            try:
+                keys = _find_option_list(json.loads(text), expected)
+                if not keys:
+                    continue
+                spec.update(format='json', **keys)
+            except ValueError:
+                spec['format'] = 'html'
+
+            if [o['value'] for o in parse_options(text, spec)] == expected_values:
+                print(f"🔗 {dependent} 엔드포인트 학습: {spec['method']} {spec['url']}")
+                return spec
+
+        raise RuntimeError(f"{dependent} 옵션 엔드포인트를 찾지 못했습니다")
+
+    def _learn_search_endpoint(self, values):
+        with RequestRecorder(self.page) as recorder:
+            self.system.safe_click('#searchBtn')
+            self.page.wait_for_load_state('networkidle')
+            self.page.wait_for_selector('#dayListTable', state='visible', timeout=50000)
+
+        for request in recorder.requests:
+            spec = self._build_spec(request, values)
+            if 'accommodation' not in spec['bind']:
+                continue
+            response = request.response()
+            if response is not None and 'dayListTable' in response.text():
+                print(f"🔗 검색 엔드포인트 학습: {spec['method']} {spec['url']}")
+                return spec
+
+        raise RuntimeError("검색 엔드포인트를 찾지 못했습니다")
+
+    def learn_endpoints(self, month_option, region_option):
+        """첫 조합을 브라우저로 선택하며 AJAX/검색 요청 형식 학습"""
+        self.select_names = {
+            field: self.page.eval_on_selector(selector, 'el => el.name || el.id')
+            for field, selector in FIELD_SELECTORS.items()
+        }
+
+        values = {'month': month_option['value']}
+        self.system.smart_select('#monthSelectBox', values['month'], 'value')
+
+        values['region'] = region_option['value']
+        self.endpoints['forest'] = self._learn_option_endpoint('#srchSido', values, 'region')
+        values['forest'] = self.system.get_select_options('#srchInstt')[0]['value']
+        self.endpoints['accommodation'] = self._learn_option_endpoint('#srchInstt', values, 'forest')
+        values['accommodation'] = self.system.get_select_options('#srchForest')[0]['value']
+        self.endpoints['facility'] = self._learn_option_endpoint('#srchForest', values, 'accommodation')
+
+        self.system.smart_select('#srchForest2', 0, 'index')
+        values['facility'] = self.page.eval_on_selector('#srchForest2', 'el => el.value')
+        self.endpoints['search'] = self._learn_search_endpoint(values)
+
+    # --- HTTP 호출 ---
+    def _call(self, spec, values):
+        params = dict(spec['params'])
+        for field, name in spec['bind'].items():
+            if field in values:
+                params[name] = values[field]
+        if '_csrf' in params and self.csrf_token:
+            params['_csrf'] = self.csrf_token
+
+        headers = dict(spec['headers'])
+        for key in headers:
+            if key.lower() == 'x-csrf-token' and self.csrf_token:
+                headers[key] = self.csrf_token
+
+        if spec['body_type'] == 'query':
+            kwargs = {'params': params}
+        elif spec['body_type'] == 'json':
+            kwargs = {'json': params}
+        else:
+            kwargs = {'data': params}
+        response = self.session.request(spec['method'], spec['url'], headers=headers,
+                                        timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.text
+
+    def get_options(self, level, values, include_empty=False):
+        spec = self.endpoints[level]
+        return parse_options(self._call(spec, values), spec, include_empty)
+
+    def scrape(self, context_info, values):
+        """검색 요청 1회 → ForestReservationSystem과 같은 {context, data} 결과 (실패 시 예외)"""
+        parsed = parse_day_list_html(self._call(self.endpoints['search'], values))
+        if parsed is None:
+            raise RuntimeError("검색 응답에 #dayListTable 없음 (세션 만료 또는 대기열 페이지)")
+
+        names, rows = parsed
+        if self.system.availability:
+            self.system.availability.add(context_info, names, rows)
+        data = build_facility_entries(names, rows)
+        total_dates = sum(len(f['dates']) for f in data)
+        print(f"📊 HTTP 스크래핑 완료: 시설 {len(data)}개, 예약 일자 {total_dates}개")
+        startup_timer.mark_first_scrape()
+        return {"context": context_info, "data": data}
+
+    def with_retry(self, label, func, *args, **kwargs):
+        """HTTP 호출 재시도 (실패 시 페이지 새로고침 + 세션 재동기화) → (결과, 시도 횟수)
+
+        재시도 후에도 실패하면 마지막 예외를 그대로 발생
+        """
+        max_attempts = self.system.max_retries + 1
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return func(*args, **kwargs), attempt
+            except (requests.RequestException, RuntimeError, ValueError, KeyError) as e:
+                print(f"        ⚠️ {label} 실패 (시도 {attempt}/{max_attempts}): {str(e)}")
+                if attempt == max_attempts:
+                    raise
+                self.system.recover_page()
+                try:
+                    self.sync_session()  # 쿠키/CSRF 토큰 갱신
+                except Exception as sync_error:
+                    print(f"        ⚠️ 세션 재동기화 실패: {str(sync_error)}")
+
+    def scrape_combination(self, context_info, values):
+        """숙박시설 1개의 시설 옵션 조회 + 검색 → 스크래핑 결과"""
+        facility_options = self.get_options('facility', values, include_empty=True)
+        values = dict(values, facility=facility_options[0]['value'] if facility_options else '')
+        return self.scrape(context_info, values)
+
+    def run_comprehensive_scraping(self, force_refresh=False, resume=False, watch=False):
+        """브라우저 대신 HTTP 호출로 수행하는 전수 스크래핑
+
+        조합은 브라우저 엔진과 같은 계획(옵션 트리 캐시/관심 조건/LOOP_ORDER)을 사용하고,
+        resume이면 체크포인트의 완료 조합을 건너뜀
+        """
+        self.page.wait_for_load_state('networkidle')
+        system = self.system
+        combos = system.plan_run(force_refresh, watch)
+
+        if combos:
+            try:
+                self.learn_endpoints(combos[0]['month'], combos[0]['region'])
+            except Exception as e:
+                print(f"⚠️ HTTP 엔드포인트 학습 실패, 브라우저 엔진으로 전환: {str(e)}")
+                return system.run_comprehensive_scraping(force_refresh, resume, watch)
+            self.sync_session()
+
+        checkpoint = system.checkpoint
+        completed = system.start_checkpoint(resume)
+
+        total_combinations = 0
+        processed_combinations = 0
+        failed_combinations = 0
+        current_region = None
+
+        for combo in combos:
+            key = combo_key(combo)
+            if key in completed:
+                continue
+
+            total_combinations += 1
+            system.flush_due_regions()
+            # 지역 순회가 끝나면 해당 지역 묶음 전송
+            if current_region is not None and combo['region']['value'] != current_region:
+                system.flush_region_messages(current_region)
+            current_region = combo['region']['value']
+
+            context_info = combo_context(combo)
+            values = {field: combo[field]['value'] for field in ('month', 'region', 'forest', 'accommodation')}
+            print(f"  🏘️ {context_info['month']} / {context_info['region']} / "
+                  f"{context_info['forest']} / {context_info['accommodation']}")
+
+            try:
+                result, attempts = self.with_retry("HTTP 검색", self.scrape_combination, context_info, values)
+            except Exception as e:
+                failed_combinations += 1
+                # 캐시와 실제 옵션이 달랐을 수 있음 → 다음 실행에서 해당 지역 트리만 재수집
+                system.option_tree_cache.invalidate_region(combo['region']['value'])
+                if checkpoint:
+                    checkpoint.mark_failed(key, context_info, system.max_retries + 1, str(e))
+                continue
+
+            processed_combinations += system.finish_combination(combo, result, attempts)
+
+        if current_region is not None:
+            system.flush_region_messages(current_region)
+
+        print(f"\n🎉 HTTP 전수 스크래핑 완료!")
+        print(f"📊 총 조합 수: {total_combinations}")
+        print(f"📈 데이터 수집 성공: {processed_combinations}")
+        print(f"🚫 재시도 후 실패: {failed_combinations}")
+        if checkpoint:
+            checkpoint.report()
+        self.system.flush_notifications()
+
+        return self.system.collected_results()
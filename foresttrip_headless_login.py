@@ -1,6 +1,7 @@
 from playwright.sync_api import sync_playwright
 import configparser
 import re
+from session_state import build_session_store, startup_timer
 
 config = configparser.ConfigParser()
 config.read('config.ini', encoding='utf-8')
@@ -76,14 +77,15 @@ def handle_dynamic_popup(page):
 
 
 
-def foresttrip_login():
+def foresttrip_login(user_data_dir='./user_data'):
+    """로그인 후 월별예약 페이지 반환 (user_data_dir: 브라우저 프로필 경로, 작업자 프로세스마다 별도 지정)"""
     # with sync_playwright() as p:
 
     playwright = sync_playwright().start()  # ← start()로 수정
 
     # 브라우저 설정
     browser = playwright.chromium.launch_persistent_context(
-        user_data_dir='./user_data',
+        user_data_dir=user_data_dir,
         headless=False,
         args=[
             '--disable-blink-features=AutomationControlled',
@@ -93,6 +95,18 @@ def foresttrip_login():
 
     page = browser.new_page()
 
+    # 0. 저장된 세션이 아직 유효하면 로그인 생략하고 월별예약 페이지로 바로 이동
+    session_store = build_session_store(config)
+    saved = session_store.load() if session_store else None
+    if saved:
+        session_store.restore(browser, saved)
+        if session_store.probe(page, saved):
+            print("✅ 저장된 로그인 세션 재사용")
+            startup_timer.mark_login('세션 재사용')
+            return page
+        print("🔐 세션 만료 → 전체 로그인 진행")
+        session_store.invalidate()
+
     try:
         # 1. 로그인 페이지 이동
         page.goto(config['DEFAULT']['LOGIN_URL'], timeout=60000)
@@ -136,6 +150,12 @@ def foresttrip_login():
 
         page = browser.pages[2]
 
+        # 다음 실행에서 로그인 생략용 세션 저장
+        if session_store:
+            page.wait_for_load_state('networkidle')
+            session_store.save(browser.storage_state(), page.url)
+        startup_timer.mark_login('전체 로그인')
+
         # 성공 시 브라우저 컨텍스트 반환
         return page
 
@@ -0,0 +1,129 @@
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+import requests
+import threading
+import time
+
+
+class PoolMetrics:
+    """커넥션 생성/재사용 횟수와 요청 지연 시간 집계"""
+
+    def __init__(self, max_samples=10000):
+        self.lock = threading.Lock()
+        self.max_samples = max_samples
+        self.connections_opened = 0
+        self.requests = 0
+        self.errors = 0
+        self.latencies = []  # 최근 요청 지연 시간(ms)
+
+    def record_connection(self):
+        with self.lock:
+            self.connections_opened += 1
+
+    def record_request(self, elapsed_ms, ok=True):
+        with self.lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+            self.latencies.append(elapsed_ms)
+            if len(self.latencies) > self.max_samples:
+                del self.latencies[:len(self.latencies) - self.max_samples]
+
+    def _percentile(self, ordered, ratio):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 1) if ordered else 0.0
+
+    def stats(self):
+        with self.lock:
+            ordered = sorted(self.latencies)
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(0, self.requests - self.connections_opened),
+                "p50_ms": self._percentile(ordered, 0.50),
+                "p95_ms": self._percentile(ordered, 0.95),
+                "p99_ms": self._percentile(ordered, 0.99),
+            }
+
+
+def _counting_pool(base, metrics):
+    """새 커넥션 생성 시 metrics에 기록하는 urllib3 커넥션 풀 클래스"""
+
+    class CountingPool(base):
+        def _new_conn(self):
+            metrics.record_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """keep-alive 커넥션 풀 + 생성 횟수 계측 어댑터"""
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.metrics),
+            'https': _counting_pool(HTTPSConnectionPool, self.metrics),
+        }
+
+
+class PooledSession(requests.Session):
+    """요청 지연 시간을 기록하는 keep-alive 세션"""
+
+    def __init__(self, name, pool_connections=4, pool_maxsize=10):
+        super().__init__()
+        self.name = name
+        self.metrics = PoolMetrics()
+        adapter = PooledHTTPAdapter(self.metrics, pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize, pool_block=False)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.headers['Connection'] = 'keep-alive'
+
+    def request(self, method, url, *args, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            ok = response.status_code < 500
+            return response
+        finally:
+            self.metrics.record_request((time.perf_counter() - started) * 1000, ok)
+
+    def report(self):
+        stats = self.metrics.stats()
+        print(f"🔌 HTTP 풀 [{self.name}]: 요청 {stats['requests']}건 (오류 {stats['errors']}), "
+              f"커넥션 생성 {stats['connections_opened']} / 재사용 {stats['connections_reused']}, "
+              f"지연 p50 {stats['p50_ms']}ms / p95 {stats['p95_ms']}ms / p99 {stats['p99_ms']}ms")
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name, pool_connections=4, pool_maxsize=10):
+    """이름별 공유 세션 (텔레그램 전송기들, HTTP 스크래핑 엔진이 같은 풀을 재사용)"""
+    with _sessions_lock:
+        if name not in _sessions:
+            _sessions[name] = PooledSession(name, pool_connections, pool_maxsize)
+        return _sessions[name]
+
+
+def build_session(config, name):
+    """config.ini [HTTP_POOL] 설정으로 공유 세션 생성/조회"""
+    return get_session(
+        name,
+        pool_connections=config.getint('HTTP_POOL', 'POOL_CONNECTIONS', fallback=4),
+        pool_maxsize=config.getint('HTTP_POOL', 'POOL_MAXSIZE', fallback=10)
+    )
+
+
+def report_all():
+    """생성된 모든 공유 세션의 지표 출력"""
+    for session in list(_sessions.values()):
+        session.report()
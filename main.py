@@ -1,11 +1,49 @@
 from foresttrip_headless_login import foresttrip_login
 from forest_headless_reservation import ForestReservationSystem
+from forest_http_engine import HttpScrapingEngine
+from parallel_crawl import ParallelCrawler
+from polling_daemon import PollingDaemon
+from work_queue import WorkQueueCoordinator
+from async_forest_reservation import run_async
 from send_telegram import send_telegram_message
+import argparse
+import asyncio
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='휴양림 예약 현황 스크래핑')
+    parser.add_argument('--engine', choices=['browser', 'http'],
+                        help='스크래핑 엔진 (기본값: config.ini [SCRAPING] ENGINE)')
+    parser.add_argument('--pages', type=int,
+                        help='브라우저 엔진 병렬 페이지 수 (기본값: config.ini [PARALLEL] PAGES)')
+    parser.add_argument('--refresh-options', action='store_true',
+                        help='지역/휴양림/숙박시설 옵션 트리 캐시 강제 재수집')
+    parser.add_argument('--resume', action='store_true',
+                        help='체크포인트에 기록된 완료 조합을 건너뛰고 이어서 실행')
+    parser.add_argument('--watch', action='store_true',
+                        help='config.ini [WATCH:이름] 관심 조건에 필요한 조합만 크롤링')
+    parser.add_argument('--daemon', action='store_true',
+                        help='로그인 세션을 유지하며 우선순위 스케줄에 따라 계속 폴링')
+    parser.add_argument('--workers', type=int,
+                        help='SQLite 작업 큐 + 작업자 프로세스 N개로 분산 크롤링 (각자 별도 브라우저 프로필로 로그인)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='asyncio 기반 AsyncForestReservationSystem으로 실행')
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    if args.use_async:
+        # async 구현을 이벤트 루프 하나로 실행하는 얇은 래퍼
+        page_count = args.pages or 1
+        result_data = asyncio.run(run_async(page_count))
+        count = result_data['results'] if isinstance(result_data, dict) else len(result_data or [])
+        print(f"휴양림 스크래핑 완료 (결과 {count}건)")
+        return
+
     browser = None
     page = None
+    reservation = None
 
     try:
         # 1. 로그인 및 브라우저 인스턴스 획득
@@ -13,13 +51,32 @@ def main():
 
         # 2. 예약 시스템 초기화 (로그인 세션 전달)
         reservation = ForestReservationSystem(page)
+        reservation.install_resource_router()  # 리소스 차단 (이후 여는 페이지 포함 컨텍스트 전체)
 
-        # 3. 예약 프로세스 실행
-        result_data = reservation.run_reservation_flow()
+        # 3. 예약 프로세스 실행 (browser: Playwright 렌더링 / http: 로그인 세션 재사용 직접 호출)
+        engine = args.engine or reservation.config.get('SCRAPING', 'ENGINE', fallback='browser')
+        page_count = args.pages or reservation.config.getint('PARALLEL', 'PAGES', fallback=1)
+        if args.daemon:
+            PollingDaemon(reservation).run(args.refresh_options, args.watch)
+            result_data = None
+        elif args.workers:
+            result_data = WorkQueueCoordinator(reservation, args.workers).run(
+                args.refresh_options, args.resume, args.watch)
+        elif engine == 'http':
+            result_data = HttpScrapingEngine(reservation).run_comprehensive_scraping(
+                args.refresh_options, args.resume, args.watch)
+        elif page_count > 1:
+            result_data = ParallelCrawler(reservation, page_count).run(args.refresh_options, args.resume, args.watch)
+        else:
+            result_data = reservation.run_reservation_flow(args.refresh_options, args.resume, args.watch)
 
         # reservation.run_june_region_test()  # 새 메서드 호출
 
-        print(result_data)
+        if isinstance(result_data, dict):
+            # 결과를 메모리에 보관하지 않는 경우 (KEEP_IN_MEMORY = false): 스트리밍 저장 요약
+            print(f"💾 결과 {result_data['results']}건 → {', '.join(result_data['files']) or '기록된 파일 없음'}")
+        else:
+            print(result_data)
         # 4. 텔레그램 전송
         # 모든 데이터 기준 한번에 전송
         # if result_data:
@@ -30,6 +87,9 @@ def main():
             print(f"🚨 전체 프로세스 오류: {str(e)}")
 
     finally:
+        # 남은 텔레그램 전송을 모두 보낸 뒤 종료
+        if reservation:
+            reservation.shutdown()
         print("휴양림 스크래핑 완료")
         # if page:
         #     page.stop()
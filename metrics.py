@@ -0,0 +1,178 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bisect
+import json
+import threading
+import time
+
+# 단계 소요 시간 히스토그램 구간(초)
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LABEL_NAMES = ('stage', 'region', 'forest')
+
+
+class _NoopSpan:
+    """비활성화 시 사용하는 빈 span (할당/시간 측정 없음)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, registry, key, offset=0.0):
+        self.registry = registry
+        self.key = key
+        self.offset = offset  # 블록 밖에서 이미 쓴 같은 단계 시간(초)
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.key, time.perf_counter() - self.started + self.offset)
+        return False
+
+
+class StageMetrics:
+    """크롤링/전송 단계별 소요 시간 히스토그램 (지역/휴양림 라벨), Prometheus 텍스트·JSON 내보내기"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.histograms = {}  # (stage, region, forest) -> [구간별 건수..., +Inf 건수, 합계(초)]
+        self.server = None
+
+    def span(self, stage, region='', forest='', offset=0.0):
+        """with metrics.span('search', region=..., forest=...): 블록 소요 시간(+ offset초) 기록"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, (stage, region, forest), offset)
+
+    def observe(self, key, seconds):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def _snapshot(self):
+        with self.lock:
+            return {key: list(values) for key, values in self.histograms.items()}
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (누적 구간)"""
+        lines = [
+            '# HELP foresttrip_stage_duration_seconds 크롤링/전송 단계별 소요 시간',
+            '# TYPE foresttrip_stage_duration_seconds histogram',
+        ]
+        for key, values in sorted(self._snapshot().items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(LABEL_NAMES, key))
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), values[:-1]):
+                cumulative += count
+                lines.append(f'foresttrip_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'foresttrip_stage_duration_seconds_sum{{{labels}}} {values[-1]:.6f}')
+            lines.append(f'foresttrip_stage_duration_seconds_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """단계별 합계 + 지역/휴양림별 합계 (p95는 히스토그램 구간 상한 기준 근사치)"""
+        stages = {}
+        breakdown = {}
+        for (stage, region, forest), values in self._snapshot().items():
+            total = stages.setdefault(stage, [0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+            if region:
+                key = f"{region} / {forest}" if forest else region
+                entry = breakdown.setdefault(stage, {}).setdefault(key, {'count': 0, 'total_s': 0.0})
+                entry['count'] += sum(values[:-1])
+                entry['total_s'] = round(entry['total_s'] + values[-1], 3)
+
+        result = {}
+        for stage, values in stages.items():
+            count = sum(values[:-1])
+            result[stage] = {
+                'count': count,
+                'total_s': round(values[-1], 3),
+                'avg_ms': round(values[-1] / count * 1000, 1) if count else 0.0,
+                'p95_le_s': _bucket_quantile(values[:-1], 0.95),
+            }
+        return {'stages': result, 'by_location': breakdown}
+
+    def report(self, json_path=None):
+        """단계별 합계 출력 (+ JSON 파일 저장)"""
+        if not self.enabled:
+            return
+        summary = self.summary()
+        print("⏱️ 단계별 소요 시간")
+        for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total_s']):
+            print(f"  - {stage}: {stats['count']}회, 합계 {stats['total_s']}s, 평균 {stats['avg_ms']}ms, "
+                  f"p95 ≤ {stats['p95_le_s']}s")
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(summary, generated_at=time.time()), f, ensure_ascii=False, indent=2)
+            print(f"💾 단계별 지표 저장: {json_path}")
+
+    def serve(self, port, host='127.0.0.1'):
+        """/metrics 엔드포인트 (Prometheus 수집용) 백그라운드 실행"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name='metrics-http', daemon=True).start()
+        print(f"📡 Prometheus 지표: http://{host}:{port}/metrics")
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _bucket_quantile(counts, ratio):
+    total = sum(counts)
+    if not total:
+        return 0.0
+    target = total * ratio
+    cumulative = 0
+    for bound, count in zip(BUCKETS + (float('inf'),), counts):
+        cumulative += count
+        if cumulative >= target:
+            return bound
+    return float('inf')
+
+
+metrics = StageMetrics()  # 모듈 공용 인스턴스 (configure_metrics로 활성화)
+
+
+def configure_metrics(config):
+    """config.ini [METRICS] 설정 적용 (한 번만 HTTP 엔드포인트 시작)"""
+    metrics.enabled = config.getboolean('METRICS', 'ENABLED', fallback=False)
+    port = config.getint('METRICS', 'PROMETHEUS_PORT', fallback=0)
+    if metrics.enabled and port and metrics.server is None:
+        metrics.serve(port, config.get('METRICS', 'HOST', fallback='127.0.0.1'))
+    return metrics
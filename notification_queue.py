@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+
+_STOP = object()  # 작업 스레드 종료 신호
+
+
+class NotificationQueue:
+    """텔레그램 전송을 스크래핑과 분리하는 제한 크기 백그라운드 큐"""
+
+    def __init__(self, sender, maxsize=200, workers=2):
+        self.sender = sender
+        self.queue = queue.Queue(maxsize=maxsize)  # 가득 차면 submit이 대기 (역압)
+        self.lock = threading.Lock()
+        self.closed = False
+
+        self.submitted = 0
+        self.delivered = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.latencies = []  # 큐 투입 → 전송 완료까지 걸린 시간(초)
+
+        self.threads = [
+            threading.Thread(target=self._worker, name=f'telegram-sender-{i + 1}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, region_code, context_info, result_data, on_sent=None):
+        """전송 요청을 큐에 넣고 즉시 반환 (on_sent는 전송 성공 후 작업 스레드에서 호출)"""
+        self._put(self.sender.send_to_region, (region_code, context_info, result_data), on_sent)
+
+    def submit_batch(self, region_code, sections, on_sent=None):
+        """지역 묶음 전송 요청을 큐에 넣고 즉시 반환"""
+        self._put(self.sender.send_region_batch, (region_code, sections), on_sent)
+
+    def _put(self, send, args, on_sent=None):
+        if self.closed:
+            raise RuntimeError("이미 종료된 전송 큐입니다")
+
+        self.queue.put((time.perf_counter(), send, args, on_sent))
+        with self.lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+
+                enqueued_at, send, args, on_sent = item
+                try:
+                    ok = send(*args)
+                    if ok is not False and on_sent:
+                        on_sent()
+                except Exception as e:
+                    print(f"❌ 백그라운드 전송 오류: {str(e)}")
+                    ok = False
+
+                with self.lock:
+                    if ok is False:
+                        self.failed += 1
+                    else:
+                        self.delivered += 1
+                    self.latencies.append(time.perf_counter() - enqueued_at)
+            finally:
+                self.queue.task_done()
+
+    def depth(self):
+        """현재 대기 중인 전송 요청 수"""
+        return self.queue.qsize()
+
+    def flush(self):
+        """큐에 쌓인 전송이 모두 끝날 때까지 대기 (작업 스레드는 유지)"""
+        self.queue.join()
+
+    def close(self, timeout=60):
+        """남은 전송을 모두 처리한 뒤 작업 스레드 종료"""
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def stats(self):
+        with self.lock:
+            ordered = sorted(self.latencies)
+        return {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "latency_avg_s": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "latency_p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2) if ordered else 0.0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(f"📬 전송 큐: 대기 {stats['depth']}건 (최대 {stats['max_depth']}건), "
+              f"전달 {stats['delivered']}/{stats['submitted']}건, 실패 {stats['failed']}건, "
+              f"지연 평균 {stats['latency_avg_s']}s / p95 {stats['latency_p95_s']}s")
+
+
+def build_notification_queue(config, sender):
+    """config.ini [NOTIFY_QUEUE] 설정으로 큐 생성 (비활성화 시 None)"""
+    if not config.getboolean('NOTIFY_QUEUE', 'ENABLED', fallback=True):
+        return None
+    return NotificationQueue(
+        sender,
+        maxsize=config.getint('NOTIFY_QUEUE', 'MAXSIZE', fallback=200),
+        workers=config.getint('NOTIFY_QUEUE', 'WORKERS', fallback=2)
+    )
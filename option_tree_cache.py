@@ -0,0 +1,103 @@
+import json
+import os
+import time
+
+
+class OptionTreeCache:
+    """지역 → 휴양림 → 숙박시설 옵션 트리 디스크 캐시 (TTL + 간단 검증)"""
+
+    def __init__(self, path='option_tree_cache.json', ttl_hours=24, validate_sample=True):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.validate_sample = validate_sample  # 지역 1곳의 휴양림 목록 실측 비교 여부
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self):
+        """캐시 로드 (없거나 TTL 만료 시 None)"""
+        cached = self._read()
+        if cached is None:
+            return None
+
+        age = time.time() - cached.get('saved_at', 0)
+        if age > self.ttl_seconds:
+            print(f"⌛ 옵션 트리 캐시 만료 ({age / 3600:.1f}시간 경과)")
+            return None
+        return cached['regions']
+
+    def save(self, regions, saved_at=None):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': saved_at or time.time(), 'regions': regions}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def invalidate(self):
+        """캐시 삭제 (다음 실행에서 재수집)"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def invalidate_region(self, region_code):
+        """지역 1곳만 무효 표시 (다음 실행에서 해당 지역 하위 트리만 재수집, 나머지 지역과 TTL은 유지)"""
+        cached = self._read()
+        if cached is None:
+            return
+        for region in cached['regions']:
+            if region['value'] == region_code:
+                region['stale'] = True
+        self.save(cached['regions'], cached.get('saved_at'))
+
+    def build_region(self, system, region_option):
+        """지역 1곳의 휴양림 → 숙박시설 옵션 수집"""
+        system.smart_select('#srchSido', region_option['value'], 'value')
+        forests = []
+        for forest_option in system.get_select_options('#srchInstt'):
+            system.smart_select('#srchInstt', forest_option['value'], 'value')
+            forests.append(dict(forest_option, accommodations=system.get_select_options('#srchForest')))
+        print(f"  🌲 {region_option['text']}: 휴양림 {len(forests)}개")
+        return dict(region_option, forests=forests)
+
+    def build(self, system):
+        """select 연쇄를 따라가며 전체 옵션 트리 수집"""
+        return [self.build_region(system, region_option) for region_option in system.get_select_options('#srchSido')]
+
+    def is_valid(self, system, regions, region_options):
+        """현재 지역 목록 비교 + (옵션) 지역 1곳 휴양림 목록 실측 비교"""
+        cached_regions = [(r['value'], r['text']) for r in regions]
+        if cached_regions != [(r['value'], r['text']) for r in region_options]:
+            return False
+
+        if self.validate_sample and regions:
+            # 날짜별로 다른 지역을 골라 점검
+            sample = regions[int(time.time() // 86400) % len(regions)]
+            system.smart_select('#srchSido', sample['value'], 'value')
+            live_forests = [(f['value'], f['text']) for f in system.get_select_options('#srchInstt')]
+            if live_forests != [(f['value'], f['text']) for f in sample['forests']]:
+                print(f"⚠️ {sample['text']} 휴양림 목록 변경 감지")
+                return False
+        return True
+
+    def get_tree(self, system, region_options, force_refresh=False):
+        """캐시된 옵션 트리 반환, 없거나 무효/강제 갱신이면 재수집"""
+        regions = None if force_refresh else self.load()
+        if regions is not None and self.is_valid(system, regions, region_options):
+            stale = [region for region in regions if region.get('stale')]
+            if stale:
+                # 조합 실패로 무효 표시된 지역만 다시 수집
+                print(f"🔄 옵션 트리 일부 재수집: {', '.join(region['text'] for region in stale)}")
+                options = {option['value']: option for option in region_options}
+                regions = [self.build_region(system, options[region['value']]) if region.get('stale') else region
+                           for region in regions]
+                self.save(regions, self._read()['saved_at'])  # 나머지 지역의 TTL은 그대로
+            print(f"🗂️ 옵션 트리 캐시 사용: 지역 {len(regions)}개")
+            return regions
+
+        print("🔄 옵션 트리 수집 중...")
+        regions = self.build(system)
+        self.save(regions)
+        print(f"💾 옵션 트리 저장 완료: {self.path}")
+        return regions
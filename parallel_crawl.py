@@ -0,0 +1,262 @@
+from playwright.sync_api import Error as PlaywrightError
+from collections import Counter
+import time
+from cascade_wait import CASCADE_DEPENDENCIES, MARK_STALE_JS, READY_JS
+from crawl_planner import combo_context, combo_key
+from forest_headless_reservation import ForestReservationSystem
+
+# 검색 직전 기존 결과 테이블 표시
+MARK_SEARCH_STALE_JS = """() => {
+    const tbody = document.querySelector('#dayListTbody');
+    if (!tbody) return;
+    tbody.__searchStale = true;
+    Array.from(tbody.rows).forEach(r => { r.__searchStale = true; });
+}"""
+
+# 새 결과 테이블이 그려지고 AJAX가 끝났는지 확인
+SEARCH_READY_JS = """() => {
+    const ajaxIdle = !window.jQuery || window.jQuery.active === 0;
+    const table = document.querySelector('#dayListTable');
+    const tbody = document.querySelector('#dayListTbody');
+    if (document.readyState !== 'complete' || !ajaxIdle || !table || !tbody) return false;
+    if (!table.offsetParent && table.getClientRects().length === 0) return false;
+    return !tbody.__searchStale || Array.from(tbody.rows).some(r => !r.__searchStale);
+}"""
+
+
+class PendingWait:
+    """페이지 하나의 서버 응답 대기 조건 (폴링 방식)"""
+
+    def __init__(self, page, js, arg=None, timeout=10000, label=''):
+        self.page = page
+        self.js = js
+        self.arg = arg
+        self.label = label
+        self.started = time.perf_counter()
+        self.deadline = self.started + timeout / 1000
+
+    def poll(self):
+        """조건 충족 또는 시간 초과 시 True"""
+        try:
+            if self.page.evaluate(self.js, self.arg):
+                return True
+        except PlaywrightError:
+            pass  # 페이지 이동 중에는 평가 불가 → 다음 폴링에서 재확인
+
+        if time.perf_counter() > self.deadline:
+            print(f"⚠️ {self.label} 대기 시간 초과, 다음 단계 진행")
+            return True
+        return False
+
+
+class ShardCrawler:
+    """페이지 1개가 담당하는 조합 묶음(지역 단위)을 단계별로 진행하는 작업자"""
+
+    def __init__(self, system, page, groups, shard_no):
+        self.system = system  # 결과/전송/대기 통계를 공유하는 메인 시스템
+        self.page = page
+        self.groups = groups  # [(지역 코드, 계획된 조합 목록)]
+        self.shard_no = shard_no
+        self.pending = None
+        self.total = 0
+        self.processed = 0
+        self.failed = 0
+        self.finished_regions = []  # 순회를 마친 묶음의 지역 코드 (ParallelCrawler가 꺼내 지역 전송 판단)
+        self.max_attempts = system.max_retries + 1
+
+        # 페이지 전용 헬퍼 (옵션 조회/결과 추출), 결과/전송은 메인 시스템과 공유
+        self.worker = ForestReservationSystem(page, parent=system)
+        self.steps = self._steps()
+
+    def _select(self, selector, value, select_by='value'):
+        self.page.evaluate(MARK_STALE_JS, CASCADE_DEPENDENCIES.get(selector))
+
+        if select_by == 'index':
+            self.page.select_option(selector, index=value)
+        else:
+            self.page.select_option(selector, value=str(value))
+
+        waiter = self.system.cascade_waiter
+        wait = PendingWait(self.page, READY_JS, waiter.ready_args(selector), waiter.timeout,
+                           f"[페이지 {self.shard_no}] {selector}")
+        yield wait
+        waiter.record(selector, (time.perf_counter() - wait.started) * 1000)
+
+    def _search(self, timeout):
+        self.page.evaluate(MARK_SEARCH_STALE_JS)
+        self.page.click('#searchBtn')
+        yield PendingWait(self.page, SEARCH_READY_JS, timeout=timeout,
+                          label=f"[페이지 {self.shard_no}] 검색 결과")
+
+    def _select_path(self, path, state):
+        """[(selector, value)] 경로 중 현재 선택과 다른 단계부터 다시 선택"""
+        for i, (selector, value) in enumerate(path):
+            if state.get(selector) == value:
+                continue
+            for lower, _ in path[i:]:
+                state.pop(lower, None)  # 상위 선택이 바뀌면 하위 선택도 초기화됨
+            yield from self._select(selector, value)
+            state[selector] = value
+
+    def _recover(self, label, attempt, error, state):
+        """실패한 단계 보고 후 페이지 새로고침 (다음 시도는 월부터 다시 선택)"""
+        print(f"        ⚠️ [페이지 {self.shard_no}] {label} 실패 (시도 {attempt}/{self.max_attempts}): {error}")
+        state.clear()
+        if attempt < self.max_attempts:
+            self.worker.recover_page()
+        else:
+            try:
+                self.page.screenshot(path=f'parallel_error_{self.shard_no}.png')
+            except Exception:
+                pass
+
+    def _scrape(self, combo, context_info, path, state, search_timeout):
+        """숙박시설 1개 선택 → 검색 → 스크래핑 (실패 시 새로고침 후 재시도, 끝내 실패하면 조합 실패로 기록)"""
+        self.total += 1
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                yield from self._select_path(path, state)
+                yield from self._select('#srchForest2', 0, 'index')
+                yield from self._search(search_timeout)
+                result = self.worker.scrape_current_results(context_info)
+            except Exception as e:
+                error = str(e)
+                self._recover(f"{context_info['forest']} / {context_info['accommodation']}", attempt, error, state)
+                continue
+            self.processed += self.worker.finish_combination(combo, result, attempt)
+            return
+
+        self.failed += 1
+        # 캐시와 실제 옵션이 달랐을 수 있음 → 다음 실행에서 해당 지역 트리만 재수집
+        self.system.option_tree_cache.invalidate_region(combo['region']['value'])
+        if self.system.checkpoint:
+            self.system.checkpoint.mark_failed(combo_key(combo), context_info, self.max_attempts, error)
+
+    def _steps(self):
+        search_timeout = self.system.config.getint('PARALLEL', 'SEARCH_TIMEOUT', fallback=50000)
+        state = {}  # 현재 선택된 select 값
+
+        for region_code, combos in self.groups:
+            for combo in combos:
+                context_info = combo_context(combo)
+                print(f"      🏘️ [페이지 {self.shard_no}] {context_info['month']} / {context_info['region']} / "
+                      f"{context_info['forest']} / {context_info['accommodation']}")
+                path = [('#monthSelectBox', combo['month']['value']),
+                        ('#srchSido', region_code),
+                        ('#srchInstt', combo['forest']['value']),
+                        ('#srchForest', combo['accommodation']['value'])]
+                yield from self._scrape(combo, context_info, path, state, search_timeout)
+
+            self.finished_regions.append(region_code)
+
+
+class ParallelCrawler:
+    """로그인된 컨텍스트의 페이지 N개로 계획된 조합을 지역 단위 묶음으로 나눠 동시 진행"""
+
+    def __init__(self, system, page_count=None):
+        self.system = system
+        config = system.config
+        self.page_count = page_count or config.getint('PARALLEL', 'PAGES', fallback=3)
+        # 동시에 서버 응답을 기다리는 페이지 수 상한 / 요청 간 최소 간격
+        self.max_in_flight = config.getint('PARALLEL', 'MAX_IN_FLIGHT', fallback=self.page_count)
+        self.request_interval = config.getint('PARALLEL', 'REQUEST_INTERVAL_MS', fallback=200) / 1000
+        self.poll_ms = config.getint('PARALLEL', 'POLL_MS', fallback=100)
+
+    def _open_pages(self):
+        main_page = self.system.page
+        pages = [main_page]
+        for _ in range(self.page_count - 1):
+            page = main_page.context.new_page()
+            page.goto(main_page.url, timeout=60000)
+            page.wait_for_load_state('networkidle')
+            pages.append(page)
+        return pages
+
+    def _flush_finished_regions(self, crawler, remaining):
+        """모든 페이지에서 해당 지역의 묶음이 끝나면 지역 묶음 전송"""
+        while crawler.finished_regions:
+            region_code = crawler.finished_regions.pop()
+            remaining[region_code] -= 1
+            if remaining[region_code] == 0:
+                self.system.flush_region_messages(region_code)
+
+    def _group(self, combos):
+        """조합을 페이지에 나눌 묶음으로: accommodation_first면 지역 단위 (월만 바꾸는 순서 유지), 아니면 (월, 지역) 단위"""
+        groups = {}
+        for combo in combos:
+            key = (combo['region']['value'],)
+            if self.system.loop_order != 'accommodation_first':
+                key = (combo['month']['value'],) + key
+            groups.setdefault(key, []).append(combo)
+        return [(key[-1], group) for key, group in groups.items()]
+
+    def run(self, force_refresh=False, resume=False, watch=False):
+        """ForestReservationSystem과 같은 계획(옵션 트리 캐시/관심 조건/LOOP_ORDER)과 체크포인트로 병렬 진행"""
+        system = self.system
+        system.page.wait_for_load_state('networkidle')
+        if system.resource_router:
+            system.resource_router.reset_stats()
+
+        combos = system.plan_run(force_refresh, watch)
+        completed = system.start_checkpoint(resume)
+        groups = self._group([combo for combo in combos if combo_key(combo) not in completed])
+        page_count = max(1, min(self.page_count, len(groups)))
+        self.page_count = page_count
+        print(f"🧵 병렬 스크래핑: 페이지 {page_count}개, 조합 묶음 {len(groups)}개, "
+              f"동시 요청 상한 {self.max_in_flight}")
+
+        pages = self._open_pages()
+        crawlers = [ShardCrawler(system, page, groups[i::page_count], i + 1) for i, page in enumerate(pages)]
+
+        active = list(crawlers)
+        remaining = Counter(region_code for region_code, _ in groups)  # 지역별 남은 묶음 수
+        failed = 0
+        last_request = 0.0
+
+        try:
+            while active:
+                progressed = False
+                for crawler in list(active):
+                    if crawler.pending is not None:
+                        if not crawler.pending.poll():
+                            continue
+                        crawler.pending = None
+
+                    # 새 요청 발생 전 동시 요청 수 / 요청 간격 제한
+                    in_flight = sum(1 for c in active if c.pending is not None)
+                    if in_flight >= self.max_in_flight or time.perf_counter() - last_request < self.request_interval:
+                        continue
+
+                    try:
+                        crawler.pending = next(crawler.steps)
+                        last_request = time.perf_counter()
+                    except StopIteration:
+                        active.remove(crawler)
+                    except Exception as e:
+                        # 조합 단위 재시도 밖에서 난 예외 (정상 흐름에서는 발생하지 않음)
+                        print(f"❌ [페이지 {crawler.shard_no}] 작업 중단: {str(e)}")
+                        active.remove(crawler)
+                        failed += 1
+                    self._flush_finished_regions(crawler, remaining)
+                    progressed = True
+
+                system.flush_due_regions()
+                if not progressed:
+                    system.page.wait_for_timeout(self.poll_ms)
+        finally:
+            for page in pages[1:]:
+                page.close()
+
+        processed = sum(c.processed for c in crawlers)
+        print(f"\n🎉 병렬 전수 스크래핑 완료!")
+        print(f"📊 총 조합 수: {sum(c.total for c in crawlers)}")
+        print(f"📈 데이터 수집 성공: {processed}")
+        print(f"🚫 재시도 후 실패: {sum(c.failed for c in crawlers)}")
+        if failed:
+            print(f"⚠️ 중단된 페이지: {failed}개")
+        system.cascade_waiter.report()
+        if system.checkpoint:
+            system.checkpoint.report()
+        system.flush_notifications()
+
+        return system.collected_results()
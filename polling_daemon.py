@@ -0,0 +1,260 @@
+from datetime import date, timedelta
+import calendar
+import heapq
+import json
+import time
+from crawl_planner import combo_context, combo_key, parse_month
+from metrics import metrics
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _percentile(ordered, ratio):
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 1) if ordered else 0.0
+
+
+class PollPolicy:
+    """조합별 재방문 간격: 가까운 달, 다가오는 주말, 인기 휴양림일수록 짧게"""
+
+    def __init__(self, base_minutes=60, min_minutes=5, month_factors=(0.25, 0.5, 1.0, 2.0),
+                 weekend_days=14, weekend_factor=0.5, high_demand=(), high_demand_factor=0.5):
+        self.base_seconds = base_minutes * 60
+        self.min_seconds = min_minutes * 60
+        self.month_factors = list(month_factors)  # 이번 달, 다음 달, ... (마지막 값은 그 이후 전부)
+        self.weekend_days = weekend_days
+        self.weekend_factor = weekend_factor
+        self.high_demand = list(high_demand)
+        self.high_demand_factor = high_demand_factor
+
+    def _has_near_weekend(self, year, month, today):
+        """해당 월에 weekend_days 이내의 금/토요일 숙박일이 있는지"""
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        day = max(today, date(year, month, 1))
+        end = min(last_day, today + timedelta(days=self.weekend_days))
+        while day <= end:
+            if day.weekday() in (4, 5):
+                return True
+            day += timedelta(days=1)
+        return False
+
+    def interval(self, combo, today=None):
+        """조합의 목표 재방문 간격(초)"""
+        today = today or date.today()
+        factor = 1.0
+
+        parsed = parse_month(combo['month'])
+        if parsed:
+            year, month = parsed
+            months_ahead = max(0, (year - today.year) * 12 + month - today.month)
+            factor *= self.month_factors[min(months_ahead, len(self.month_factors) - 1)]
+            if self._has_near_weekend(year, month, today):
+                factor *= self.weekend_factor
+
+        forest = combo['forest']['text']
+        if any(name in forest for name in self.high_demand):
+            factor *= self.high_demand_factor
+
+        return max(self.min_seconds, self.base_seconds * factor)
+
+
+class PollScheduler:
+    """heapq 기반 우선순위 스케줄러: 예정 시각이 가장 이른 조합부터 꺼냄"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.heap = []  # (예정 시각, 순번, key)
+        self.targets = {}  # key -> {'combo', 'interval', 'due', 'last_visit', 'visits', 'revisits': [...]}
+        self.seq = 0
+        self.lags = []  # 예정 시각 대비 실제 시작 지연(초)
+
+    def _push(self, key, due):
+        self.seq += 1
+        heapq.heappush(self.heap, (due, self.seq, key))
+
+    def load(self, combos, now=None):
+        """조합 목록 반영 (기존 조합의 방문 기록 유지, 사라진 조합 제거, 새 조합은 즉시 예정)"""
+        now = now if now is not None else time.time()
+        keys = set()
+        for combo in combos:
+            key = combo_key(combo)
+            keys.add(key)
+            interval = self.policy.interval(combo)
+            target = self.targets.get(key)
+            if target is None:
+                self.targets[key] = {'combo': combo, 'interval': interval, 'due': now,
+                                     'last_visit': None, 'visits': 0, 'revisits': []}
+            else:
+                target.update(combo=combo, interval=interval)
+
+        for key in list(self.targets):
+            if key not in keys:
+                del self.targets[key]
+
+        # 예정 시각 기준으로 힙 재구성
+        self.heap = []
+        for key, target in self.targets.items():
+            self._push(key, target['due'])
+
+    def next_due(self):
+        """다음 조합 → (key, 예정 시각), 조합이 없으면 None"""
+        while self.heap:
+            due, _, key = self.heap[0]
+            target = self.targets.get(key)
+            if target is None or target['due'] != due:
+                heapq.heappop(self.heap)  # 제거되었거나 재예약된 항목
+                continue
+            return key, due
+        return None
+
+    def start(self, key, now=None):
+        """조합 처리 시작 기록 (예정 대비 지연 측정)"""
+        now = now if now is not None else time.time()
+        heapq.heappop(self.heap)
+        target = self.targets[key]
+        self.lags.append(max(0.0, now - target['due']))
+        if len(self.lags) > 10000:
+            del self.lags[:5000]
+        if target['last_visit'] is not None:
+            target['revisits'].append(now - target['last_visit'])
+            del target['revisits'][:-20]
+        target['last_visit'] = now
+        target['visits'] += 1
+        return target['combo']
+
+    def finish(self, key, now=None):
+        """처리 완료 → 간격만큼 뒤로 재예약"""
+        now = now if now is not None else time.time()
+        target = self.targets[key]
+        target['due'] = now + target['interval']
+        self._push(key, target['due'])
+
+    def stats(self):
+        ordered = sorted(self.lags)
+        targets = []
+        for key, target in self.targets.items():
+            revisits = target['revisits']
+            targets.append({
+                'key': key,
+                'context': combo_context(target['combo']),
+                'interval_s': round(target['interval']),
+                'visits': target['visits'],
+                'revisit_avg_s': round(sum(revisits) / len(revisits)) if revisits else None,
+                'due_in_s': round(target['due'] - time.time()),
+            })
+        targets.sort(key=lambda t: t['interval_s'])
+        return {
+            'targets': len(self.targets),
+            'lag_p50_s': _percentile(ordered, 0.50),
+            'lag_p95_s': _percentile(ordered, 0.95),
+            'lag_max_s': round(ordered[-1], 1) if ordered else 0.0,
+            'per_target': targets,
+        }
+
+
+class PollingDaemon:
+    """로그인된 브라우저를 유지하며 우선순위에 따라 조합을 계속 스크래핑"""
+
+    def __init__(self, system):
+        self.system = system
+        config = system.config
+        self.scheduler = PollScheduler(PollPolicy(
+            base_minutes=config.getfloat('DAEMON', 'BASE_MINUTES', fallback=60),
+            min_minutes=config.getfloat('DAEMON', 'MIN_MINUTES', fallback=5),
+            month_factors=[float(v) for v in _split(config.get('DAEMON', 'MONTH_FACTORS', fallback='0.25,0.5,1,2'))],
+            weekend_days=config.getint('DAEMON', 'WEEKEND_DAYS', fallback=14),
+            weekend_factor=config.getfloat('DAEMON', 'WEEKEND_FACTOR', fallback=0.5),
+            high_demand=_split(config.get('DAEMON', 'HIGH_DEMAND_FORESTS', fallback='')),
+            high_demand_factor=config.getfloat('DAEMON', 'HIGH_DEMAND_FACTOR', fallback=0.5)
+        ))
+        self.replan_seconds = config.getfloat('DAEMON', 'REPLAN_HOURS', fallback=6) * 3600
+        self.report_seconds = config.getfloat('DAEMON', 'REPORT_MINUTES', fallback=10) * 60
+        self.status_path = config.get('DAEMON', 'STATUS_PATH', fallback='daemon_status.json')
+        self.max_failures = config.getint('DAEMON', 'MAX_CONSECUTIVE_FAILURES', fallback=10)
+        self.idle_poll_ms = 30000  # 대기 중 페이지 이벤트 처리 간격
+
+    def plan(self, force_refresh=False, watch=False):
+        """월/옵션 트리를 다시 읽어 스케줄 대상 갱신 (월이 바뀌면 새 달 추가)"""
+        system = self.system
+        month_options = system.get_select_options('#monthSelectBox')
+        region_options = system.get_select_options('#srchSido')
+        regions = system.option_tree_cache.get_tree(system, region_options, force_refresh)
+        combos = system.plan_crawl(month_options, regions, watch)
+        self.scheduler.load(combos)
+        print(f"🗓️ 폴링 대상 {len(combos)}개 조합 예약 (월 {len(month_options)}개)")
+
+    def idle_until(self, due):
+        """다음 예정 시각까지 대기 (모아둔 알림 전송, 브라우저 이벤트 처리 유지)"""
+        if due > time.time():
+            self.system.flush_region_messages()
+        while True:
+            remaining = due - time.time()
+            if remaining <= 0:
+                return
+            self.system.page.wait_for_timeout(min(remaining * 1000, self.idle_poll_ms))
+
+    def write_status(self):
+        stats = self.scheduler.stats()
+        with open(self.status_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(stats, updated_at=time.time()), f, ensure_ascii=False, indent=2)
+        print(f"📈 스케줄: 대상 {stats['targets']}개, 지연 p50 {stats['lag_p50_s']}s / "
+              f"p95 {stats['lag_p95_s']}s / 최대 {stats['lag_max_s']}s ({self.status_path})")
+
+    def run(self, force_refresh=False, watch=False):
+        system = self.system
+        system.page.wait_for_load_state('networkidle')
+        self.plan(force_refresh, watch)
+        planned_at = reported_at = time.time()
+        state = {}
+        failures = 0
+
+        try:
+            while True:
+                if time.time() - planned_at >= self.replan_seconds:
+                    self.plan(watch=watch)
+                    planned_at = time.time()
+                    state.clear()
+
+                if time.time() - reported_at >= self.report_seconds:
+                    self.write_status()
+                    system.telegram_sender.rate_limiter.report()
+                    reported_at = time.time()
+
+                next_item = self.scheduler.next_due()
+                if next_item is None:
+                    print("⚠️ 폴링 대상이 없습니다")
+                    return
+                key, due = next_item
+                self.idle_until(due)
+
+                combo = self.scheduler.start(key)
+                context_info = combo_context(combo)
+                system.metric_labels = {'region': context_info['region'], 'forest': context_info['forest']}
+                print(f"🔁 {context_info['month']} / {context_info['region']} / "
+                      f"{context_info['forest']} / {context_info['accommodation']}")
+
+                result, attempts = system.scrape_combination(combo, context_info, state)
+                self.scheduler.finish(key)
+
+                if attempts is None:
+                    failures += 1
+                    if failures >= self.max_failures:
+                        raise RuntimeError(f"연속 {failures}회 실패 (세션 만료 가능성)")
+                    continue
+                failures = 0
+
+                if result and result["data"]:
+                    system.record_result(result)
+                    with metrics.span('notify', **system.metric_labels):
+                        system.notify_result(context_info, result["data"], combo.get('watch'))
+                elif result:
+                    system.record_state(result)  # 모두 마감된 숙박시설/월도 DB/조회 API에 반영
+                    system.notify_result(context_info, [])  # 스냅샷도 비워야 다시 열릴 때 알림
+
+        except KeyboardInterrupt:
+            print("\n⏹️ 데몬 종료 요청")
+        finally:
+            self.write_status()
+            system.flush_notifications()
+            metrics.report(system.config.get('METRICS', 'JSON_PATH', fallback='') or None)
@@ -0,0 +1,254 @@
+from collections import OrderedDict
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from availability_matrix import OPEN, WAITING, status_code
+from watch_list import parse_date
+
+# status 필터 → 포함할 상태 코드
+STATUS_FILTERS = {
+    'available': (OPEN, WAITING),
+    'open': (OPEN,),
+    'waiting': (WAITING,),
+}
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+KEEP_ALIVE_SECONDS = 30
+
+
+class AvailabilityReadAPI:
+    """크롤러가 기록한 최신 예약 현황을 메모리에서 제공하는 읽기 전용 HTTP API (asyncio, 별도 스레드)
+
+    GET /availability?region=1&forest=유명산&from=2025-07-01&to=2025-07-31&status=open
+    GET /health
+    응답 본문마다 ETag (If-None-Match 일치 시 304), 숙박시설별 updated_at(마지막 수집)/changed_at(마지막 변경)
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, body_cache_size=256):
+        self.host = host
+        self.port = port
+        self.lock = threading.Lock()
+        self.entries = {}  # (region_code, forest, accommodation, month) → 숙박시설 1곳의 최신 결과
+        self.version = 0  # 결과가 들어올 때마다 증가 (응답 본문 캐시 키)
+        self.body_cache = OrderedDict()  # (version, 정규화된 질의) → (ETag, 본문)
+        self.body_cache_size = body_cache_size
+        self.requests = 0
+        self.not_modified = 0
+        self.loop = None
+        self.stopping = None  # stop() 요청 시 설정 (이벤트 루프 안에서 종료 절차 진행)
+        self.server = None
+        self.connections = {}  # 열린 연결 writer → 처리 task (종료 시 keep-alive 연결까지 닫음)
+        self.error = None
+        self.thread = None
+
+    # --- 크롤러 측 ---
+    def update(self, result):
+        """스크래핑 결과 1건 반영 (데이터가 없는 결과는 '예약 가능 일자 없음'으로 반영)"""
+        context_info = result['context']
+        key = (context_info['region_code'], context_info['forest'], context_info['accommodation'],
+               context_info['month'])
+        facilities = []
+        for facility in result['data']:
+            dates = []
+            for entry in facility['dates']:
+                day = parse_date(entry['date'])
+                dates.append({'date': day.isoformat() if day else entry['date'], 'status': entry['status'],
+                              'code': status_code(entry['status'])})
+            facilities.append({'name': facility['name'], 'dates': dates})
+
+        now = time.time()
+        with self.lock:
+            previous = self.entries.get(key)
+            changed_at = previous['changed_at'] if previous and previous['facilities'] == facilities else now
+            self.entries[key] = {
+                'region': context_info['region'],
+                'region_code': context_info['region_code'],
+                'forest': context_info['forest'],
+                'accommodation': context_info['accommodation'],
+                'month': context_info['month'],
+                'updated_at': now,
+                'changed_at': changed_at,
+                'facilities': facilities,
+            }
+            self.version += 1
+
+    # --- 조회 ---
+    def select(self, region=None, forest=None, date_from=None, date_to=None, status='available'):
+        """필터에 맞는 숙박시설별 결과 (일자 필터 후 남은 일자가 없는 시설 제외, 숙박시설은 최신성 확인용으로 유지)"""
+        codes = STATUS_FILTERS[status]
+        with self.lock:
+            entries = list(self.entries.values())
+
+        selected = []
+        for entry in entries:
+            if region and region not in (entry['region_code'], entry['region']):
+                continue
+            if forest and forest not in entry['forest']:
+                continue
+            facilities = []
+            for facility in entry['facilities']:
+                dates = [
+                    {'date': d['date'], 'status': d['status']} for d in facility['dates']
+                    if d['code'] in codes and (not date_from or d['date'] >= date_from)
+                    and (not date_to or d['date'] <= date_to)
+                ]
+                if dates:
+                    facilities.append({'name': facility['name'], 'dates': dates})
+            selected.append(dict(entry, facilities=facilities))
+
+        selected.sort(key=lambda e: (e['region_code'], e['forest'], e['accommodation'], e['month']))
+        return selected
+
+    def _availability_body(self, query):
+        params = {name: values[0] for name, values in parse_qs(query).items()}
+        status = params.get('status', 'available')
+        if status not in STATUS_FILTERS:
+            raise ValueError(f"status는 {', '.join(STATUS_FILTERS)} 중 하나여야 합니다")
+        date_from, date_to = params.get('from'), params.get('to')
+        if params.get('date'):
+            date_from = date_to = params['date']
+        date_from = parse_date(date_from).isoformat() if date_from and parse_date(date_from) else date_from
+        date_to = parse_date(date_to).isoformat() if date_to and parse_date(date_to) else date_to
+
+        entries = self.select(params.get('region'), params.get('forest'), date_from, date_to, status)
+        return {'accommodations': entries, 'count': len(entries)}
+
+    def _render(self, path, query):
+        """(version, 경로, 질의)별로 본문/ETag를 한 번만 만들고 재사용 → (ETag, 본문 bytes)"""
+        with self.lock:
+            version = self.version
+        cache_key = (version, path, '&'.join(sorted(query.split('&'))))
+        cached = self.body_cache.get(cache_key)
+        if cached is not None:
+            self.body_cache.move_to_end(cache_key)
+            return cached
+
+        if path == '/availability':
+            payload = self._availability_body(query)
+        else:
+            with self.lock:
+                updated = [entry['updated_at'] for entry in self.entries.values()]
+            payload = {'accommodations': len(updated), 'last_update': max(updated) if updated else None,
+                       'oldest_update': min(updated) if updated else None}
+
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.body_cache[cache_key] = (etag, body)
+        if len(self.body_cache) > self.body_cache_size:
+            self.body_cache.popitem(last=False)
+        return etag, body
+
+    def respond(self, method, target, headers):
+        """요청 1건 → (상태 코드, 추가 헤더, 본문)"""
+        self.requests += 1
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b''
+        parts = urlsplit(target)
+        if parts.path not in ('/availability', '/health'):
+            return 404, {}, b''
+
+        try:
+            etag, body = self._render(parts.path, parts.query)
+        except ValueError as e:
+            return 400, {}, json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+
+        extra = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+            self.not_modified += 1
+            return 304, extra, b''
+        return 200, extra, body
+
+    # --- HTTP 서버 (asyncio streams, keep-alive) ---
+    async def _handle(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                status, extra, body = self.respond(method, target, headers)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = [
+                    f"HTTP/1.1 {status} {REASONS[status]}",
+                    f"Date: {formatdate(usegmt=True)}",
+                    "Content-Type: application/json; charset=utf-8",
+                    f"Content-Length: {len(body)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ] + [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    async def _shutdown(self):
+        """새 연결 수신 중단 → 대기 중인 keep-alive 연결 종료 → 처리 중인 요청 마무리 대기"""
+        self.server.close()
+        handlers = list(self.connections.values())
+        for writer in list(self.connections):
+            writer.close()  # readline 대기 중인 핸들러는 EOF를 받고 종료
+        if handlers:
+            await asyncio.wait(handlers, timeout=5)
+        await self.server.wait_closed()
+
+    async def _serve(self, ready):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        try:
+            self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            self.error = e
+            return
+        finally:
+            ready.set()
+        await self.stopping.wait()
+        await self._shutdown()
+
+    def start(self):
+        """백그라운드 스레드에서 이벤트 루프 실행 (크롤러는 update만 호출), 포트를 열지 못하면 None"""
+        ready = threading.Event()
+        self.thread = threading.Thread(target=asyncio.run, args=(self._serve(ready),), name='read-api', daemon=True)
+        self.thread.start()
+        ready.wait(10)
+        if self.server is None:
+            # --workers 작업자 프로세스 등: 같은 포트는 조정자(메인 프로세스)가 이미 사용 중
+            print(f"⚠️ 조회 API 시작 안 함 ({self.host}:{self.port}): {self.error}")
+            return None
+        print(f"📡 예약 현황 조회 API: http://{self.host}:{self.port}/availability")
+        return self
+
+    def stop(self):
+        """서버와 열린 연결을 닫고 이벤트 루프 스레드 종료까지 대기"""
+        if self.loop and self.server and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.stopping.set)
+            self.thread.join(10)
+        print(f"📡 조회 API: 요청 {self.requests}건 (304 {self.not_modified}건), 숙박시설 {len(self.entries)}곳")
+
+
+def build_read_api(config):
+    """config.ini [READ_API] 설정으로 조회 API 시작 (비활성화 시 None)"""
+    if not config.getboolean('READ_API', 'ENABLED', fallback=False):
+        return None
+    return AvailabilityReadAPI(
+        host=config.get('READ_API', 'HOST', fallback='127.0.0.1'),
+        port=config.getint('READ_API', 'PORT', fallback=8765),
+        body_cache_size=config.getint('READ_API', 'BODY_CACHE_SIZE', fallback=256)
+    ).start()
@@ -1,7 +1,20 @@
-import requests
 import configparser
+import threading
 import time
 import html
+from functools import partial
+from http_pool import build_session
+from metrics import metrics
+from telegram_rate_limiter import TelegramRateLimiter
+
+
+# 버퍼에서 같은 검색 결과로 보는 범위 (스냅샷 비교 범위와 동일)
+SCOPE_KEYS = ('region_code', 'forest', 'accommodation', 'month')
+
+
+def _call_all(callbacks):
+    for callback in callbacks:
+        callback()
 
 
 class RegionalTelegramSender:
@@ -9,6 +22,8 @@ class RegionalTelegramSender:
         self.config = configparser.ConfigParser()
         self.config.read('config.ini', encoding='utf-8')
         self.token = self.config.get('TELEGRAM', 'TOKEN')
+        # 텔레그램 API 주소 (벤치마크 시 로컬 스텁으로 교체 가능)
+        self.api_base = self.config.get('TELEGRAM', 'API_BASE', fallback='https://api.telegram.org').rstrip('/')
 
         # 지역별 chat_id 매핑
         self.region_chat_ids = {}
@@ -18,6 +33,26 @@ class RegionalTelegramSender:
             self.region_chat_ids[region_code] = self.config.get('REGION_CHAT_IDS', region_code)
             self.region_names[region_code] = self.config.get('REGION_NAMES', region_code)
 
+        # 채팅방별/봇 전체 전송 한도 (텔레그램 기본: 그룹 20건/분, 봇 30건/초)
+        self.rate_limiter = TelegramRateLimiter(
+            global_per_sec=self.config.getint('TELEGRAM_LIMITS', 'GLOBAL_PER_SEC', fallback=30),
+            chat_per_min=self.config.getint('TELEGRAM_LIMITS', 'CHAT_PER_MIN', fallback=20),
+            chat_burst=self.config.getint('TELEGRAM_LIMITS', 'CHAT_BURST', fallback=1)
+        )
+        self.max_429_retries = self.config.getint('TELEGRAM_LIMITS', 'MAX_429_RETRIES', fallback=5)
+
+        # api.telegram.org keep-alive 커넥션 재사용 (요청마다 TLS 핸드셰이크 방지)
+        self.session = build_session(self.config, 'telegram')
+
+        # 지역별 결과 묶음 전송 (숙박시설마다 따로 보내지 않고 창 시간/지역 순회 단위로 모음)
+        self.coalesce = self.config.getboolean('TELEGRAM_COALESCE', 'ENABLED', fallback=True)
+        self.coalesce_window = self.config.getfloat('TELEGRAM_COALESCE', 'WINDOW_SECONDS', fallback=300)
+        self.buffer_lock = threading.Lock()
+        # region_code -> {'started': 시각, 'sections': [(context_info, result_data)], 'on_sent': {범위: 전송 후 호출}}
+        self.buffers = {}
+        self.coalesced_results = 0  # 묶음에 포함된 숙박시설 결과 수
+        self.coalesced_messages = 0  # 묶음 전송으로 실제 보낸 메시지 수
+
     def _format_facility(self, facility):
         """시설 정보 포맷팅 (UTF-8 바이트 기반)"""
         safe_name = html.escape(facility['name'])
@@ -67,6 +102,33 @@ class RegionalTelegramSender:
 
         return chunks
 
+    def _pack_sections(self, header, sections):
+        """숙박시설별 시설 목록을 시설 단위로 최소 개수의 메시지에 채움 (청크가 바뀌면 소제목 반복)"""
+        chunks = []
+        current_chunk = header
+        current_size = len(header.encode('utf-8'))
+        current_label = None
+
+        for label, facilities in sections:
+            for facility in facilities:
+                fac_str = self._format_facility(facility)
+                piece = fac_str if label == current_label else label + fac_str
+                piece_bytes = len(piece.encode('utf-8'))
+
+                if current_size + piece_bytes > 4000 and current_chunk != header:
+                    chunks.append(current_chunk)
+                    current_chunk = "📄 [이어서]\n" + label + fac_str
+                    current_size = len(current_chunk.encode('utf-8'))
+                else:
+                    current_chunk += piece
+                    current_size += piece_bytes
+                current_label = label
+
+        if current_chunk != header:
+            chunks.append(current_chunk)
+
+        return chunks
+
     # def send_to_region(self, region_code, context_info, result_data):
     #     """특정 지역 채팅방으로 메시지 전송 (분할 포함)"""
     #     if region_code not in self.region_chat_ids:
@@ -102,28 +164,43 @@ class RegionalTelegramSender:
     #         print(f"📤 {region_name} - 청크 {i + 1}/{len(chunks)} ({len(chunk.encode('utf-8'))}바이트)")
     #         self._send_with_retry(chat_id, chunk, region_name)
 
-    def _send_with_retry(self, chat_id, message, region_name, chunk_info):
-        """강화된 재시도 메커니즘"""
-        url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+    def _send_with_retry(self, chat_id, message, region_name, chunk_info=""):
+        """강화된 재시도 메커니즘 (전송 한도 대기 + 429 retry_after 준수)"""
+        url = f"{self.api_base}/bot{self.token}/sendMessage"
         payload = {
             "chat_id": chat_id,
             "text": message,
             "parse_mode": "HTML"
         }
 
-        for attempt in range(3):
+        attempt = 0
+        throttled = 0
+        while attempt < 3:
+            with metrics.span('telegram_wait', region=region_name):
+                self.rate_limiter.acquire(chat_id)
             try:
-                response = requests.post(url, json=payload, timeout=15)
+                with metrics.span('telegram_send', region=region_name):
+                    response = self.session.post(url, json=payload, timeout=15)
                 if response.status_code == 200:
+                    self.rate_limiter.record_sent()
                     print(f"✅ {region_name} {chunk_info} - 전송 성공 (시도 {attempt + 1})")
                     return True
+                elif response.status_code == 429 and throttled < self.max_429_retries:
+                    # 한도 초과: 텔레그램이 알려준 시간만큼 해당 채팅방 대기 (재시도 횟수 미차감)
+                    retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                    self.rate_limiter.penalize(chat_id, retry_after)
+                    throttled += 1
+                    print(f"⏳ {region_name} {chunk_info} - 429 한도 초과, {retry_after}초 후 재시도")
+                    continue
                 else:
                     print(f"⚠️ {region_name} {chunk_info} - 시도 {attempt + 1} 실패: {response.status_code}")
             except Exception as e:
                 print(f"⚠️ {region_name} {chunk_info} - 시도 {attempt + 1} 예외: {str(e)}")
 
             time.sleep(2 ** attempt)  # 지수 백오프
+            attempt += 1
 
+        self.rate_limiter.record_dropped()
         print(f"❌ {region_name} {chunk_info} - 최종 전송 실패")
         return False
 
@@ -131,13 +208,13 @@ class RegionalTelegramSender:
         """데이터 무결성 보장 전송 시스템"""
         if region_code not in self.region_chat_ids:
             print(f"⚠️ 지역 코드 {region_code}에 해당하는 채팅방이 없습니다.")
-            return
+            return False
 
         chat_id = self.region_chat_ids[region_code]
         region_name = self.region_names[region_code]
 
         if not result_data or len(result_data) == 0:
-            return
+            return True
 
         # 헤더 생성 (HTML 이스케이프 필수)
         header = f"🏞️ <b>{html.escape(region_name)} 휴양림 예약 현황</b>\n\n"
@@ -174,12 +251,111 @@ class RegionalTelegramSender:
         # 최종 무결성 검증
         if sent_facilities == total_facilities:
             print(f"✅ {region_name} - 모든 시설 전송 완료 ({sent_facilities}/{total_facilities})")
-        else:
-            print(f"❌ {region_name} - 시설 누락 발생! ({sent_facilities}/{total_facilities})")
+            return True
+
+        print(f"❌ {region_name} - 시설 누락 발생! ({sent_facilities}/{total_facilities})")
+        return False
+
+
+
+
+
+    def buffer_result(self, region_code, context_info, result_data, on_sent=None):
+        """결과를 지역 버퍼에 추가 → 창 시간이 지났으면 True (호출 측에서 해당 지역 전송)
+
+        on_sent는 묶음 전송이 성공한 뒤 호출 (같은 숙박시설/월 결과가 다시 들어오면 새 결과로 교체)
+        """
+        if not result_data:
+            return False
 
+        now = time.monotonic()
+        scope = tuple(context_info[k] for k in SCOPE_KEYS)
+        with self.buffer_lock:
+            buffer = self.buffers.setdefault(region_code, {'started': now, 'sections': [], 'on_sent': {}})
+            for i, (buffered_context, _) in enumerate(buffer['sections']):
+                if tuple(buffered_context[k] for k in SCOPE_KEYS) == scope:
+                    buffer['sections'][i] = (context_info, result_data)
+                    break
+            else:
+                buffer['sections'].append((context_info, result_data))
+            if on_sent:
+                buffer['on_sent'][scope] = on_sent
+            return self.coalesce_window > 0 and now - buffer['started'] >= self.coalesce_window
+
+    def due_regions(self):
+        """창 시간이 지난 지역 코드 목록 (새 결과가 없어도 메인 루프에서 주기적으로 확인)"""
+        if self.coalesce_window <= 0:
+            return []
+        now = time.monotonic()
+        with self.buffer_lock:
+            return [code for code, buffer in self.buffers.items() if now - buffer['started'] >= self.coalesce_window]
+
+    def take_buffered(self, region_code=None):
+        """버퍼에 모인 결과를 꺼냄 (region_code가 None이면 전 지역) → {region_code: (sections, on_sent)}
+
+        on_sent()는 묶음 전송 성공 후 호출 (버퍼에 모인 결과들의 스냅샷 저장)
+        """
+        with self.buffer_lock:
+            codes = list(self.buffers) if region_code is None else [region_code]
+            buffers = {code: self.buffers.pop(code) for code in codes if code in self.buffers}
+        return {code: (buffer['sections'], partial(_call_all, list(buffer['on_sent'].values())))
+                for code, buffer in buffers.items()}
+
+    def send_region_batch(self, region_code, sections):
+        """지역 버퍼의 여러 숙박시설 결과를 묶어서 전송"""
+        if region_code not in self.region_chat_ids:
+            print(f"⚠️ 지역 코드 {region_code}에 해당하는 채팅방이 없습니다.")
+            return False
+
+        chat_id = self.region_chat_ids[region_code]
+        region_name = self.region_names[region_code]
 
+        if not sections:
+            return True
 
+        total_facilities = sum(len(result_data) for _, result_data in sections)
+        total_dates = sum(len(f['dates']) for _, result_data in sections for f in result_data)
+
+        # 요약 + 헤더 (HTML 이스케이프 필수)
+        header = f"📊 숙박시설 {len(sections)}곳 | 총 {total_facilities}개 시설 | 예약 일자: {total_dates}개\n"
+        header += f"🏞️ <b>{html.escape(region_name)} 휴양림 예약 현황</b>\n"
+        header += f"{'=' * 30}\n"
+
+        # 숙박시설별 소제목
+        labeled = []
+        for context_info, result_data in sections:
+            label = f"\n📅 {html.escape(context_info['month'])} | 🌲 {html.escape(context_info['forest'])}\n"
+            label += f"🏠 <b>{html.escape(context_info['accommodation'])}</b>\n"
+            labeled.append((label, result_data))
+
+        chunks = self._pack_sections(header, labeled)
+        print(f"📦 {region_name} - 숙박시설 {len(sections)}곳 결과를 메시지 {len(chunks)}건으로 묶음")
+
+        sent_facilities = 0
+        for i, chunk in enumerate(chunks):
+            chunk_info = f"묶음 {i + 1}/{len(chunks)}"
+            facilities_in_chunk = chunk.count("🏡")
+            print(f"📤 {region_name} {chunk_info} - 시설: {facilities_in_chunk}개, 바이트: {len(chunk.encode('utf-8'))}")
+
+            if self._send_with_retry(chat_id, chunk, region_name, chunk_info):
+                sent_facilities += facilities_in_chunk
+
+        with self.buffer_lock:
+            self.coalesced_results += len(sections)
+            self.coalesced_messages += len(chunks)
+
+        if sent_facilities == total_facilities:
+            print(f"✅ {region_name} - 묶음 전송 완료 ({sent_facilities}/{total_facilities})")
+            return True
+
+        print(f"❌ {region_name} - 시설 누락 발생! ({sent_facilities}/{total_facilities})")
+        return False
 
+    def report_coalescing(self):
+        with self.buffer_lock:
+            results, messages = self.coalesced_results, self.coalesced_messages
+        if results:
+            print(f"📦 묶음 전송: 숙박시설 결과 {results}건 → 메시지 {messages}건")
 
     def send_to_all_regions(self, message):
         """모든 지역 채팅방에 공통 메시지 전송"""
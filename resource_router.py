@@ -0,0 +1,154 @@
+from urllib.parse import urlsplit
+import threading
+
+# 차단한 요청의 절감 바이트 추정에 쓰는 유형별 기본 크기 (실제 로드된 같은 유형 평균이 있으면 그 값 사용)
+DEFAULT_SIZE_ESTIMATES = {
+    'image': 30 * 1024,
+    'font': 60 * 1024,
+    'media': 300 * 1024,
+    'stylesheet': 20 * 1024,
+    'script': 40 * 1024,
+}
+FALLBACK_SIZE_ESTIMATE = 10 * 1024
+
+STUB_BODIES = {
+    'stylesheet': ('text/css', ''),
+    'script': ('application/javascript', ''),
+}
+
+
+def _split(value):
+    return [item.strip().lower() for item in value.split(',') if item.strip()]
+
+
+class ResourceRouter:
+    """컨텍스트 요청 가로채기: 이미지/폰트/미디어·외부 분석 스크립트 차단, select 연쇄/NetFunnel 스크립트는 허용"""
+
+    def __init__(self, site_hosts, block_types, stub_types=(), allow_patterns=(), block_third_party=True):
+        self.site_hosts = list(site_hosts)
+        self.block_types = set(block_types)
+        self.stub_types = set(stub_types)  # 차단하면 페이지 스크립트가 깨질 수 있는 유형은 빈 응답으로 대체
+        self.allow_patterns = list(allow_patterns)
+        self.block_third_party = block_third_party
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.allowed = 0
+            self.blocked = {}  # 유형 → 차단 건수
+            self.stubbed = 0
+            self.third_party = 0
+            self.loaded = {}  # 유형 → [응답 수, content-length 합계]
+
+    def _is_site(self, host):
+        return any(host == site or host.endswith('.' + site) for site in self.site_hosts)
+
+    def decide(self, url, resource_type):
+        """요청 처리 방식 → 'continue' / 'abort' / 'stub'"""
+        lowered = url.lower()
+        if any(pattern in lowered for pattern in self.allow_patterns):
+            return 'continue'
+        if resource_type == 'document' and not lowered.startswith('http'):
+            return 'continue'  # about:blank, data: 등
+
+        if self.block_third_party and not self._is_site(urlsplit(url).hostname or ''):
+            return 'abort'
+        if resource_type in self.stub_types:
+            return 'stub'
+        if resource_type in self.block_types:
+            return 'abort'
+        return 'continue'
+
+    def _record(self, action, resource_type, url):
+        with self.lock:
+            if action == 'continue':
+                self.allowed += 1
+                return
+            if action == 'stub':
+                self.stubbed += 1
+            if not self._is_site(urlsplit(url).hostname or ''):
+                self.third_party += 1
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+
+    def on_response(self, response):
+        """허용된 응답의 크기 집계 (content-length 헤더 기준)"""
+        length = response.headers.get('content-length')
+        if not length or not length.isdigit():
+            return
+        resource_type = response.request.resource_type
+        with self.lock:
+            stats = self.loaded.setdefault(resource_type, [0, 0])
+            stats[0] += 1
+            stats[1] += int(length)
+
+    def handle(self, route, request):
+        """sync Playwright 라우트 핸들러"""
+        action = self.decide(request.url, request.resource_type)
+        self._record(action, request.resource_type, request.url)
+        if action == 'abort':
+            route.abort('blockedbyclient')
+        elif action == 'stub':
+            content_type, body = STUB_BODIES.get(request.resource_type, ('text/plain', ''))
+            route.fulfill(status=200, content_type=content_type, body=body)
+        else:
+            route.continue_()
+
+    async def handle_async(self, route, request):
+        """async Playwright 라우트 핸들러"""
+        action = self.decide(request.url, request.resource_type)
+        self._record(action, request.resource_type, request.url)
+        if action == 'abort':
+            await route.abort('blockedbyclient')
+        elif action == 'stub':
+            content_type, body = STUB_BODIES.get(request.resource_type, ('text/plain', ''))
+            await route.fulfill(status=200, content_type=content_type, body=body)
+        else:
+            await route.continue_()
+
+    def install(self, context):
+        context.route('**/*', self.handle)
+        context.on('response', self.on_response)
+
+    async def install_async(self, context):
+        await context.route('**/*', self.handle_async)
+        context.on('response', self.on_response)
+
+    def stats(self):
+        with self.lock:
+            blocked_total = sum(self.blocked.values())
+            loaded_bytes = sum(total for _, total in self.loaded.values())
+            saved_bytes = 0
+            for resource_type, count in self.blocked.items():
+                responses, total = self.loaded.get(resource_type, (0, 0))
+                average = total / responses if responses else DEFAULT_SIZE_ESTIMATES.get(resource_type, FALLBACK_SIZE_ESTIMATE)
+                saved_bytes += count * average
+            return {
+                "allowed": self.allowed,
+                "blocked": blocked_total,
+                "stubbed": self.stubbed,
+                "third_party": self.third_party,
+                "blocked_by_type": dict(self.blocked),
+                "loaded_mb": round(loaded_bytes / 1024 / 1024, 2),
+                "saved_mb_estimated": round(saved_bytes / 1024 / 1024, 2),
+            }
+
+    def report(self):
+        stats = self.stats()
+        by_type = ', '.join(f"{t} {c}" for t, c in sorted(stats['blocked_by_type'].items())) or '없음'
+        print(f"🛡️ 리소스 차단: 요청 {stats['blocked']}건 차단 (빈 응답 {stats['stubbed']}건, 외부 호스트 "
+              f"{stats['third_party']}건) / 허용 {stats['allowed']}건 [{by_type}]")
+        print(f"   절감 추정 {stats['saved_mb_estimated']}MB / 실제 수신 {stats['loaded_mb']}MB")
+
+
+def build_resource_router(config):
+    """config.ini [RESOURCE_BLOCKING] 설정으로 라우터 생성 (비활성화 시 None)"""
+    if not config.getboolean('RESOURCE_BLOCKING', 'ENABLED', fallback=True):
+        return None
+    return ResourceRouter(
+        site_hosts=_split(config.get('RESOURCE_BLOCKING', 'SITE_HOSTS', fallback='foresttrip.go.kr')),
+        block_types=_split(config.get('RESOURCE_BLOCKING', 'BLOCK_TYPES', fallback='image,font,media')),
+        stub_types=_split(config.get('RESOURCE_BLOCKING', 'STUB_TYPES', fallback='')),
+        allow_patterns=_split(config.get('RESOURCE_BLOCKING', 'ALLOW_PATTERNS', fallback='netfunnel,jquery')),
+        block_third_party=config.getboolean('RESOURCE_BLOCKING', 'BLOCK_THIRD_PARTY', fallback=True)
+    )
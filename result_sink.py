@@ -0,0 +1,175 @@
+import glob
+import gzip
+import json
+import os
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축은 zstandard 설치 시에만 사용
+    zstandard = None
+
+EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _open_writer(path, compression):
+    """압축 방식별 추가 쓰기 스트림 → (writer, 실제 파일 객체)"""
+    raw = open(path, 'ab')
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='ab'), raw
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False), raw
+    return raw, raw
+
+
+def _flush_writer(writer, raw, compression):
+    """현재까지 쓴 줄을 디스크까지 내보냄 (중간 종료 시에도 읽을 수 있도록 블록 단위로 끊음)"""
+    if compression == 'zstd':
+        writer.flush(zstandard.FLUSH_BLOCK)
+    else:
+        writer.flush()
+    raw.flush()
+
+
+class ResultSink:
+    """스크래핑 결과를 한 줄씩 JSONL로 즉시 기록 (gzip/zstd 압축, 크기 기준 파일 분할)"""
+
+    def __init__(self, path='results.jsonl', compression='none', rotate_bytes=0):
+        if compression == 'zstd' and zstandard is None:
+            print("⚠️ zstandard 모듈이 없어 gzip 압축으로 대체합니다")
+            compression = 'gzip'
+        if compression not in EXTENSIONS:
+            raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+
+        self.base, _ = os.path.splitext(path)
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes  # 0이면 분할하지 않음
+        self.lock = threading.Lock()
+
+        self.part = self._last_part() + 1  # 실행마다 새 파일 (중간 종료된 압축 스트림 뒤에 이어 쓰지 않음)
+        self.writer = self.raw = None  # 첫 기록 시 파일 생성
+        self.files = []
+        self.written = 0
+        self.closed = False
+
+    def _part_path(self, part):
+        return f"{self.base}-{part:04d}.jsonl{EXTENSIONS[self.compression]}"
+
+    def _last_part(self):
+        """이전 실행에서 기록한 마지막 파일 번호 (없으면 0)"""
+        parts = sorted(glob.glob(f"{glob.escape(self.base)}-[0-9][0-9][0-9][0-9].jsonl{EXTENSIONS[self.compression]}"))
+        return int(parts[-1][len(self.base) + 1:len(self.base) + 5]) if parts else 0
+
+    def _open(self):
+        path = self._part_path(self.part)
+        self.writer, self.raw = _open_writer(path, self.compression)
+        self.files.append(path)
+
+    def _rotate(self):
+        self.writer.close()
+        if self.raw is not self.writer:
+            self.raw.close()
+        self.part += 1
+        self._open()
+
+    def write(self, result):
+        """결과 1건을 한 줄로 기록 후 즉시 flush"""
+        line = json.dumps(result, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("이미 닫힌 결과 저장소입니다")
+            if self.writer is None:
+                self._open()
+            elif self.rotate_bytes and self.raw.tell() >= self.rotate_bytes:
+                self._rotate()
+            self.writer.write(line.encode('utf-8'))
+            _flush_writer(self.writer, self.raw, self.compression)
+            self.written += 1
+
+    def summary(self):
+        """이번 실행에서 기록한 결과 수와 파일 목록 (결과를 메모리에 보관하지 않을 때의 반환값)"""
+        with self.lock:
+            return {"results": self.written, "files": list(self.files)}
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self.writer is None:
+                return
+            self.writer.close()
+            if self.raw is not self.writer:
+                self.raw.close()
+            self.writer = self.raw = None
+        print(f"💾 결과 스트리밍 저장: {self.written}건 → {', '.join(self.files)}")
+
+
+def _iter_blocks(path, size=1 << 16):
+    """파일을 압축 해제된 바이트 블록 단위로 읽음 (종료되지 않은 gzip/zstd 스트림도 flush된 부분까지)"""
+    with open(path, 'rb') as f:
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError(f"zstandard 모듈이 없어 읽을 수 없습니다: {path}")
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            while True:
+                try:
+                    block = reader.read(size)
+                except zstandard.ZstdError:
+                    return
+                if not block:
+                    return
+                yield block
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if path.endswith('.gz') else None
+        while True:
+            block = f.read(size)
+            if not block:
+                return
+            if decompressor is None:
+                yield block
+                continue
+            # 실행마다 이어 붙은 gzip 멤버를 차례로 해제
+            while block:
+                yield decompressor.decompress(block)
+                if decompressor.eof:
+                    block = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                else:
+                    block = b''
+
+
+def result_files(path='results.jsonl'):
+    """ResultSink가 만든 분할 파일 목록 (번호순)"""
+    base, _ = os.path.splitext(path)
+    return sorted(glob.glob(f"{glob.escape(base)}-[0-9][0-9][0-9][0-9].jsonl*"))
+
+
+def iter_results(path='results.jsonl', files=None):
+    """분할 파일을 순서대로 한 줄씩 읽어 결과 dict를 하나씩 반환 (중간 종료로 잘린 마지막 줄은 건너뜀)"""
+    for file_path in (result_files(path) if files is None else files):
+        pending = b''
+        for block in _iter_blocks(file_path):
+            lines = (pending + block).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+        if pending.strip():
+            try:
+                yield json.loads(pending)
+            except ValueError:
+                print(f"⚠️ {file_path}: 잘린 마지막 줄 건너뜀")
+
+
+def build_result_sink(config):
+    """config.ini [RESULT_SINK] 설정으로 스트리밍 저장소 생성 (비활성화 시 None)"""
+    if not config.getboolean('RESULT_SINK', 'ENABLED', fallback=True):
+        return None
+    return ResultSink(
+        path=config.get('RESULT_SINK', 'PATH', fallback='results.jsonl'),
+        compression=config.get('RESULT_SINK', 'COMPRESSION', fallback='none'),
+        rotate_bytes=int(config.getfloat('RESULT_SINK', 'ROTATE_MB', fallback=64) * 1024 * 1024)
+    )
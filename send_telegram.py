@@ -1,6 +1,6 @@
-import requests
 import configparser
 import time
+from http_pool import get_session
 
 
 def format_facility(facility):
@@ -70,6 +70,7 @@ def send_telegram_message(context_info, result_data):
 
     token = config.get('TELEGRAM', 'TOKEN')
     chat_id = config.get('TELEGRAM', 'CHAT_ID')
+    api_base = config.get('TELEGRAM', 'API_BASE', fallback='https://api.telegram.org').rstrip('/')
 
     if not result_data or len(result_data) == 0:
         return
@@ -116,11 +117,11 @@ def send_telegram_message(context_info, result_data):
             chunk = f"📄 [이어서] ({i + 1}/{len(chunks)})\n" + chunk
 
         print(f"📤 청크 {i + 1}/{len(chunks)} 전송 ({len(chunk)}자, {len(chunk.encode('utf-8'))}바이트)")
-        _send_message(token, chat_id, chunk)
+        _send_message(token, chat_id, chunk, api_base)
         time.sleep(0.5)  # 전송 간 간격
 
 
-def _send_message(token, chat_id, message):
+def _send_message(token, chat_id, message, api_base='https://api.telegram.org'):
     """실제 메시지 전송 (UTF-8 바이트 길이 최종 검증)"""
     # 최종 안전장치: UTF-8 바이트 길이 확인
     byte_length = len(message.encode('utf-8'))
@@ -131,7 +132,7 @@ def _send_message(token, chat_id, message):
         safe_msg += "... [TRUNCATED]"
         message = safe_msg
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = f"{api_base}/bot{token}/sendMessage"
     payload = {
         "chat_id": chat_id,
         "text": message,
@@ -139,7 +140,7 @@ def _send_message(token, chat_id, message):
     }
 
     try:
-        response = requests.post(url, data=payload, timeout=15)
+        response = get_session('telegram').post(url, data=payload, timeout=15)
         if response.ok:
             print("✅ 텔레그램 전송 성공")
         else:
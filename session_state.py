@@ -0,0 +1,111 @@
+import json
+import os
+import time
+
+# 세션 확인용: 월별예약 페이지가 로그인 없이 열리면 이 요소가 있음
+SESSION_PROBE_SELECTOR = '#monthSelectBox'
+
+
+class SessionStateStore:
+    """로그인 직후 브라우저 storage state(쿠키 등) + 월별예약 페이지 URL 저장 → 다음 실행에서 로그인 생략"""
+
+    def __init__(self, path='session_state.json', max_age_hours=6, probe_timeout=10000):
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+        self.probe_timeout = probe_timeout
+
+    def load(self):
+        """저장된 세션 (없거나 만료 시 None)"""
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+
+        age = time.time() - saved.get('saved_at', 0)
+        if age > self.max_age_seconds:
+            print(f"⌛ 저장된 로그인 세션 만료 ({age / 3600:.1f}시간 경과)")
+            return None
+        return saved
+
+    def save(self, storage_state, reservation_url):
+        """쿠키가 평문으로 저장되므로 소유자만 읽고 쓸 수 있게 (0600) 기록"""
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(self.path, 0o600)  # 이전 실행에서 넓은 권한으로 만든 파일도 제한
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({
+                'saved_at': time.time(),
+                'reservation_url': reservation_url,
+                'storage_state': storage_state,
+            }, f, ensure_ascii=False)
+        print(f"💾 로그인 세션 저장: {self.path}")
+
+    def invalidate(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def is_logged_out(self, url):
+        """로그인 페이지로 되돌아갔는지 확인"""
+        return 'login' in url.lower()
+
+    def restore(self, context, saved):
+        """저장된 쿠키를 컨텍스트에 복원 (세션 쿠키는 user_data_dir에 남지 않으므로)"""
+        context.add_cookies(saved['storage_state'].get('cookies', []))
+
+    def probe(self, page, saved):
+        """월별예약 페이지로 바로 이동해 세션 유효 여부 확인"""
+        try:
+            page.goto(saved['reservation_url'], timeout=60000)
+            page.wait_for_selector(SESSION_PROBE_SELECTOR, state='attached', timeout=self.probe_timeout)
+            return not self.is_logged_out(page.url)
+        except Exception as e:
+            print(f"ℹ️ 저장된 세션 확인 실패: {str(e)}")
+            return False
+
+    async def restore_async(self, context, saved):
+        await context.add_cookies(saved['storage_state'].get('cookies', []))
+
+    async def probe_async(self, page, saved):
+        try:
+            await page.goto(saved['reservation_url'], timeout=60000)
+            await page.wait_for_selector(SESSION_PROBE_SELECTOR, state='attached', timeout=self.probe_timeout)
+            return not self.is_logged_out(page.url)
+        except Exception as e:
+            print(f"ℹ️ 저장된 세션 확인 실패: {str(e)}")
+            return False
+
+
+class StartupTimer:
+    """프로세스 시작 → 로그인 완료 → 첫 스크래핑까지 걸린 시간 측정"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.login_mode = None
+        self.login_seconds = None
+        self.first_scrape_seconds = None
+
+    def mark_login(self, mode):
+        self.login_mode = mode
+        self.login_seconds = time.perf_counter() - self.started_at
+        print(f"⏱️ 로그인 완료 ({mode}): {self.login_seconds:.1f}초")
+
+    def mark_first_scrape(self):
+        """첫 스크래핑 결과 시점 기록 (두 번째 호출부터 무시)"""
+        if self.first_scrape_seconds is not None:
+            return
+        self.first_scrape_seconds = time.perf_counter() - self.started_at
+        print(f"⏱️ 첫 스크래핑까지 {self.first_scrape_seconds:.1f}초 (로그인: {self.login_mode or '-'})")
+
+
+startup_timer = StartupTimer()  # 모듈 import 시점(프로세스 시작 직후)부터 측정
+
+
+def build_session_store(config):
+    """config.ini [SESSION] 설정으로 세션 저장소 생성 (비활성화 시 None)"""
+    if not config.getboolean('SESSION', 'ENABLED', fallback=True):
+        return None
+    return SessionStateStore(
+        path=config.get('SESSION', 'PATH', fallback='session_state.json'),
+        max_age_hours=config.getfloat('SESSION', 'MAX_AGE_HOURS', fallback=6),
+        probe_timeout=config.getint('SESSION', 'PROBE_TIMEOUT', fallback=10000)
+    )
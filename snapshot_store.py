@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS availability_snapshot (
+    region_code TEXT NOT NULL,
+    forest TEXT NOT NULL,
+    accommodation TEXT NOT NULL,
+    month TEXT NOT NULL,
+    facility TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (region_code, forest, accommodation, month, facility, date)
+) WITHOUT ROWID
+"""
+
+SCOPE_WHERE = "region_code = ? AND forest = ? AND accommodation = ? AND month = ?"
+
+
+class AvailabilitySnapshotStore:
+    """(숙박시설, 시설, 날짜)별 마지막 예약 상태 저장 및 변경분 계산 (SQLite)"""
+
+    def __init__(self, path='availability_snapshot.db', notify_closed=False):
+        self.path = path
+        self.notify_closed = notify_closed  # 마감된 날짜도 알림에 포함할지 여부
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    @staticmethod
+    def _scope(context_info):
+        """스냅샷 비교 범위: 지역/휴양림/숙박시설/월 (검색 1회 단위)"""
+        return (context_info['region_code'], context_info['forest'],
+                context_info['accommodation'], context_info['month'])
+
+    @staticmethod
+    def _current(result_data):
+        return {
+            (facility['name'], entry['date'] or ''): entry['status']
+            for facility in result_data
+            for entry in facility['dates']
+        }
+
+    def _previous(self, scope):
+        return {
+            (facility, date): status
+            for facility, date, status in self.conn.execute(
+                f"SELECT facility, date, status FROM availability_snapshot WHERE {SCOPE_WHERE}", scope
+            )
+        }
+
+    def _write(self, scope, previous, current):
+        closed = [k for k in previous if k not in current]
+        upserts = [k for k in current if previous.get(k) != current[k]]
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                f"DELETE FROM availability_snapshot WHERE {SCOPE_WHERE} AND facility = ? AND date = ?",
+                [scope + key for key in closed]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO availability_snapshot VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [scope + key + (current[key], now) for key in upserts]
+            )
+
+    def apply(self, context_info, result_data, commit=True):
+        """스크래핑 결과를 직전 스냅샷과 비교 → {'opened', 'closed', 'changed'} (commit=False면 전송 후 commit으로 저장)
+
+        예약 가능 일자가 하나도 없는 결과도 빈 result_data로 호출해야 마감 후 다시 열린 날짜를 감지함
+        """
+        scope = self._scope(context_info)
+        current = self._current(result_data)
+
+        with self.lock:
+            previous = self._previous(scope)
+            if commit:
+                self._write(scope, previous, current)
+
+        opened = [k for k in current if k not in previous]
+        closed = [k for k in previous if k not in current]
+        changed = [k for k in current if k in previous and previous[k] != current[k]]
+        return {
+            'opened': [{'facility': f, 'date': d, 'status': current[(f, d)]} for f, d in opened],
+            'closed': [{'facility': f, 'date': d, 'status': previous[(f, d)]} for f, d in closed],
+            'changed': [{'facility': f, 'date': d, 'status': current[(f, d)], 'previous': previous[(f, d)]}
+                        for f, d in changed],
+        }
+
+    def commit(self, context_info, result_data):
+        """전송이 끝난 결과를 해당 범위의 스냅샷으로 저장 (전송 실패 시 호출하지 않아 다음 스크래핑에서 다시 알림)"""
+        scope = self._scope(context_info)
+        current = self._current(result_data)
+        with self.lock:
+            self._write(scope, self._previous(scope), current)
+
+    def delta_result_data(self, diff):
+        """변경분 → send_to_region에 넘길 시설별 구조 (변경 없는 시설 제외)"""
+        facilities = {}
+        for entry in diff['opened']:
+            facilities.setdefault(entry['facility'], []).append({"date": entry['date'], "status": entry['status']})
+        for entry in diff['changed']:
+            status = f"{entry['status']} (이전: {entry['previous']})"
+            facilities.setdefault(entry['facility'], []).append({"date": entry['date'], "status": status})
+        if self.notify_closed:
+            for entry in diff['closed']:
+                facilities.setdefault(entry['facility'], []).append({"date": entry['date'], "status": "마감"})
+
+        return [
+            {"name": name, "dates": sorted(dates, key=lambda d: d['date'] or '')}
+            for name, dates in facilities.items()
+        ]
+
+    def close(self):
+        self.conn.close()
+
+
+def build_snapshot_store(config):
+    """config.ini [SNAPSHOT] 설정으로 저장소 생성 (비활성화 시 None)"""
+    if not config.getboolean('SNAPSHOT', 'ENABLED', fallback=True):
+        return None
+    return AvailabilitySnapshotStore(
+        path=config.get('SNAPSHOT', 'PATH', fallback='availability_snapshot.db'),
+        notify_closed=config.getboolean('SNAPSHOT', 'NOTIFY_CLOSED', fallback=False)
+    )
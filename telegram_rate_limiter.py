@@ -0,0 +1,141 @@
+from collections import deque
+import threading
+import time
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (429 발생 시 일시 정지 지원)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def wait_time(self, now):
+        """토큰 1개를 쓸 수 있을 때까지 남은 시간(초)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class TelegramRateLimiter:
+    """채팅방별 + 봇 전체 전송 한도를 지키며 지역 간 순서를 공정하게 배분"""
+
+    def __init__(self, global_per_sec=30, chat_per_min=20, chat_burst=1):
+        self.cond = threading.Condition()
+        self.global_bucket = TokenBucket(global_per_sec, global_per_sec)
+        self.chat_per_min = chat_per_min
+        self.chat_burst = chat_burst
+        self.chat_buckets = {}
+
+        self.waiting = {}  # chat_id -> 대기 중인 티켓 deque
+        self.rotation = deque()  # 대기 중인 채팅방 순환 순서 (라운드 로빈)
+        self.granted = set()
+
+        self.started_at = None
+        self.sent = 0
+        self.throttled = 0  # 429 응답 횟수
+        self.dropped = 0  # 재시도 후 최종 실패
+        self.acquired = 0
+        self.wait_seconds = 0.0
+
+    def _chat_bucket(self, chat_id):
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(self.chat_per_min / 60, self.chat_burst)
+        return self.chat_buckets[chat_id]
+
+    def _dispatch(self, now):
+        """보낼 수 있는 채팅방에 순서대로 전송 권한 배분 → 다음 확인까지 대기 시간"""
+        next_wait = None
+        skipped = 0  # 연속으로 건너뛴 채팅방 수 (한 바퀴 돌면 종료)
+        while self.rotation and skipped < len(self.rotation):
+            global_wait = self.global_bucket.wait_time(now)
+            if global_wait > 0:
+                return global_wait
+
+            chat_id = self.rotation[0]
+            bucket = self._chat_bucket(chat_id)
+            chat_wait = bucket.wait_time(now)
+            if chat_wait > 0:
+                next_wait = chat_wait if next_wait is None else min(next_wait, chat_wait)
+                self.rotation.rotate(-1)
+                skipped += 1
+                continue
+
+            # 권한 부여 후 해당 채팅방은 순환 순서의 맨 뒤로
+            ticket = self.waiting[chat_id].popleft()
+            self.granted.add(ticket)
+            self.global_bucket.consume()
+            bucket.consume()
+            self.rotation.popleft()
+            if self.waiting[chat_id]:
+                self.rotation.append(chat_id)
+            else:
+                del self.waiting[chat_id]
+            skipped = 0
+            self.cond.notify_all()
+        return next_wait
+
+    def acquire(self, chat_id):
+        """해당 채팅방으로 메시지 1건을 보낼 수 있을 때까지 대기"""
+        requested_at = time.monotonic()
+        ticket = object()
+        with self.cond:
+            if self.started_at is None:
+                self.started_at = requested_at
+            if chat_id not in self.waiting:
+                self.waiting[chat_id] = deque()
+                self.rotation.append(chat_id)
+            self.waiting[chat_id].append(ticket)
+
+            while True:
+                wait = self._dispatch(time.monotonic())
+                if ticket in self.granted:
+                    self.granted.discard(ticket)
+                    self.acquired += 1
+                    self.wait_seconds += time.monotonic() - requested_at
+                    return
+                self.cond.wait(timeout=wait)
+
+    def penalize(self, chat_id, retry_after):
+        """429 retry_after 동안 해당 채팅방 전송 중지"""
+        with self.cond:
+            self.throttled += 1
+            bucket = self._chat_bucket(chat_id)
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + retry_after)
+            self.cond.notify_all()
+
+    def record_sent(self):
+        with self.cond:
+            self.sent += 1
+
+    def record_dropped(self):
+        with self.cond:
+            self.dropped += 1
+
+    def stats(self):
+        with self.cond:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            return {
+                "sent": self.sent,
+                "throttled": self.throttled,
+                "dropped": self.dropped,
+                "elapsed_s": round(elapsed, 1),
+                "throughput_per_min": round(self.sent / elapsed * 60, 1) if elapsed else 0.0,
+                "avg_wait_s": round(self.wait_seconds / max(1, self.acquired), 2),
+            }
+
+    def report(self):
+        stats = self.stats()
+        print(f"🚦 텔레그램 전송: 성공 {stats['sent']}건, 429 {stats['throttled']}회, "
+              f"최종 실패 {stats['dropped']}건, 처리량 {stats['throughput_per_min']}건/분, "
+              f"평균 대기 {stats['avg_wait_s']}s")
@@ -0,0 +1,37 @@
+import pytest
+from capture_parser import PARSERS
+from day_list_parser import normalize_day_list
+
+# 시설명/상태 안에 줄바꿈, 연속 공백, <br>이 섞인 결과 테이블
+DAY_LIST_HTML = """<div><table id="dayListTable"><tbody id="dayListTbody">
+<tr><td class="list_left"><div class="simpleMonthDiv">숲속의집
+    101호<br>(4인실)</div></td>
+<td><span class="apt_mark" title="예약가능 2025.07.12"> 예 </span></td>
+<td><span class="apt_mark_2" title="마감 2025.07.13">완</span></td>
+<td></td></tr>
+<tr><td class="list_left"><div class="simpleMonthDiv">  연립동   201호 </div></td>
+<td><span class="apt_mark" title="대기 2025.07.12">대<br>기</span></td>
+<td><span class="apt_mark" title="예약가능 2025.07.13">예</span></td>
+<td><span class="apt_mark_2" title="마감 2025.07.14">마감</span></td></tr>
+</tbody></table></div>"""
+
+EXPECTED_NAMES = ["숲속의집 101호 (4인실)", "연립동 201호"]
+EXPECTED_STATUSES = [["예", "완", None], ["대 기", "예", "마감"]]
+
+
+@pytest.mark.parametrize('name', [name for name, parse in PARSERS.items() if parse])
+def test_every_parser_normalizes_identically(name):
+    names, rows = PARSERS[name](DAY_LIST_HTML)
+
+    assert (names, rows) == PARSERS['stdlib'](DAY_LIST_HTML)
+    assert names == EXPECTED_NAMES
+    assert [[cell[1] if cell else None for cell in cells] for cells in rows] == EXPECTED_STATUSES
+
+
+def test_browser_extraction_uses_parser_normalization():
+    # bulk/element 방식의 innerText 값 (줄바꿈 유지) → 파서 결과와 같아야 함
+    names = ["숲속의집\n101호\n(4인실)", "  연립동   201호 "]
+    rows = [[["예약가능 2025.07.12", " 예 "], ["마감 2025.07.13", "완"], None],
+            [["대기 2025.07.12", "대\n기"], ["예약가능 2025.07.13", "예"], ["마감 2025.07.14", "마감"]]]
+
+    assert normalize_day_list(names, rows) == PARSERS['stdlib'](DAY_LIST_HTML)
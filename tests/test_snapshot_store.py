@@ -0,0 +1,30 @@
+from snapshot_store import AvailabilitySnapshotStore
+
+CONTEXT = {"month": "2025년 07월", "region": "경기", "region_code": "1", "forest": "유명산", "accommodation": "숲속의집"}
+OPEN = [{"name": "101호", "dates": [{"date": "2025.07.12", "status": "예약가능"}]}]
+
+
+def _opened(diff):
+    return [(entry['facility'], entry['date']) for entry in diff['opened']]
+
+
+def test_reopen_after_sold_out_is_reported(tmp_path):
+    store = AvailabilitySnapshotStore(str(tmp_path / 'snapshot.db'))
+
+    assert _opened(store.apply(CONTEXT, OPEN)) == [("101호", "2025.07.12")]
+    diff = store.apply(CONTEXT, [])  # 모두 마감 (예약 가능 일자 없는 결과)
+    assert [entry['date'] for entry in diff['closed']] == ["2025.07.12"]
+    assert _opened(store.apply(CONTEXT, OPEN)) == [("101호", "2025.07.12")]
+    store.close()
+
+
+def test_uncommitted_change_is_reported_again(tmp_path):
+    store = AvailabilitySnapshotStore(str(tmp_path / 'snapshot.db'))
+
+    # 전송 실패: commit하지 않으면 다음 스크래핑에서도 변경분으로 남음
+    assert _opened(store.apply(CONTEXT, OPEN, commit=False)) == [("101호", "2025.07.12")]
+    assert _opened(store.apply(CONTEXT, OPEN, commit=False)) == [("101호", "2025.07.12")]
+
+    store.commit(CONTEXT, OPEN)
+    assert store.apply(CONTEXT, OPEN, commit=False) == {'opened': [], 'closed': [], 'changed': []}
+    store.close()
@@ -0,0 +1,125 @@
+from datetime import date
+import calendar
+import re
+from crawl_planner import combo_key, parse_month
+
+SECTION_PREFIX = 'WATCH:'
+
+WEEKDAY_NAMES = {
+    '월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6,
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+}
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_date(text):
+    """'2025.06.15' / '2025-06-15' → date, 알 수 없으면 None"""
+    match = re.search(r'(\d{4})\D(\d{1,2})\D(\d{1,2})', text or '')
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def load_watch_list(config):
+    """config.ini [WATCH:이름] 섹션들 → 관심 조건 목록"""
+    entries = []
+    for section in config.sections():
+        if not section.startswith(SECTION_PREFIX):
+            continue
+        weekdays = set()
+        for name in _split(config.get(section, 'WEEKDAYS', fallback='')):
+            if name.lower() not in WEEKDAY_NAMES:
+                raise ValueError(f"config.ini [{section}] WEEKDAYS: 알 수 없는 요일 '{name}' (월~일 또는 mon~sun)")
+            weekdays.add(WEEKDAY_NAMES[name.lower()])
+        entries.append({
+            'name': section[len(SECTION_PREFIX):].strip(),
+            'region_code': config.get(section, 'REGION'),
+            'forests': _split(config.get(section, 'FOREST', fallback='')),  # 부분 일치, 비우면 전체
+            'accommodations': _split(config.get(section, 'ACCOMMODATION', fallback='')),
+            'date_from': parse_date(config.get(section, 'DATE_FROM', fallback='')),
+            'date_to': parse_date(config.get(section, 'DATE_TO', fallback='')),
+            'weekdays': weekdays,  # 비우면 모든 요일
+        })
+    return entries
+
+
+def _matches(text, patterns):
+    return not patterns or any(pattern in text for pattern in patterns)
+
+
+def _month_in_range(month_option, entry):
+    parsed = parse_month(month_option)
+    if parsed is None:
+        return True  # 월을 해석할 수 없으면 제외하지 않음
+    year, month = parsed
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    if entry['date_from'] and last < entry['date_from']:
+        return False
+    if entry['date_to'] and first > entry['date_to']:
+        return False
+    return True
+
+
+def plan_watch_combinations(month_options, regions, entries):
+    """관심 조건에 필요한 조합만 계획 (전체 조합과 같은 월 → 지역 → 휴양림 → 숙박시설 순서, 중복 제거)"""
+    combos = []
+    by_key = {}
+    for month in month_options:
+        for region in regions:
+            region_entries = [e for e in entries if e['region_code'] == region['value'] and _month_in_range(month, e)]
+            if not region_entries:
+                continue
+            for forest in region['forests']:
+                for accommodation in forest['accommodations']:
+                    matched = [
+                        e for e in region_entries
+                        if _matches(forest['text'], e['forests']) and _matches(accommodation['text'], e['accommodations'])
+                    ]
+                    if not matched:
+                        continue
+                    combo = {
+                        'month': month,
+                        'region': {'value': region['value'], 'text': region['text']},
+                        'forest': {'value': forest['value'], 'text': forest['text']},
+                        'accommodation': accommodation,
+                        'watch': matched,  # 알림 시 날짜 필터에 사용
+                    }
+                    key = combo_key(combo)
+                    if key not in by_key:
+                        by_key[key] = combo
+                        combos.append(combo)
+    return combos
+
+
+def _date_wanted(date_str, entries):
+    day = parse_date(date_str)
+    if day is None:
+        return True
+    for entry in entries:
+        if entry['date_from'] and day < entry['date_from']:
+            continue
+        if entry['date_to'] and day > entry['date_to']:
+            continue
+        if entry['weekdays'] and day.weekday() not in entry['weekdays']:
+            continue
+        return True
+    return False
+
+
+def filter_result_data(result_data, entries):
+    """관심 조건의 날짜 범위/요일에 해당하는 날짜만 남김 (조건 없으면 그대로, 남은 날짜 없는 시설 제외)"""
+    if not entries:
+        return result_data
+    filtered = []
+    for facility in result_data:
+        dates = [entry for entry in facility['dates'] if _date_wanted(entry['date'], entries)]
+        if dates:
+            filtered.append({"name": facility['name'], "dates": dates})
+    return filtered
@@ -0,0 +1,299 @@
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+from crawl_planner import order_combinations, combo_context, combo_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_queue (
+    combo_key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    combo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    collected INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS work_queue_claim ON work_queue (status, seq);
+"""
+
+
+class WorkQueue:
+    """(월, 지역, 휴양림, 숙박시설) 조합 작업 큐 (SQLite, 여러 프로세스가 임대(lease) 방식으로 나눠 처리)
+
+    status: pending → leased → done / failed. 임대 시간이 지나도록 완료 보고가 없으면 다른 작업자가 다시 가져감
+    """
+
+    def __init__(self, path='work_queue.db', lease_seconds=300, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # 프로세스마다 자체 연결, 트랜잭션은 직접 관리 (BEGIN IMMEDIATE로 임대 원자성 보장)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _transaction(self, work):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work()
+            self.conn.execute("COMMIT")
+            return result
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def reset(self):
+        self._transaction(lambda: self.conn.execute("DELETE FROM work_queue"))
+
+    def enqueue(self, combos):
+        """계획된 순서(seq) 그대로 추가, 이미 있는 조합은 유지 → 추가된 개수 (관심 조건 'watch'는 저장 안 함)"""
+        now = time.time()
+        rows = []
+        for seq, combo in enumerate(combos):
+            stored = {k: v for k, v in combo.items() if k != 'watch'}
+            rows.append((combo_key(combo), seq, json.dumps(stored, ensure_ascii=False), now))
+
+        def work():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO work_queue (combo_key, seq, combo, status, updated_at) "
+                "VALUES (?, ?, ?, 'pending', ?)", rows
+            )
+            return self.conn.total_changes - before
+        return self._transaction(work)
+
+    def release_stale(self):
+        """이전 실행이 중단되며 남긴 임대를 즉시 회수 (작업자가 없을 때만 호출)"""
+        return self._transaction(lambda: self.conn.execute(
+            "UPDATE work_queue SET status = 'pending', worker = NULL, lease_until = NULL WHERE status = 'leased'"
+        ).rowcount)
+
+    def claim(self, worker, limit=1):
+        """대기 중이거나 임대가 만료된 조합을 계획 순서대로 최대 limit개 임대 → 조합 목록
+
+        시도 횟수를 다 쓴 채 임대가 만료된 조합(작업자를 멈추게 하거나 종료시키는 조합)은 failed로 옮김
+        """
+        def work():
+            now = time.time()
+            self.conn.execute(
+                "UPDATE work_queue SET status = 'failed', worker = NULL, lease_until = NULL, "
+                "error = '임대 만료 (시도 횟수 초과)', updated_at = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = self.conn.execute(
+                "SELECT combo_key, combo FROM work_queue "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ? AND attempts < ?) "
+                "ORDER BY seq LIMIT ?", (now, self.max_attempts, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE work_queue SET status = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE combo_key = ?",
+                [(worker, now + self.lease_seconds, now, key) for key, _ in rows]
+            )
+            return [json.loads(combo) for _, combo in rows]
+        return self._transaction(work)
+
+    def renew(self, worker, keys):
+        """처리 중인 조합들의 임대 연장 (묶음 처리가 임대 시간보다 길어질 때)"""
+        now = time.time()
+        self._transaction(lambda: self.conn.executemany(
+            "UPDATE work_queue SET lease_until = ? WHERE combo_key = ? AND worker = ? AND status = 'leased'",
+            [(now + self.lease_seconds, key, worker) for key in keys]
+        ))
+
+    def complete(self, worker, key, result):
+        """결과 기록 (예약 가능 일자가 없는 결과도 그대로, 임대를 잃은 뒤 늦게 도착한 보고는 무시) → 반영 여부"""
+        return self._transaction(lambda: self.conn.execute(
+            "UPDATE work_queue SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE combo_key = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(result, ensure_ascii=False) if result else None, time.time(), key, worker)
+        ).rowcount == 1)
+
+    def fail(self, worker, key, error):
+        """실패 보고: 시도 횟수가 남았으면 대기열로 되돌리고, 아니면 failed"""
+        return self._transaction(lambda: self.conn.execute(
+            "UPDATE work_queue SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "worker = NULL, lease_until = NULL, error = ?, updated_at = ? "
+            "WHERE combo_key = ? AND worker = ? AND status = 'leased'",
+            (self.max_attempts, error, time.time(), key, worker)
+        ).rowcount == 1)
+
+    def collect(self, limit=500):
+        """아직 가져가지 않은 완료 결과 (조정자가 저장/전송) → [(조합, 결과 또는 None)]"""
+        def work():
+            rows = self.conn.execute(
+                "SELECT combo_key, combo, result FROM work_queue WHERE status = 'done' AND collected = 0 "
+                "ORDER BY updated_at LIMIT ?", (limit,)
+            ).fetchall()
+            self.conn.executemany("UPDATE work_queue SET collected = 1 WHERE combo_key = ?",
+                                  [(key,) for key, _, _ in rows])
+            return [(json.loads(combo), json.loads(result) if result else None) for _, combo, result in rows]
+        return self._transaction(work)
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM work_queue GROUP BY status"))
+
+    def is_finished(self):
+        counts = self.counts()
+        return not counts.get('pending') and not counts.get('leased')
+
+    def report(self):
+        counts = self.counts()
+        print(f"🗂️ 작업 큐: 완료 {counts.get('done', 0)}개, 실패 {counts.get('failed', 0)}개, "
+              f"대기 {counts.get('pending', 0)}개, 처리 중 {counts.get('leased', 0)}개 ({self.path})")
+        for context, attempts, error in self.conn.execute(
+            "SELECT combo, attempts, error FROM work_queue WHERE status = 'failed' ORDER BY seq"
+        ):
+            ctx = combo_context(json.loads(context))
+            print(f"   ❌ {ctx['month']} / {ctx['region']} / {ctx['forest']} / {ctx['accommodation']} "
+                  f"({attempts}회): {error}")
+
+    def failed_regions(self):
+        """최종 실패한 조합들의 지역 코드 (옵션 트리 캐시 부분 무효화용)"""
+        return {json.loads(combo)['region']['value']
+                for (combo,) in self.conn.execute("SELECT combo FROM work_queue WHERE status = 'failed'")}
+
+    def close(self):
+        self.conn.close()
+
+
+def build_work_queue(config):
+    return WorkQueue(
+        path=config.get('WORK_QUEUE', 'PATH', fallback='work_queue.db'),
+        lease_seconds=config.getint('WORK_QUEUE', 'LEASE_SECONDS', fallback=300),
+        max_attempts=config.getint('WORK_QUEUE', 'MAX_ATTEMPTS', fallback=3)
+    )
+
+
+def run_worker(worker_no, user_data_dir):
+    """작업자 프로세스: 자체 브라우저 프로필로 로그인 → 큐에서 조합을 임대해 스크래핑 → 결과를 큐에 기록"""
+    # spawn 프로세스에서 import (Playwright 인스턴스는 프로세스 간 공유 불가)
+    from foresttrip_headless_login import foresttrip_login
+    from forest_headless_reservation import ForestReservationSystem
+
+    worker = f"{socket.gethostname()}:{os.getpid()}:{worker_no}"
+    page = foresttrip_login(user_data_dir=user_data_dir)
+    if page is None:
+        print(f"❌ [작업자 {worker_no}] 로그인 실패")
+        return
+
+    system = ForestReservationSystem(page)
+    system.install_resource_router()
+    if system.checkpoint:
+        system.checkpoint.close()
+        system.checkpoint = None  # 진행 상황은 작업 큐가 기록
+    system.availability = None  # 작업자마다 같은 파일에 덮어쓰지 않도록 (큐에는 예약 가능 일자만 기록)
+    system.option_tree_cache = None  # 공유 캐시 무효화는 조정자가 (최종 실패 조합의 지역만)
+    queue = build_work_queue(system.config)
+    batch_size = system.config.getint('WORK_QUEUE', 'BATCH_SIZE', fallback=4)
+    state = {}
+    done = 0
+
+    try:
+        page.wait_for_load_state('networkidle')
+        while True:
+            # 연속된 조합 묶음 임대 (계획 순서 유지 → 같은 숙박시설의 월만 바꾸며 처리)
+            combos = queue.claim(worker, batch_size)
+            if not combos:
+                if queue.is_finished():
+                    break
+                page.wait_for_timeout(2000)  # 다른 작업자 임대 만료 대기
+                continue
+
+            for index, combo in enumerate(combos):
+                key = combo_key(combo)
+                context_info = combo_context(combo)
+                system.metric_labels = {'region': context_info['region'], 'forest': context_info['forest']}
+                print(f"🧵 [작업자 {worker_no}] {context_info['month']} / {context_info['region']} / "
+                      f"{context_info['forest']} / {context_info['accommodation']}")
+
+                result, attempts = system.scrape_combination(combo, context_info, state)
+                if attempts is None:
+                    queue.fail(worker, key, '재시도 후 스크래핑 실패')
+                else:
+                    queue.complete(worker, key, result)  # 빈 결과도 기록 (조정자가 마감 상태 반영)
+                    done += 1
+                queue.renew(worker, [combo_key(c) for c in combos[index + 1:]])
+    finally:
+        print(f"🏁 [작업자 {worker_no}] 처리 {done}개")
+        queue.close()
+        system.shutdown()
+        page.context.close()
+
+
+class WorkQueueCoordinator:
+    """조합을 작업 큐에 펼치고 작업자 프로세스를 실행, 완료 결과를 모아 저장/지역별 전송"""
+
+    def __init__(self, system, worker_count=None):
+        self.system = system  # 계획 수립/결과 저장/텔레그램 전송 담당 (로그인된 메인 시스템)
+        config = system.config
+        self.worker_count = worker_count or config.getint('WORK_QUEUE', 'WORKERS', fallback=2)
+        self.user_data_prefix = config.get('WORK_QUEUE', 'USER_DATA_DIR_PREFIX', fallback='./user_data_worker')
+        self.poll_seconds = config.getfloat('WORK_QUEUE', 'POLL_SECONDS', fallback=2)
+        self.queue = build_work_queue(config)
+        self.watch_by_key = {}  # 조합 키 → 관심 조건 (알림 날짜 필터용, 큐에는 저장 안 함)
+
+    def plan(self, force_refresh=False, resume=False, watch=False):
+        system = self.system
+        system.page.wait_for_load_state('networkidle')
+        month_options = system.get_select_options('#monthSelectBox')
+        region_options = system.get_select_options('#srchSido')
+        regions = system.option_tree_cache.get_tree(system, region_options, force_refresh)
+        combos = order_combinations(system.plan_crawl(month_options, regions, watch), system.loop_order)
+        self.watch_by_key = {combo_key(combo): combo.get('watch') for combo in combos}
+
+        if resume:
+            print(f"⏯️ 이어서 실행: 중단된 임대 {self.queue.release_stale()}개 회수")
+        else:
+            self.queue.reset()
+        added = self.queue.enqueue(combos)
+        print(f"🗂️ 작업 큐: {len(combos)}개 조합 중 {added}개 추가 → 작업자 {self.worker_count}개")
+
+    def drain(self):
+        """완료된 결과를 메인 시스템에서 기록/전송 (빈 결과는 DB/조회 API/스냅샷의 마감 상태로 반영)"""
+        for combo, result in self.queue.collect():
+            if result and result['data']:
+                self.system.record_result(result)
+                watch = self.watch_by_key.get(combo_key(combo))
+                self.system.notify_result(result['context'], result['data'], watch)
+            elif result:
+                self.system.record_state(result)
+                self.system.notify_result(result['context'], [])
+
+    def run(self, force_refresh=False, resume=False, watch=False):
+        self.plan(force_refresh, resume, watch)
+
+        # spawn: 작업자마다 새 인터프리터 + 자체 Playwright/브라우저 프로필
+        context = multiprocessing.get_context('spawn')
+        workers = [
+            context.Process(target=run_worker, args=(n, f"{self.user_data_prefix}{n}"), name=f"crawl-worker-{n}")
+            for n in range(1, self.worker_count + 1)
+        ]
+        for process in workers:
+            process.start()
+
+        try:
+            while any(process.is_alive() for process in workers):
+                self.drain()
+                self.system.flush_due_regions()
+                time.sleep(self.poll_seconds)
+            self.drain()
+        finally:
+            for process in workers:
+                process.join()
+            # 캐시와 실제 옵션이 달랐을 수 있음 → 다음 실행에서 실패 조합의 지역 트리만 재수집
+            for region_code in self.queue.failed_regions():
+                self.system.option_tree_cache.invalidate_region(region_code)
+            self.queue.report()
+            self.system.flush_notifications()
+
+        return self.system.collected_results()